@@ -0,0 +1,91 @@
+"""
+Offline reports over gameplay event logs.
+
+Run from the repository root, for example:
+
+    python game/analytics.py summary ~/.platform_game/events.bin
+    python game/analytics.py heatmap ~/.platform_game/events.bin cooperative death --cell 50
+    python game/analytics.py entities ~/.platform_game/events.bin platformer powerup
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.src.analytics import (GAMES, EventType, entity_counts, event_counts, heatmap, read_events,
+                                  session_rates)
+
+
+def _event_type(name):
+    try:
+        return EventType[name.upper()]
+    except KeyError as error:
+        raise argparse.ArgumentTypeError(f"unknown event {name!r}, expected one of "
+                                         f"{', '.join(event.name.lower() for event in EventType)}") from error
+
+
+def run_summary(args):
+    events = read_events(args.log)
+    counts = event_counts(events)
+    rates = session_rates(events)
+    print('\t'.join(['game', 'event', 'count', 'per_session']))
+    for game, event in sorted(counts):
+        rate = rates.get((game, event))
+        print('\t'.join([game, event.name.lower(), str(counts[game, event]),
+                         '' if rate is None else f'{rate:.2f}']))
+    return 0
+
+
+def run_heatmap(args):
+    counts, x_edges, y_edges = heatmap(read_events(args.log), args.game, args.event, args.cell)
+    if not counts.size:
+        print('no events')
+        return 0
+    # One row per y cell, top of the screen first, like the game's own coordinates
+    print('\t'.join(['y\\x', *(f'{x:.0f}' for x in x_edges[:-1])]))
+    for row, y in enumerate(y_edges[:-1]):
+        print('\t'.join([f'{y:.0f}', *(str(count) for count in counts[:, row])]))
+    return 0
+
+
+def run_entities(args):
+    counts = entity_counts(read_events(args.log), args.game, args.event)
+    total = counts.sum()
+    print('\t'.join(['entity', 'count', 'share']))
+    for entity, count in enumerate(counts):
+        if count:
+            print(f'{entity}\t{count}\t{count / total:.3f}')
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    summary_parser = subparsers.add_parser('summary', help='Count every event type per game and session.')
+    summary_parser.add_argument('log')
+
+    heatmap_parser = subparsers.add_parser('heatmap', help='Count events of one type in a grid of cells.')
+    heatmap_parser.add_argument('log')
+    heatmap_parser.add_argument('game', choices=GAMES)
+    heatmap_parser.add_argument('event', type=_event_type)
+    heatmap_parser.add_argument('--cell', type=int, default=40, help='Cell size in pixels.')
+
+    entities_parser = subparsers.add_parser('entities', help='Count events of one type per entity, such as '
+                                                             'the player or power-up kind.')
+    entities_parser.add_argument('log')
+    entities_parser.add_argument('game', choices=GAMES)
+    entities_parser.add_argument('event', type=_event_type)
+
+    args = parser.parse_args(argv)
+    if args.command == 'summary':
+        return run_summary(args)
+    if args.command == 'heatmap':
+        return run_heatmap(args)
+    if args.command == 'entities':
+        return run_entities(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,397 @@
+"""
+Micro-benchmarks for the arcade collection.
+
+Run from the repository root, for example:
+
+    python game/benchmark.py entities
+    python game/benchmark.py jumper-env --num-envs 1024
+    python game/benchmark.py pipeline --frames 2000
+    python game/benchmark.py render --frames 1000
+    python game/benchmark.py sprites --counts 10 100 1000
+    python game/benchmark.py ecs --counts 10 100 1000
+    python game/benchmark.py stream --frames 600
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from utils.constants import FPS, PLAYERS, RED
+
+
+def _slot_names(cls):
+    names = []
+    for klass in reversed(cls.__mro__):
+        names.extend(klass.__dict__.get('__slots__', ()))
+    return names
+
+
+_dict_classes = {}
+
+
+def _as_dict_object(obj):
+    """Copy a slotted object into an equivalent ``__dict__``-backed one, as the classes used to be."""
+    cls = type(obj)
+    if cls not in _dict_classes:
+        names = _slot_names(cls)
+        source = 'def __init__(self, o):\n' + ''.join(f'    self.{n} = o.{n}\n' for n in names)
+        namespace = {}
+        exec(source, namespace)
+        _dict_classes[cls] = type('Dict' + cls.__name__, (), {'__init__': namespace['__init__']})
+    return _dict_classes[cls](obj)
+
+
+def _bytes_per_instance(factory, count):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del objects
+    return total / count
+
+
+def bench_entities(count):
+    """Compare slotted entities against dict-backed copies: memory per instance and attribute reads."""
+    from catcher.src.catcher import CatcherPlayer
+    from cooperative.src.cooperative import Player as CoopPlayer, Platform
+    from jumper.src.jumper import Bird, Pipe
+    from racer.racer import Player as RacerPlayer
+
+    controls = list(PLAYERS.values())[0]
+    coop_controls = dict(controls, jump=controls['up'], boost=pygame.K_DOWN)
+    factories = {
+        'cooperative.Player': lambda: CoopPlayer(300, 480, RED, coop_controls, 1),
+        'cooperative.Platform': lambda: Platform(0, 0),
+        'catcher.CatcherPlayer': lambda: CatcherPlayer(0, 540, RED, controls, 1),
+        'jumper.Bird': lambda: Bird(200, 300, RED, controls),
+        'jumper.Pipe': lambda: Pipe(800),
+        'racer.Player': lambda: RacerPlayer(50, 100, RED, [pygame.K_a]),
+    }
+
+    print(f"{'class':<24}{'slots B':>10}{'dict B':>10}{'saved':>8}{'slots ns':>10}{'dict ns':>10}")
+    for name, factory in factories.items():
+        slotted = _bytes_per_instance(factory, count)
+        legacy = _bytes_per_instance(lambda factory=factory: _as_dict_object(factory()), count)
+        obj = factory()
+        legacy_obj = _as_dict_object(obj)
+        reads = 'o.x; o.y; o.width; o.height; o.x; o.y'
+        slotted_ns = min(timeit.repeat(reads, globals={'o': obj}, number=100_000, repeat=5)) * 1e4
+        legacy_ns = min(timeit.repeat(reads, globals={'o': legacy_obj}, number=100_000, repeat=5)) * 1e4
+        saved = 1 - slotted / legacy
+        print(f"{name:<24}{slotted:>10.0f}{legacy:>10.0f}{saved:>8.0%}"
+              f"{slotted_ns:>10.1f}{legacy_ns:>10.1f}")
+
+
+def bench_jumper_env(num_envs, steps):
+    """Environment steps per second for the single and the vectorized jumper environments."""
+    import numpy as np
+
+    from jumper.src.env import JumperEnv, VectorJumperEnv
+
+    rng = np.random.default_rng(0)
+    env = JumperEnv()
+    env.reset(seed=0)
+    actions = rng.random(steps) < 0.1
+    start = time.perf_counter()
+    for action in actions:
+        if env.step(action)[2]:
+            env.reset()
+    single = steps / (time.perf_counter() - start)
+
+    vector = VectorJumperEnv(num_envs)
+    vector.reset(seed=0)
+    batches = max(1, steps // num_envs)
+    actions = rng.random((batches, num_envs)) < 0.1
+    start = time.perf_counter()
+    for batch in actions:
+        vector.step(batch)
+    vectorized = batches * num_envs / (time.perf_counter() - start)
+
+    print(f"JumperEnv:        {single:>12,.0f} env-steps/s")
+    print(f"VectorJumperEnv:  {vectorized:>12,.0f} env-steps/s ({num_envs} envs)")
+
+
+def bench_pipeline(frames, num_players):
+    """Frame time of the cooperative game drawn sequentially and pipelined, against update and draw alone."""
+    import random
+
+    from common import RandomWalker, run_interactive, run_pipelined
+    from cooperative.src.cooperative import CooperativeSession
+    from utils.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+
+    class BenchmarkSession(CooperativeSession):
+        def advance(self):
+            super().advance()
+            self.finished = self.frame >= frames or self.game_over
+
+    def new_session():
+        session = BenchmarkSession(num_players)
+        rng = random.Random(0)
+        session.bots = [RandomWalker(player, rng, jump_control='jump') for player in session.players]
+        return session
+
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    random.seed(0)
+    session = new_session()
+    update = draw = 0.0
+    while not session.finished:
+        start = time.perf_counter()
+        session.advance()
+        middle = time.perf_counter()
+        session.draw(screen)
+        pygame.display.flip()
+        update += middle - start
+        draw += time.perf_counter() - middle
+
+    timings = {}
+    for name, run in (('sequential', run_interactive), ('pipelined', run_pipelined)):
+        random.seed(0)
+        start = time.perf_counter()
+        run(screen, new_session, fps=0)
+        timings[name] = time.perf_counter() - start
+
+    played = session.frame
+    print(f"update {update / played * 1000:.3f} ms, draw {draw / played * 1000:.3f} ms per frame, {played} frames")
+    for name, elapsed in timings.items():
+        print(f"{name:<12}{elapsed / played * 1000:>8.3f} ms per frame")
+
+
+def bench_render(frames, num_players):
+    """Draw-and-present time per frame of each game on display surfaces and on SDL2 textures."""
+    import random
+
+    from catcher.src.catcher import CatcherSession
+    from common import RandomWalker, TextureCanvas, present
+    from cooperative.src.cooperative import CooperativeSession
+    from jumper.src.jumper import JumperSession
+    from platformer.src.platformer import new_game
+    from racer.racer import RacerGame
+    from utils.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+
+    def cooperative():
+        session = CooperativeSession(num_players, seed=0)
+        session.bots = [RandomWalker(player, random.Random(seat), jump_control='jump')
+                        for seat, player in enumerate(session.players)]
+        return session
+
+    def jumper():
+        session = JumperSession(min(num_players, len(PLAYERS)))
+        session.bots = [RandomWalker(bird, random.Random(seat), jump_control='up')
+                        for seat, bird in enumerate(session.birds)]
+        return session
+
+    def racer():
+        # The race stands still without typists, so it is drawn as it starts
+        return RacerGame(pygame.Surface(size), min(num_players, len(PLAYERS)))
+
+    size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+    targets = {
+        'surface': lambda: pygame.display.set_mode(size),
+        'texture (software)': lambda: TextureCanvas.create(size, accelerated=0),
+        'texture (default)': lambda: TextureCanvas.create(size),
+    }
+    games = (('cooperative', cooperative), ('jumper', jumper), ('catcher', lambda: CatcherSession(num_players)),
+             ('platformer', lambda: new_game(min(num_players, len(PLAYERS)))), ('racer', racer))
+    print(f"{'game':<14}{'target':<22}{'mean ms':>10}{'p99 ms':>10}")
+    for game, new_session in games:
+        for name, new_target in targets.items():
+            target = new_target()
+            random.seed(0)
+            session = new_session()
+            times = []
+            while len(times) < frames:
+                if session.game_over:
+                    session = new_session()
+                session.advance()
+                start = time.perf_counter()
+                session.draw(target)
+                present(target)
+                times.append((time.perf_counter() - start) * 1000)
+            times.sort()
+            print(f"{game:<14}{name:<22}{sum(times) / frames:>10.3f}{times[int(frames * 0.99)]:>10.3f}")
+
+
+def bench_sprites(counts, frames):
+    """Draw time per frame of catcher and jumper as the number of items, pipes and power-ups grows."""
+    import random
+
+    from catcher.src.catcher import CatcherSession
+    from jumper.src.jumper import JumperSession
+    from utils.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+
+    def catcher(count):
+        session = CatcherSession(2)
+        _crowd_catcher(session, count)
+        return session
+
+    def jumper(count):
+        session = JumperSession(2)
+        _crowd_jumper(session, count)
+        return session
+
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    print(f"{'game':<10}{'entities':>10}{'ms per frame':>14}")
+    for game, new_session in (('catcher', catcher), ('jumper', jumper)):
+        for count in counts:
+            random.seed(0)
+            session = new_session(count)
+            session.draw(screen)
+            start = time.perf_counter()
+            for _ in range(frames):
+                session.draw(screen)
+            print(f"{game:<10}{count:>10}{(time.perf_counter() - start) / frames * 1000:>14.3f}")
+
+
+def _crowd_catcher(session, count):
+    """Fill a catcher session with ``count`` items hanging still above the players, a quarter of them power-ups."""
+    import random
+
+    from catcher.src.catcher import spawn_item, spawn_powerup
+    from utils.constants import SCREEN_HEIGHT
+
+    items = session.items
+    for i in range(count):
+        if i % 4:
+            spawn_item(items)
+        else:
+            spawn_powerup(items)
+    items['y'] = [random.randint(0, SCREEN_HEIGHT - 150) for _ in range(count)]
+    items['vy'] = 0
+
+
+def _crowd_jumper(session, count):
+    """Fill a jumper session with ``count`` pipes and power-ups standing still ahead of invincible birds."""
+    import random
+
+    from jumper.src.jumper import POWERUP_TYPES, spawn_pipe, spawn_powerup
+    from utils.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+
+    for _ in range(count):
+        spawn_pipe(session.pipes, random.randint(session.start_x + 100, SCREEN_WIDTH))
+        spawn_powerup(session.powerups, random.randint(session.start_x + 100, SCREEN_WIDTH),
+                      random.randint(0, SCREEN_HEIGHT), random.choice(POWERUP_TYPES))
+    session.pipes['vx'] = 0
+    session.powerups['vx'] = 0
+    session.invincibility_timer = 1 << 30
+
+
+def bench_ecs(counts, frames):
+    """Step and draw time per frame of catcher and jumper as their items, pipes and power-ups grow in number."""
+    import random
+
+    from catcher.src.catcher import CatcherSession
+    from jumper.src.jumper import JumperSession
+    from utils.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    print(f"{'game':<10}{'entities':>10}{'step ms':>10}{'draw ms':>10}")
+    for game, new_session, crowd in (('catcher', CatcherSession, _crowd_catcher),
+                                     ('jumper', JumperSession, _crowd_jumper)):
+        for count in counts:
+            random.seed(0)
+            # Nothing spawns during the run, so every frame sees the same crowd
+            session = new_session(2)
+            crowd(session, count)
+            session.item_spawn_interval = session.powerup_spawn_interval = session.pipe_spawn_interval = 1 << 30
+            start = time.perf_counter()
+            for _ in range(frames):
+                session.advance()
+            step = (time.perf_counter() - start) / frames * 1000
+            start = time.perf_counter()
+            for _ in range(frames):
+                session.draw(screen)
+            draw = (time.perf_counter() - start) / frames * 1000
+            print(f"{game:<10}{count:>10}{step:>10.3f}{draw:>10.3f}")
+
+
+def bench_stream(frames, num_players):
+    """Encode time and size per frame of every game's screen when streamed to spectators."""
+    from common import FrameEncoder
+    from headless import GAMES, make_session
+    from utils.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+
+    print(f"{'game':<14}{'key ms':>10}{'key KiB':>10}{'mean ms':>10}{'p99 ms':>10}{'KiB':>10}"
+          f"{'KiB/s':>10}{'ratio':>10}")
+    for game in GAMES:
+        session = make_session(game, num_players, seed=0)
+        # The racer draws on the screen it was made with
+        screen = getattr(session, 'screen', None) or pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        encoder = FrameEncoder()
+        times, sizes = [], []
+        for frame in range(frames + 1):
+            if session.game_over:
+                session = make_session(game, num_players, seed=frame)
+            session.advance()
+            session.draw(screen)
+            start = time.perf_counter()
+            sizes.append(len(encoder.encode(screen)))
+            times.append((time.perf_counter() - start) * 1000)
+        # The first frame is a keyframe, the rest are deltas
+        key_ms, key_size = times.pop(0), sizes.pop(0)
+        times.sort()
+        size = sum(sizes) / frames
+        print(f"{game:<14}{key_ms:>10.2f}{key_size / 1024:>10.1f}{sum(times) / frames:>10.3f}"
+              f"{times[int(frames * 0.99)]:>10.3f}{size / 1024:>10.2f}{size * FPS / 1024:>10.0f}"
+              f"{encoder.raw_bytes / encoder.encoded_bytes:>10.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    entities = subparsers.add_parser('entities', help=bench_entities.__doc__)
+    entities.add_argument('--count', type=int, default=10_000)
+
+    jumper_env = subparsers.add_parser('jumper-env', help=bench_jumper_env.__doc__)
+    jumper_env.add_argument('--num-envs', type=int, default=1024)
+    jumper_env.add_argument('--steps', type=int, default=1_000_000)
+
+    pipeline = subparsers.add_parser('pipeline', help=bench_pipeline.__doc__)
+    pipeline.add_argument('--frames', type=int, default=2000)
+    pipeline.add_argument('--players', type=int, default=3)
+
+    render = subparsers.add_parser('render', help=bench_render.__doc__)
+    render.add_argument('--frames', type=int, default=1000)
+    render.add_argument('--players', type=int, default=3)
+
+    sprites = subparsers.add_parser('sprites', help=bench_sprites.__doc__)
+    sprites.add_argument('--counts', type=int, nargs='+', default=[10, 100, 1000])
+    sprites.add_argument('--frames', type=int, default=200)
+
+    ecs = subparsers.add_parser('ecs', help=bench_ecs.__doc__)
+    ecs.add_argument('--counts', type=int, nargs='+', default=[10, 100, 1000])
+    ecs.add_argument('--frames', type=int, default=200)
+
+    stream = subparsers.add_parser('stream', help=bench_stream.__doc__)
+    stream.add_argument('--frames', type=int, default=600)
+    stream.add_argument('--players', type=int, default=2)
+
+    args = parser.parse_args(argv)
+    pygame.init()
+    if args.benchmark == 'entities':
+        bench_entities(args.count)
+    elif args.benchmark == 'jumper-env':
+        bench_jumper_env(args.num_envs, args.steps)
+    elif args.benchmark == 'pipeline':
+        bench_pipeline(args.frames, args.players)
+    elif args.benchmark == 'render':
+        bench_render(args.frames, args.players)
+    elif args.benchmark == 'sprites':
+        bench_sprites(args.counts, args.frames)
+    elif args.benchmark == 'ecs':
+        bench_ecs(args.counts, args.frames)
+    elif args.benchmark == 'stream':
+        bench_stream(args.frames, args.players)
+
+
+if __name__ == '__main__':
+    main()
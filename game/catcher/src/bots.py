@@ -0,0 +1,41 @@
+import numpy as np
+
+from common import Bot, RandomWalker
+from catcher.src.catcher import BOMB, CatcherSession
+
+__all__ = ['CoinCatcher', 'RandomWalker']
+
+
+class CoinCatcher(Bot):
+    """
+    Moves under the falling coin or power-up that will land first, and steps aside
+    from bombs that are about to hit.
+    """
+
+    def __init__(self, player, session: CatcherSession, rng=None):
+        super().__init__(player, rng)
+        self.session = session
+
+    def think(self, keys):
+        player = self.player
+        center_x = player.x + player.width / 2
+        items = self.session.items
+        item_y = items['y']
+        item_centers = items['x'] + items['width'] / 2
+        bombs = items['kind'] == BOMB
+
+        # Only dodge bombs that are about to land on us
+        danger = bombs & (item_y > player.y - 150) & (np.abs(item_centers - center_x) < player.width)
+        # Go for the lowest other item that has not passed us yet
+        wanted = np.flatnonzero(~bombs & (item_y < player.y + player.height))
+
+        if danger.any():
+            danger_x = item_centers[np.flatnonzero(danger)[-1]]
+            direction = 'left' if danger_x > center_x else 'right'
+            keys.press(player.controls[direction])
+        elif wanted.size:
+            target_x = item_centers[wanted[item_y[wanted].argmax()]]
+            if target_x < center_x - player.velocity:
+                keys.press(player.controls['left'])
+            elif target_x > center_x + player.velocity:
+                keys.press(player.controls['right'])
@@ -1,38 +1,92 @@
+import numpy as np
 import pygame
-import sys
 import random
-from utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, RED, BLUE, GRAY, YELLOW, GREEN, PLAYERS, BLACK, VIOLET
+from functools import lru_cache
+from utils.constants import (SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, RED, BLUE, YELLOW, GREEN, BLACK, VIOLET,
+                             KEYBOARD_ZONES, MAX_PLAYERS, PLAYER_COLORS)
+from common import (EventType, Player, Quality, Session, TimerWheel, World, display_canvas, draw_rect, key_name, move,
+                    outside, overlapping, run_interactive, seat_controls, sprite_blits)
 
-class CatcherPlayer:
-    def __init__(self, x, y, color, controls, player_id):
-        self.x = x
-        self.y = y
+ITEM_SPAWN_INTERVAL = 30  # frames between falling items
+POWERUP_SPAWN_INTERVAL = 600  # frames between power-ups
+POWERUP_DURATION = 600  # frames
+GAME_DURATION = 30 * 60  # frames
+POWERUP_KINDS = ('speed', 'size', 'double')  # Logged by index
+ITEM_KINDS = ('coin', 'bomb') + POWERUP_KINDS  # Stored by index in the items' kind field
+COIN, BOMB, FIRST_POWERUP = 0, 1, 2
+ITEM_SIZE = 30
+# Arrow keys first, as in PLAYERS
+ZONES = [KEYBOARD_ZONES[1], KEYBOARD_ZONES[0], *KEYBOARD_ZONES[2:]]
+
+
+# Room above an item's sprite for the bomb fuse
+FUSE_HEIGHT = 10
+POWERUP_LOOKS = {'speed': (BLUE, "S"), 'size': (GREEN, "L"), 'double': (VIOLET, "2x")}
+
+
+@lru_cache(maxsize=None)
+def small_font():
+    """The font for labels and hints, loaded once since loading looks the font file up again."""
+    return pygame.font.Font(None, 24)
+
+
+@lru_cache(maxsize=None)
+def item_sprite(kind, size, quality) -> pygame.Surface:
+    """
+    A coin, bomb or power-up drawn once per kind, size and quality. The item's box
+    starts ``FUSE_HEIGHT`` pixels down, leaving room for the fuse.
+    """
+    surface = pygame.Surface((size, size + FUSE_HEIGHT), pygame.SRCALPHA)
+    center = (size // 2, FUSE_HEIGHT + size // 2)
+    if kind == 'coin':
+        pygame.draw.circle(surface, YELLOW, center, size // 2)
+        # Inner circle for detail
+        if quality == Quality.HIGH:
+            pygame.draw.circle(surface, (255, 215, 0), center, size // 2 - 5, 2)
+    elif kind == 'bomb':
+        pygame.draw.circle(surface, BLACK, center, size // 2)
+        # Fuse
+        if quality == Quality.HIGH:
+            pygame.draw.line(surface, RED, (size // 2, FUSE_HEIGHT), (size // 2 + 5, 0), 2)
+    else:
+        color, label = POWERUP_LOOKS[kind]
+        box = (0, FUSE_HEIGHT, size, size)
+        pygame.draw.rect(surface, color, box, border_radius=5)
+        if quality == Quality.HIGH:
+            pygame.draw.rect(surface, WHITE, box, 2, border_radius=5)
+        if quality > Quality.LOW:
+            text = small_font().render(label, True, WHITE)
+            surface.blit(text, text.get_rect(center=center))
+    return surface
+
+
+class CatcherPlayer(Player):
+    __slots__ = ('original_width', 'original_velocity', 'velocity', 'score', 'powerups', '_timers')
+
+    def __init__(self, x, y, color, controls, player_id, timers=None):
         self.original_width = 50
-        self.width = self.original_width
-        self.height = 50
-        self.color = color
-        self.controls = controls
+        super().__init__(x, y, self.original_width, 50, color, controls, player_id)
         self.original_velocity = 5
         self.velocity = self.original_velocity
         self.score = 0
-        self.player_id = player_id
-        
-        # Powerup states
-        self.powerups = {
-            'speed': 0,
-            'size': 0,
-            'double': 0
-        }
+
+        # Active powerups, each with the timer that ends it on the session's wheel
+        self._timers = timers
+        self.powerups = {}
+
+    @property
+    def timers(self):
+        """The session's wheel, or one of the player's own made on first use when there is none."""
+        if self._timers is None:
+            self._timers = TimerWheel()
+        return self._timers
+
+    def powerup_left(self, p_type):
+        """Frames until the ``p_type`` powerup wears off, 0 if it is not active."""
+        return self.timers.remaining(self.powerups.get(p_type))
 
     def update(self):
-        # Update powerup timers
-        for p_type in list(self.powerups.keys()):
-            if self.powerups[p_type] > 0:
-                self.powerups[p_type] -= 1
-                if self.powerups[p_type] == 0:
-                    self.remove_powerup(p_type)
-
-        keys = pygame.key.get_pressed()
+        keys = self.input.get_pressed()
         if keys[self.controls['left']]:
             self.x -= self.velocity
         if keys[self.controls['right']]:
@@ -45,7 +99,8 @@ class CatcherPlayer:
             self.x = SCREEN_WIDTH - self.width
 
     def apply_powerup(self, p_type, duration):
-        self.powerups[p_type] = duration
+        self.timers.cancel(self.powerups.get(p_type))
+        self.powerups[p_type] = self.timers.schedule(duration, self.remove_powerup, p_type)
         if p_type == 'speed':
             self.velocity = self.original_velocity * 1.5
         elif p_type == 'size':
@@ -55,6 +110,7 @@ class CatcherPlayer:
         # 'double' is handled in scoring logic
 
     def remove_powerup(self, p_type):
+        self.timers.cancel(self.powerups.pop(p_type, None))
         if p_type == 'speed':
             self.velocity = self.original_velocity
         elif p_type == 'size':
@@ -62,193 +118,171 @@ class CatcherPlayer:
             self.width = self.original_width
             self.x = center_x - self.width // 2 # Keep centered
 
-    def draw(self, screen):
+    def draw(self, screen, quality=Quality.HIGH):
         # Draw player as a bucket/basket shape (U shape)
         
         # Visual effect for powerups
         draw_color = self.color
-        if self.powerups['double'] > 0:
+        double_left = self.powerup_left('double')
+        if double_left > 0:
             # Flash or change color slightly
-             if (self.powerups['double'] // 10) % 2 == 0:
+             if (double_left // 10) % 2 == 0:
                  draw_color = VIOLET
 
         # Base
-        pygame.draw.rect(screen, draw_color, (self.x, self.y + self.height - 10, self.width, 10))
+        draw_rect(screen, draw_color, (self.x, self.y + self.height - 10, self.width, 10))
         # Left side
-        pygame.draw.rect(screen, draw_color, (self.x, self.y, 10, self.height))
+        draw_rect(screen, draw_color, (self.x, self.y, 10, self.height))
         # Right side
-        pygame.draw.rect(screen, draw_color, (self.x + self.width - 10, self.y, 10, self.height))
+        draw_rect(screen, draw_color, (self.x + self.width - 10, self.y, 10, self.height))
         
         # Draw score above player
-        font = pygame.font.Font(None, 24)
+        if quality == Quality.LOW:
+            return
+        font = small_font()
         score_text = font.render(str(self.score), True, WHITE)
         screen.blit(score_text, (self.x + self.width//2 - score_text.get_width()//2, self.y - 20))
 
-class FallingItem:
-    def __init__(self):
-        self.x = random.randint(0, SCREEN_WIDTH - 30)
-        self.y = -30
-        self.size = 30
-        self.speed = random.randint(3, 7)
-        self.type = random.choice(['coin', 'coin', 'coin', 'bomb']) # 75% coin, 25% bomb
-        
-    def update(self):
-        self.y += self.speed
+def spawn_item(items: World, kind=None):
+    """Drop a coin or bomb, or ``kind`` of item, from a random spot above the screen."""
+    x = random.randint(0, SCREEN_WIDTH - ITEM_SIZE)
+    speed = random.randint(3, 7)
+    if kind is None:
+        kind = random.choice([COIN, COIN, COIN, BOMB])  # 75% coin, 25% bomb
+    items.spawn(x=x, y=-ITEM_SIZE, vy=speed, width=ITEM_SIZE, height=ITEM_SIZE, kind=kind)
 
-    def draw(self, screen):
-        if self.type == 'coin':
-            color = YELLOW
-            pygame.draw.circle(screen, color, (self.x + self.size//2, int(self.y + self.size//2)), self.size//2)
-            # Inner circle for detail
-            pygame.draw.circle(screen, (255, 215, 0), (self.x + self.size//2, int(self.y + self.size//2)), self.size//2 - 5, 2)
-        else: # bomb
-            color = BLACK
-            pygame.draw.circle(screen, color, (self.x + self.size//2, int(self.y + self.size//2)), self.size//2)
-            # Fuse
-            pygame.draw.line(screen, RED, (self.x + self.size//2, self.y), (self.x + self.size//2 + 5, self.y - 10), 2)
-
-    def collides_with(self, player):
-        player_rect = pygame.Rect(player.x, player.y, player.width, player.height)
-        item_rect = pygame.Rect(self.x, self.y, self.size, self.size)
-        return player_rect.colliderect(item_rect)
-
-class PowerUp(FallingItem):
-    def __init__(self):
+
+def spawn_powerup(items: World):
+    """Drop a random power-up, which falls a little more evenly than coins and bombs."""
+    x = random.randint(0, SCREEN_WIDTH - ITEM_SIZE)
+    kind = ITEM_KINDS.index(random.choice(POWERUP_KINDS))
+    speed = random.randint(4, 6)
+    items.spawn(x=x, y=-ITEM_SIZE, vy=speed, width=ITEM_SIZE, height=ITEM_SIZE, kind=kind)
+
+
+class CatcherSession(Session):
+    game_name = 'catcher'
+
+    def __init__(self, num_players=2, item_spawn_interval=ITEM_SPAWN_INTERVAL,
+                 powerup_spawn_interval=POWERUP_SPAWN_INTERVAL, game_duration=GAME_DURATION):
         super().__init__()
-        self.type = random.choice(['speed', 'size', 'double'])
-        self.speed = random.randint(4, 6)
-        
-    def draw(self, screen):
-        if self.type == 'speed':
-            color = BLUE
-            label = "S"
-        elif self.type == 'size':
-            color = GREEN
-            label = "L"
-        else: # double
-            color = VIOLET
-            label = "2x"
-            
-        pygame.draw.rect(screen, color, (self.x, self.y, self.size, self.size), border_radius=5)
-        pygame.draw.rect(screen, WHITE, (self.x, self.y, self.size, self.size), 2, border_radius=5)
-        
-        font = pygame.font.Font(None, 24)
-        text = font.render(label, True, WHITE)
-        screen.blit(text, (self.x + self.size//2 - text.get_width()//2, self.y + self.size//2 - text.get_height()//2))
+        self.font = None
 
+        # Initialize players
+        self.players = []
+        start_x = SCREEN_WIDTH // (num_players + 1)
+
+        for i in range(num_players):
+            x_pos = start_x * (i + 1) - 25
+            y_pos = SCREEN_HEIGHT - 60
+            controls = seat_controls(i, ('left', 'right', 'up'), ZONES)
+            player = CatcherPlayer(x_pos, y_pos, PLAYER_COLORS[i], controls, i+1, self.timers)
+            self.players.append(player)
+
+        # Falling coins, bombs and power-ups, each player tests all of them at once
+        self.items = World()
+        self.item_timer = 0
+        self.powerup_timer = 0
+        self.item_spawn_interval = item_spawn_interval
+        self.powerup_spawn_interval = powerup_spawn_interval
+        self.time_left = game_duration
+        self.game_over = False
+
+    def step(self):
+        players = self.players
+        items = self.items
+
+        self.time_left -= 1
+        if self.time_left <= 0:
+            self.game_over = True
+
+        # Update players
+        for player in players:
+            player.update()
+
+        # Spawn items
+        self.item_timer += 1
+        if self.item_timer > self.item_spawn_interval: # Spawn every 0.5 seconds
+            spawn_item(items)
+            self.item_timer = 0
+
+        # Spawn powerups
+        self.powerup_timer += 1
+        if self.powerup_timer > self.powerup_spawn_interval: # Spawn every ~10 seconds
+            spawn_powerup(items)
+            self.powerup_timer = 0
+
+        # Update items
+        move(items)
+
+        # Check collisions of every player with every item at once, the first player in seat order takes the item
+        seated = sorted(players, key=lambda player: player.player_id)
+        boxes = np.array([(player.x, player.y, player.width, player.height) for player in seated])
+        touching = overlapping(items, *boxes.T[:, :, None])
+        taken = touching.any(axis=0)
+        if taken.any():
+            rows = np.flatnonzero(taken)
+            takers = touching[:, rows].argmax(axis=0).tolist()
+            for taker, kind, x, y in zip(takers, items['kind'][rows].tolist(), items['x'][rows].tolist(),
+                                         items['y'][rows].tolist()):
+                player = seated[taker]
+                if kind >= FIRST_POWERUP:
+                    self.log_event(EventType.POWERUP, kind - FIRST_POWERUP, x, y)
+                    player.apply_powerup(ITEM_KINDS[kind], POWERUP_DURATION)
+                elif kind == COIN:
+                    self.log_event(EventType.CATCH, player.player_id, x, y)
+                    points = 1
+                    if 'double' in player.powerups:
+                        points *= 2
+                    player.score += points
+                else: # bomb
+                    self.log_event(EventType.BOMB, player.player_id, x, y)
+                    player.score = max(0, player.score - 2) # Bomb penalty
+
+        items.remove(taken | outside(items, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    def scores(self):
+        return {f'p{player.player_id}': player.score for player in self.players}
+
+    def record(self, leaderboard):
+        for player in self.players:
+            leaderboard.submit(self.game_name, len(self.players), player.score)
+
+    def draw(self, screen):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 36)
+        font = self.font
+        players = self.players
 
-def catcher_game(screen, num_players=2):
-    clock = pygame.time.Clock()
-    font = pygame.font.Font(None, 36)
-    
-    # Initialize players
-    players = []
-    colors = [RED, BLUE, GRAY]
-    player_controls = list(PLAYERS.values())
-    
-    start_x = SCREEN_WIDTH // (num_players + 1)
-    
-    for i in range(num_players):
-        x_pos = start_x * (i + 1) - 25
-        y_pos = SCREEN_HEIGHT - 60
-        player = CatcherPlayer(x_pos, y_pos, colors[i], player_controls[i], i+1)
-        players.append(player)
-    
-    items = []
-    item_timer = 0
-    powerup_timer = 0
-    game_duration = 30 * 60 # 60 seconds at 60 FPS
-    time_left = game_duration
-    game_over = False
-    
-    running = True
-    while running:
-        dt = clock.tick(60)
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return
-                if game_over and event.key == pygame.K_SPACE:
-                    return catcher_game(screen, num_players)
-
-        if not game_over:
-            time_left -= 1
-            if time_left <= 0:
-                game_over = True
-            
-            # Update players
-            for player in players:
-                player.update()
-            
-            # Spawn items
-            item_timer += 1
-            if item_timer > 30: # Spawn every 0.5 seconds
-                items.append(FallingItem())
-                item_timer = 0
-                
-            # Spawn powerups
-            powerup_timer += 1
-            if powerup_timer > 600: # Spawn every ~10 seconds
-                items.append(PowerUp())
-                powerup_timer = 0
-            
-            # Update items
-            items_to_remove = []
-            for item in items:
-                item.update()
-                
-                # Check collision
-                for player in players:
-                    if item.collides_with(player):
-                        if isinstance(item, PowerUp):
-                            player.apply_powerup(item.type, 600) # 10 seconds
-                        elif item.type == 'coin':
-                            points = 1
-                            if player.powerups['double'] > 0:
-                                points *= 2
-                            player.score += points
-                        else: # bomb
-                            player.score = max(0, player.score - 2) # Bomb penalty
-                        items_to_remove.append(item)
-                        break # Item consumed
-                
-                if item.y > SCREEN_HEIGHT:
-                    items_to_remove.append(item)
-            
-            for item in items_to_remove:
-                if item in items:
-                    items.remove(item)
-        
-        # Draw
         screen.fill((135, 206, 250)) # Light Sky Blue
-        
+
         # Draw floor
-        pygame.draw.rect(screen, (34, 139, 34), (0, SCREEN_HEIGHT - 10, SCREEN_WIDTH, 10)) # Forest Green
-        
-        for item in items:
-            item.draw(screen)
-            
+        draw_rect(screen, (34, 139, 34), (0, SCREEN_HEIGHT - 10, SCREEN_WIDTH, 10)) # Forest Green
+
+        # One batch of blits from sprites drawn once
+        quality = self.quality
+        screen.blits(sprite_blits(self.items, lambda kind: item_sprite(ITEM_KINDS[kind], ITEM_SIZE, quality),
+                                  (0, -FUSE_HEIGHT)), doreturn=False)
+
         for player in players:
-            player.draw(screen)
-            
+            player.draw(screen, self.quality)
+
         # Draw UI
-        time_text = font.render(f"Time: {time_left // 60}", True, WHITE)
+        time_text = font.render(f"Time: {self.time_left // 60}", True, WHITE)
         screen.blit(time_text, (10, 10))
-        
+
         # Draw controls info
-        controls_y = 50
-        for i, player in enumerate(players):
-            control_text = pygame.font.Font(None, 24).render(
-                f"P{i+1}: {pygame.key.name(player.controls['left']).upper()}/{pygame.key.name(player.controls['right']).upper()}", 
-                True, player.color
-            )
-            screen.blit(control_text, (10, controls_y + i * 25))
-
-        if game_over:
+        if self.quality > Quality.LOW:
+            controls_y = 50
+            # Only players on the keyboard need reminding
+            for i, player in enumerate(players[:len(ZONES)]):
+                control_text = small_font().render(
+                    f"P{i+1}: {key_name(player.controls['left']).upper()}/{key_name(player.controls['right']).upper()}", 
+                    True, player.color
+                )
+                screen.blit(control_text, (10, controls_y + i * 25))
+
+        if self.game_over:
             # Find winner
             max_score = -1
             winners = []
@@ -258,25 +292,29 @@ def catcher_game(screen, num_players=2):
                     winners = [player]
                 elif player.score == max_score:
                     winners.append(player)
-            
+
             overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
             overlay.set_alpha(128)
             overlay.fill(BLACK)
             screen.blit(overlay, (0, 0))
-            
+
             game_over_text = font.render("GAME OVER!", True, WHITE)
             screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
-            
+
             if len(winners) == 1:
                 winner_text = font.render(f"Player {winners[0].player_id} Wins!", True, winners[0].color)
             elif len(winners) > 1:
                 winner_text = font.render("It's a Tie!", True, WHITE)
             else:
                 winner_text = font.render("No Winners!", True, WHITE)
-                
+
             screen.blit(winner_text, (SCREEN_WIDTH // 2 - winner_text.get_width() // 2, SCREEN_HEIGHT // 2 - 50))
-            
+
             restart_text = font.render("Press SPACE to restart or ESC to exit", True, WHITE)
             screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 50))
 
-        pygame.display.flip()
+
+def catcher_game(screen, num_players=2):
+    num_players = min(num_players, MAX_PLAYERS)
+    with display_canvas(screen) as target:
+        run_interactive(target, lambda: CatcherSession(num_players))
@@ -0,0 +1,23 @@
+import numpy as np
+import pygame
+
+from catcher.src.catcher import CatcherSession
+from common import TextureCanvas
+from utils.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+
+
+def test_session_draws_the_same_on_textures():
+    pygame.init()
+    session = CatcherSession(3)
+    for _ in range(60):
+        session.advance()
+    canvas = TextureCanvas.create((SCREEN_WIDTH, SCREEN_HEIGHT), accelerated=0)
+    for game_over in (False, True):
+        session.game_over = game_over
+        surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        session.draw(surface)
+        session.draw(canvas)
+
+        # Text is blended a little differently
+        difference = pygame.surfarray.array3d(surface).astype(int) - pygame.surfarray.array3d(canvas.to_surface())
+        assert np.abs(difference).max() <= 3
@@ -1,3 +1,10 @@
 from common.src import *
 
-__all__ = [PowerUpType, ]
\ No newline at end of file
+__all__ = ['Bot', 'Entity', 'EventLog', 'EventType', 'FrameBudget', 'FrameDecoder', 'FrameEncoder', 'FrameProfiler',
+           'FrameStreamer', 'InputProvider', 'KEYBOARD', 'KeyState', 'Leaderboard', 'LeaderboardEntry', 'MotionHistory',
+           'OccupancyGrid', 'Player', 'PowerUpType', 'Quality', 'RandomWalker', 'RenderTarget', 'Session', 'SoakWindow',
+           'SpatialGrid', 'TextureCanvas', 'Timer', 'TimerWheel', 'VirtualClock', 'VirtualKey', 'WallClock', 'World',
+           'apply_gravity', 'default_event_log', 'default_leaderboard', 'default_profiler', 'default_streamer',
+           'display_canvas', 'draw_circle', 'draw_line', 'draw_polygon', 'draw_rect', 'expired', 'key_name', 'lerp',
+           'move', 'outside', 'overlapping', 'present', 'read_events', 'read_messages', 'run_headless',
+           'run_interactive', 'run_pipelined', 'seat_controls', 'soak', 'spawn_cap', 'sprite_blits', ]
@@ -1,2 +1,18 @@
+from common.src.analytics import *
+from common.src.budget import *
+from common.src.canvas import *
+from common.src.clock import *
+from common.src.ecs import *
+from common.src.entity import *
+from common.src.grid import *
+from common.src.input import *
+from common.src.interpolation import *
+from common.src.leaderboard import *
+from common.src.loop import *
 from common.src.player import *
-from common.src.powerup import *
\ No newline at end of file
+from common.src.powerup import *
+from common.src.profiling import *
+from common.src.render_target import *
+from common.src.session import *
+from common.src.streaming import *
+from common.src.timers import *
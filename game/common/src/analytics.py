@@ -0,0 +1,139 @@
+import atexit
+import os
+import time
+from enum import IntEnum
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+
+from utils.constants import ANALYTICS_PATH
+
+__all__ = ['EventType', 'EVENT_DTYPE', 'GAMES', 'EventLog', 'default_event_log', 'read_events', 'event_counts',
+           'session_rates', 'entity_counts', 'heatmap']
+
+
+class EventType(IntEnum):
+    """What happened. The meaning of an event's ``entity`` depends on its type."""
+    START = 0  # A session started
+    END = 1  # A session ended or was left
+    DEATH = 2  # A player lost a life, entity is the player id
+    POWERUP = 3  # A power-up was picked up, entity is the game's power-up kind
+    CATCH = 4  # A player caught an item, entity is the player id
+    BOMB = 5  # A player caught a bomb, entity is the player id
+
+
+# Games are stored by their index in this tuple, so names may only be appended
+GAMES = ('platformer', 'jumper', 'catcher', 'cooperative', 'racer')
+_GAME_IDS = {name: index for index, name in enumerate(GAMES)}
+
+# One little-endian, unpadded 20-byte record per event
+EVENT_DTYPE = np.dtype([('time', '<f8'), ('game', 'u1'), ('event', 'u1'), ('entity', '<u2'),
+                        ('x', '<f4'), ('y', '<f4')])
+
+# Written once at the start of a log, identifying the format
+_MAGIC = b'PGEVT\x00\x00\x01'
+
+
+class EventLog:
+    """
+    An append-only log of gameplay events in fixed-width binary records.
+
+    Events are gathered in a NumPy buffer and appended to the file in one write when
+    the buffer fills up or the log is flushed. The file is only created once there is
+    something to write.
+
+    Attributes:
+        path (str): The log file.
+        capacity (int): How many events are buffered between writes.
+    """
+
+    def __init__(self, path=ANALYTICS_PATH, capacity=4096):
+        self.path = path
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self._count = 0
+
+    def log(self, game: str, event: EventType, entity=0, x=0.0, y=0.0):
+        """Buffer one event, timestamped now."""
+        self._buffer[self._count] = (time.time(), _GAME_IDS[game], event, entity, x, y)
+        self._count += 1
+        if self._count == self.capacity:
+            self.flush()
+
+    def flush(self):
+        """Append the buffered events to the file."""
+        if not self._count:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'ab') as file:
+            if file.tell() == 0:
+                file.write(_MAGIC)
+            file.write(self._buffer[:self._count].tobytes())
+        self._count = 0
+
+    close = flush
+
+
+@lru_cache(maxsize=None)
+def default_event_log() -> EventLog:
+    """The event log at ``ANALYTICS_PATH``, flushed at exit."""
+    event_log = EventLog()
+    atexit.register(event_log.close)
+    return event_log
+
+
+def read_events(path) -> np.ndarray:
+    """
+    Memory-map the events of a log as a read-only structured array of ``EVENT_DTYPE``.
+
+    A record cut short by a crash at the end of the file is left out.
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f'{path} is not an event log')
+    count = (os.path.getsize(path) - len(_MAGIC)) // EVENT_DTYPE.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=EVENT_DTYPE)
+    return np.memmap(path, dtype=EVENT_DTYPE, mode='r', offset=len(_MAGIC), shape=(count,))
+
+
+def _select(events, game: str, event: EventType) -> np.ndarray:
+    return events[(events['game'] == _GAME_IDS[game]) & (events['event'] == event)]
+
+
+def event_counts(events) -> Dict[Tuple[str, EventType], int]:
+    """The number of events of each type, keyed by ``(game, event type)``."""
+    keys, counts = np.unique(events['game'].astype(np.uint16) << 8 | events['event'], return_counts=True)
+    return {(GAMES[key >> 8], EventType(key & 0xFF)): int(count) for key, count in zip(keys, counts)}
+
+
+def session_rates(events) -> Dict[Tuple[str, EventType], float]:
+    """The mean number of events of each type per session, keyed like ``event_counts``."""
+    counts = event_counts(events)
+    return {(game, event): count / counts[game, EventType.START]
+            for (game, event), count in counts.items()
+            if event not in (EventType.START, EventType.END) and counts.get((game, EventType.START))}
+
+
+def entity_counts(events, game: str, event: EventType) -> np.ndarray:
+    """How often each entity took part in an event, indexed by entity."""
+    return np.bincount(_select(events, game, event)['entity'])
+
+
+def heatmap(events, game: str, event: EventType, cell=40):
+    """
+    Count events in square cells of ``cell`` pixels over the area they cover.
+
+    Returns ``(counts, x_edges, y_edges)`` like ``numpy.histogram2d``, with
+    ``counts`` indexed ``[x, y]``.
+    """
+    selected = _select(events, game, event)
+    x, y = selected['x'], selected['y']
+    if not len(selected):
+        return np.zeros((0, 0), dtype=int), np.zeros(1), np.zeros(1)
+    x_edges = np.arange(np.floor(x.min() / cell) * cell, x.max() + cell, cell)
+    y_edges = np.arange(np.floor(y.min() / cell) * cell, y.max() + cell, cell)
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=(x_edges, y_edges))
+    return counts.astype(int), x_edges, y_edges
@@ -0,0 +1,57 @@
+from collections import deque
+from enum import IntEnum
+
+__all__ = ['Quality', 'FrameBudget', 'spawn_cap']
+
+
+class Quality(IntEnum):
+    """How much optional detail to draw and spawn. Gameplay never depends on it."""
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+
+
+# Fraction of a spawn limit kept at each quality level
+_SPAWN_SCALE = {Quality.LOW: 0.5, Quality.MEDIUM: 0.75, Quality.HIGH: 1.0}
+
+
+def spawn_cap(limit: int, quality: Quality) -> int:
+    """Scale an entity limit down for ``quality``, keeping at least one."""
+    return max(1, int(limit * _SPAWN_SCALE[quality]))
+
+
+class FrameBudget:
+    """
+    Watches recent frame times and lowers the quality when they run over budget,
+    raising it again once there is headroom.
+
+    Decisions are made once per full window of frames, and the window starts over
+    after every change, so one slow frame does not make the quality flicker.
+
+    Attributes:
+        budget_ms (float): The time one frame may take, ``1000 / fps``.
+        quality (Quality): The quality the next frame should be drawn at.
+    """
+
+    def __init__(self, fps=60, window=30, degrade_at=0.9, restore_at=0.5):
+        self.budget_ms = 1000 / fps
+        self.quality = Quality.HIGH
+        self._times = deque(maxlen=window)
+        self._degrade_ms = self.budget_ms * degrade_at
+        self._restore_ms = self.budget_ms * restore_at
+
+    def record(self, frame_ms: float) -> Quality:
+        """Add the work time of a frame, excluding any sleep, and return the quality to use next."""
+        times = self._times
+        times.append(frame_ms)
+        if len(times) < times.maxlen:
+            return self.quality
+
+        mean_ms = sum(times) / len(times)
+        if mean_ms > self._degrade_ms and self.quality > Quality.LOW:
+            self.quality = Quality(self.quality - 1)
+            times.clear()
+        elif mean_ms < self._restore_ms and self.quality < Quality.HIGH:
+            self.quality = Quality(self.quality + 1)
+            times.clear()
+        return self.quality
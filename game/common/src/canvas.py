@@ -0,0 +1,198 @@
+import weakref
+from contextlib import contextmanager
+
+import pygame
+from pygame._sdl2.video import Renderer, Texture, Window
+
+from utils.constants import TEXTURE_RENDERING
+
+__all__ = ['TextureCanvas', 'display_canvas', 'draw_rect', 'draw_circle', 'draw_line', 'draw_polygon', 'present']
+
+
+class TextureCanvas:
+    """
+    Draws onto an SDL2 renderer through the parts of the ``pygame.Surface`` and
+    ``pygame.draw`` API that the games use, so the same draw code can target either.
+
+    Surfaces passed to ``blit`` are uploaded as textures the first time they are drawn
+    and reused for as long as the surface is alive, so cached sprites and text cost one
+    upload in total. Surfaces must not be changed after they are first drawn. Circles
+    and polygons have no SDL2 primitive; each distinct shape is drawn once into a
+    texture. Rectangles and lines are drawn by the renderer directly.
+
+    Call the module-level ``draw_*`` functions instead of ``pygame.draw`` for drawing
+    that should work on both kinds of target.
+
+    Attributes:
+        renderer (Renderer): The renderer drawn to.
+    """
+
+    def __init__(self, renderer: Renderer):
+        self.renderer = renderer
+        self._textures = weakref.WeakKeyDictionary()
+        self._shapes = {}
+
+    @classmethod
+    def create(cls, size, title='pygame', accelerated=-1, vsync=False):
+        """
+        A canvas in a new window. ``accelerated`` is 0 for SDL's software renderer,
+        1 for a GPU renderer, or -1 for whichever SDL prefers.
+        """
+        return cls(Renderer(Window(title, size), accelerated=accelerated, vsync=vsync))
+
+
+    def get_size(self):
+        return self.renderer.get_viewport().size
+
+    def get_width(self):
+        return self.get_size()[0]
+
+    def get_height(self):
+        return self.get_size()[1]
+
+    def texture(self, surface: pygame.Surface) -> Texture:
+        """The texture uploaded from ``surface``, uploading it on first use."""
+        texture = self._textures.get(surface)
+        if texture is None:
+            texture = self._textures[surface] = Texture.from_surface(self.renderer, surface)
+        return texture
+
+    def fill(self, color, rect=None):
+        renderer = self.renderer
+        renderer.draw_color = pygame.Color(color)
+        if rect is None:
+            renderer.clear()
+        else:
+            renderer.fill_rect(rect)
+
+    def blit(self, source: pygame.Surface, dest, area=None):
+        texture = self.texture(source)
+        x, y = dest[:2]
+        if area is None:
+            texture.draw(dstrect=(x, y, texture.width, texture.height))
+        else:
+            area = pygame.Rect(area)
+            texture.draw(srcrect=area, dstrect=(x, y, area.width, area.height))
+
+    def blits(self, blit_sequence, doreturn=True):
+        """Blit each ``(source, dest)`` or ``(source, dest, area)`` in turn. Nothing is returned."""
+        blit = self.blit
+        for args in blit_sequence:
+            blit(*args)
+
+    def rect(self, color, rect, width=0):
+        renderer = self.renderer
+        renderer.draw_color = pygame.Color(color)
+        if width == 0:
+            renderer.fill_rect(rect)
+            return
+        rect = pygame.Rect(rect)
+        for _ in range(width):
+            renderer.draw_rect(rect)
+            rect.inflate_ip(-2, -2)
+
+    def line(self, color, start_pos, end_pos, width=1):
+        renderer = self.renderer
+        renderer.draw_color = pygame.Color(color)
+        (x1, y1), (x2, y2) = start_pos, end_pos
+        # Like pygame, thick lines are stacked across their shorter axis, with the extra
+        # pixel of an even width after the line rather than before it
+        steep = abs(x2 - x1) < abs(y2 - y1)
+        for offset in range(-((width - 1) // 2), width - (width - 1) // 2):
+            if steep:
+                renderer.draw_line((x1 + offset, y1), (x2 + offset, y2))
+            else:
+                renderer.draw_line((x1, y1 + offset), (x2, y2 + offset))
+
+    def circle(self, color, center, radius, width=0):
+        key = ('circle', tuple(color), radius, width)
+        texture = self._shapes.get(key)
+        if texture is None:
+            surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, color, (radius, radius), radius, width)
+            texture = self._shapes[key] = Texture.from_surface(self.renderer, surface)
+        texture.draw(dstrect=(center[0] - radius, center[1] - radius, texture.width, texture.height))
+
+    def polygon(self, color, points, width=0):
+        left = min(x for x, _ in points)
+        top = min(y for _, y in points)
+        outline = tuple((x - left, y - top) for x, y in points)
+        key = ('polygon', tuple(color), outline, width)
+        texture = self._shapes.get(key)
+        if texture is None:
+            size = (max(x for x, _ in outline) + 1, max(y for _, y in outline) + 1)
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.polygon(surface, color, outline, width)
+            texture = self._shapes[key] = Texture.from_surface(self.renderer, surface)
+        texture.draw(dstrect=(left, top, texture.width, texture.height))
+
+    def present(self):
+        """Show what has been drawn since the last call."""
+        self.renderer.present()
+
+    def to_surface(self) -> pygame.Surface:
+        """Read the drawn frame back into a new surface. Slow; meant for tests and screenshots."""
+        return self.renderer.to_surface()
+
+
+@contextmanager
+def display_canvas(screen, textures=TEXTURE_RENDERING, accelerated=-1):
+    """
+    What a game should draw on: ``screen`` itself, or with ``textures`` a ``TextureCanvas``
+    standing in for the display window until the ``with`` block ends.
+
+    SDL2 cannot attach a renderer to a window that already has a display surface, so
+    the canvas gets a window of its own and the display window is hidden meanwhile.
+    """
+    if not textures:
+        yield screen
+        return
+    display = Window.from_display_module()
+    window = Window(display.title, display.size, position=display.position)
+    canvas = TextureCanvas(Renderer(window, accelerated=accelerated))
+    display.hide()
+    try:
+        yield canvas
+    finally:
+        window.destroy()
+        display.show()
+
+
+def draw_rect(target, color, rect, width=0):
+    """``pygame.draw.rect`` for a surface or a ``TextureCanvas``."""
+    if isinstance(target, TextureCanvas):
+        target.rect(color, rect, width)
+    else:
+        pygame.draw.rect(target, color, rect, width)
+
+
+def draw_circle(target, color, center, radius, width=0):
+    """``pygame.draw.circle`` for a surface or a ``TextureCanvas``."""
+    if isinstance(target, TextureCanvas):
+        target.circle(color, center, radius, width)
+    else:
+        pygame.draw.circle(target, color, center, radius, width)
+
+
+def draw_line(target, color, start_pos, end_pos, width=1):
+    """``pygame.draw.line`` for a surface or a ``TextureCanvas``."""
+    if isinstance(target, TextureCanvas):
+        target.line(color, start_pos, end_pos, width)
+    else:
+        pygame.draw.line(target, color, start_pos, end_pos, width)
+
+
+def draw_polygon(target, color, points, width=0):
+    """``pygame.draw.polygon`` for a surface or a ``TextureCanvas``."""
+    if isinstance(target, TextureCanvas):
+        target.polygon(color, points, width)
+    else:
+        pygame.draw.polygon(target, color, points, width)
+
+
+def present(target):
+    """Show the frame drawn on ``target``: present a ``TextureCanvas``, or flip the display."""
+    if isinstance(target, TextureCanvas):
+        target.present()
+    else:
+        pygame.display.flip()
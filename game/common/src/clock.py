@@ -0,0 +1,45 @@
+import time
+
+__all__ = ['WallClock', 'VirtualClock']
+
+
+class WallClock:
+    """
+    Real time in seconds, sampled once per frame so that everything in a frame
+    sees the same timestamp.
+
+    Attributes:
+        now (float): The time at the last ``tick``, or at creation.
+    """
+
+    def __init__(self):
+        self.now = time.time()
+
+    def tick(self) -> float:
+        """Start a new frame and return its time."""
+        self.now = time.time()
+        return self.now
+
+
+class VirtualClock:
+    """
+    Simulated time that advances by exactly one frame per ``tick``, however long the
+    frame really took. Headless runs use it to play timed effects at full speed.
+
+    Attributes:
+        now (float): The simulated time in seconds.
+        frames (int): The number of ticks so far.
+    """
+
+    def __init__(self, fps=60, start=0.0):
+        self.fps = fps
+        self.start = start
+        self.frames = 0
+        self.now = start
+
+    def tick(self) -> float:
+        """Start a new frame and return its time."""
+        self.frames += 1
+        # Derived from the frame count rather than summed, so long runs do not drift
+        self.now = self.start + self.frames / self.fps
+        return self.now
@@ -0,0 +1,152 @@
+from typing import Callable, Dict, List
+
+import numpy as np
+
+__all__ = ['World', 'apply_gravity', 'move', 'overlapping', 'outside', 'expired', 'sprite_blits']
+
+
+class World:
+    """
+    Entities of one kind stored as rows of NumPy arrays, one array per component
+    field, so systems update every entity with a few array operations instead of a
+    method call per object.
+
+    Every world has these components:
+
+        position: ``x`` and ``y``, plus ``previous_x`` and ``previous_y`` from ``record``
+        velocity: ``vx`` and ``vy``, added to the position by ``move``
+        aabb: ``width`` and ``height`` of the box whose top left corner is the position
+        render: ``kind``, which sprite ``sprite_blits`` draws
+        timer: ``expires``, the tick an entity is due to be removed on, or -1 for never
+
+    Games add their own fields as keyword arguments naming a dtype. Rows are kept
+    packed in spawn order: ``remove`` moves the rows after a removed one down, so a
+    row number only stays valid until the next ``remove``. The arrays returned by
+    ``world['x']`` and the like are views of the live rows and go stale after a
+    ``spawn`` or ``remove``.
+
+    Attributes:
+        dtypes (dict): The dtype of every field, by name.
+    """
+
+    def __init__(self, capacity=64, **fields):
+        self.dtypes: Dict[str, np.dtype] = {
+            'x': np.float64, 'y': np.float64, 'previous_x': np.float64, 'previous_y': np.float64,
+            'vx': np.float64, 'vy': np.float64,
+            'width': np.float64, 'height': np.float64,
+            'kind': np.intp,
+            'expires': np.int64,
+            **fields,
+        }
+        self._columns = {name: np.zeros(capacity, dtype) for name, dtype in self.dtypes.items()}
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, name) -> np.ndarray:
+        """The ``name`` field of every live entity, as a writable view."""
+        return self._columns[name][:self._count]
+
+    def __setitem__(self, name, values):
+        """Set the ``name`` field of every live entity to ``values``, a scalar or one value per entity."""
+        self._columns[name][:self._count] = values
+
+    def spawn(self, **values) -> int:
+        """
+        Add an entity with the given field values, the rest zero, and return its row.
+        Its previous position is where it starts, and it never expires unless given ``expires``.
+        """
+        row = self._count
+        if row == len(self._columns['x']):
+            for name, column in self._columns.items():
+                self._columns[name] = np.concatenate([column, np.zeros_like(column)])
+        columns = self._columns
+        for column in columns.values():
+            column[row] = 0
+        columns['expires'][row] = -1
+        for name, value in values.items():
+            columns[name][row] = value
+        columns['previous_x'][row] = columns['x'][row]
+        columns['previous_y'][row] = columns['y'][row]
+        self._count = row + 1
+        return row
+
+    def remove(self, mask):
+        """Remove the entities where the boolean ``mask`` over the live rows is set."""
+        keep = ~np.asarray(mask, dtype=bool)
+        count = int(keep.sum())
+        if count == self._count:
+            return
+        for column in self._columns.values():
+            column[:count] = column[:self._count][keep]
+        self._count = count
+
+    def clear(self):
+        self._count = 0
+
+    def record(self):
+        """Remember where every entity is, for ``blended`` to draw from."""
+        count = self._count
+        columns = self._columns
+        columns['previous_x'][:count] = columns['x'][:count]
+        columns['previous_y'][:count] = columns['y'][:count]
+
+    def blended(self, amount):
+        """The ``(x, y)`` arrays ``amount`` of the way from the recorded positions to the current ones."""
+        x, y = self['x'], self['y']
+        if amount >= 1:
+            return x, y
+        previous_x, previous_y = self['previous_x'], self['previous_y']
+        return previous_x + (x - previous_x) * amount, previous_y + (y - previous_y) * amount
+
+
+def apply_gravity(world: World, gravity, max_speed=None):
+    """Accelerate every entity downwards by ``gravity``, up to ``max_speed`` if given."""
+    vy = world['vy']
+    vy += gravity
+    if max_speed is not None:
+        np.minimum(vy, max_speed, out=vy)
+
+
+def move(world: World):
+    """Move every entity by its velocity."""
+    world['x'] += world['vx']
+    world['y'] += world['vy']
+
+
+def overlapping(world: World, left, top, width, height) -> np.ndarray:
+    """
+    Which entities' boxes overlap the given box, with the same edge rules as
+    ``pygame.Rect.colliderect``. Given arrays of boxes shaped ``(n, 1)``, the result
+    is an ``(n, len(world))`` table of which entities overlap which box.
+    """
+    x, y = world['x'], world['y']
+    return ((x < left + width) & (x + world['width'] > left) &
+            (y < top + height) & (y + world['height'] > top))
+
+
+def outside(world: World, left, top, right, bottom) -> np.ndarray:
+    """Which entities' boxes lie entirely beyond one of the given edges, for culling."""
+    x, y = world['x'], world['y']
+    return (x + world['width'] < left) | (x > right) | (y + world['height'] < top) | (y > bottom)
+
+
+def expired(world: World, now) -> np.ndarray:
+    """Which entities are due to be removed by tick ``now``."""
+    expires = world['expires']
+    return (expires >= 0) & (expires <= now)
+
+
+def sprite_blits(world: World, sprite: Callable, offset=(0, 0), amount=1) -> List[tuple]:
+    """
+    The ``(surface, position)`` blits drawing each entity as ``sprite(kind)`` at its
+    position plus ``offset``, ``amount`` of the way from its recorded position.
+    ``sprite`` is called once for each kind there is an entity of.
+    """
+    kinds = world['kind'].tolist()
+    surfaces = {kind: sprite(kind) for kind in set(kinds)}
+    x, y = world.blended(amount)
+    x = (x + offset[0]).astype(np.intp).tolist()
+    y = (y + offset[1]).astype(np.intp).tolist()
+    return [(surfaces[kind], (left, top)) for kind, left, top in zip(kinds, x, y)]
@@ -0,0 +1,39 @@
+import pygame
+
+__all__ = ['Entity']
+
+
+class Entity:
+    """
+    Base class for anything in a game world that has a position and a size.
+
+    Entities use ``__slots__`` instead of a per-instance ``__dict__``, which keeps
+    every instance small and makes attribute access in per-frame update loops
+    cheaper. Subclasses must declare their own ``__slots__`` listing only the
+    attributes they add, otherwise they silently get a ``__dict__`` back.
+
+    Attributes:
+        x (float): The left edge of the bounding box.
+        y (float): The top edge of the bounding box.
+        width (int): The width of the bounding box.
+        height (int): The height of the bounding box.
+    """
+    __slots__ = ('x', 'y', 'width', 'height')
+
+    def __init__(self, x, y, width, height):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    @property
+    def rect(self) -> pygame.Rect:
+        """The bounding box as a new ``pygame.Rect``."""
+        return pygame.Rect(int(self.x), int(self.y), int(self.width), int(self.height))
+
+    def overlaps(self, other) -> bool:
+        """Axis-aligned bounding box test against another entity, without allocating a Rect."""
+        return (self.x < other.x + other.width and
+                self.x + self.width > other.x and
+                self.y < other.y + other.height and
+                self.y + self.height > other.y)
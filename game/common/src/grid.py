@@ -0,0 +1,149 @@
+import random
+from typing import Iterator, Optional, Tuple
+
+__all__ = ['SpatialGrid', 'OccupancyGrid']
+
+
+class SpatialGrid:
+    """
+    Buckets entities by the square cell their ``(x, y)`` falls in, so the entities
+    near a point are found by looking in a few cells instead of at every entity.
+
+    Entities that move must be passed to ``move`` to stay in the right cell.
+
+    Attributes:
+        cell_size (float): The width and height of a cell. Queries are cheapest with
+            a radius no larger than this.
+    """
+
+    def __init__(self, cell_size, entities=()):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._where = {}
+        for entity in entities:
+            self.insert(entity)
+
+    def __len__(self):
+        return len(self._where)
+
+    def _cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, entity):
+        cell = self._cell(entity.x, entity.y)
+        self._where[entity] = cell
+        self._cells.setdefault(cell, []).append(entity)
+
+    def remove(self, entity):
+        cell = self._where.pop(entity)
+        bucket = self._cells[cell]
+        bucket.remove(entity)
+        if not bucket:
+            del self._cells[cell]
+
+    def move(self, entity):
+        """Re-bucket ``entity`` after its position changed."""
+        if self._cell(entity.x, entity.y) != self._where[entity]:
+            self.remove(entity)
+            self.insert(entity)
+
+    def near(self, x, y, radius) -> Iterator:
+        """
+        The entities whose position is within ``radius`` of ``(x, y)`` along both axes,
+        plus possibly some a little further away. Callers apply their own exact test.
+        """
+        left, top = self._cell(x - radius, y - radius)
+        right, bottom = self._cell(x + radius, y + radius)
+        cells = self._cells
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                bucket = cells.get((cell_x, cell_y))
+                if bucket:
+                    yield from bucket
+
+
+class OccupancyGrid:
+    """
+    Tracks which square cells of a ``width`` by ``height`` area are free, so a random
+    free point can be drawn in constant time instead of by trial and error.
+
+    Rects are added with ``occupy`` under a key and taken out again with ``release``;
+    every cell they touch, after growing them by ``margin`` on each side, stays
+    occupied while any rect covers it. Something of half-size up to ``margin``
+    centered on a sampled point overlaps none of the occupied rects.
+
+    Attributes:
+        cell_size (int): The width and height of a cell.
+        margin (int): How far around occupied rects is kept clear.
+    """
+
+    def __init__(self, width, height, cell_size, margin=0):
+        self.cell_size = cell_size
+        self.margin = margin
+        self._columns = -(-width // cell_size)
+        self._rows = -(-height // cell_size)
+        self._rects = {}
+        self.clear()
+
+    def __len__(self):
+        """The number of free cells."""
+        return len(self._free)
+
+    def clear(self):
+        """Free every cell."""
+        cells = self._columns * self._rows
+        self._rects.clear()
+        self._counts = [0] * cells
+        # Free cells in no particular order, and where each cell is in that list
+        self._free = list(range(cells))
+        self._slots = list(range(cells))
+
+    def _cells(self, rect):
+        left, top, width, height = rect
+        margin, size = self.margin, self.cell_size
+        first_column = max(0, int((left - margin) // size))
+        last_column = min(self._columns - 1, int((left + width + margin - 1) // size))
+        first_row = max(0, int((top - margin) // size))
+        last_row = min(self._rows - 1, int((top + height + margin - 1) // size))
+        for row in range(first_row, last_row + 1):
+            start = row * self._columns
+            yield from range(start + first_column, start + last_column + 1)
+
+    def occupy(self, key, rect):
+        """Mark the cells under ``rect`` as taken until ``key`` is released."""
+        if key in self._rects:
+            self.release(key)
+        rect = tuple(rect)
+        self._rects[key] = rect
+        counts, free, slots = self._counts, self._free, self._slots
+        for cell in self._cells(rect):
+            counts[cell] += 1
+            if counts[cell] == 1:
+                # Swap the last free cell into this one's slot
+                slot = slots[cell]
+                last = free.pop()
+                if last != cell:
+                    free[slot] = last
+                    slots[last] = slot
+                slots[cell] = -1
+
+    def release(self, key):
+        """Free the cells that only ``key``'s rect was covering. Unknown keys are ignored."""
+        rect = self._rects.pop(key, None)
+        if rect is None:
+            return
+        counts, free, slots = self._counts, self._free, self._slots
+        for cell in self._cells(rect):
+            counts[cell] -= 1
+            if counts[cell] == 0:
+                slots[cell] = len(free)
+                free.append(cell)
+
+    def sample(self, rng=random) -> Optional[Tuple[int, int]]:
+        """A uniformly random point in free space, or ``None`` if every cell is taken."""
+        free = self._free
+        if not free:
+            return None
+        row, column = divmod(free[rng.randrange(len(free))], self._columns)
+        size = self.cell_size
+        return column * size + rng.randrange(size), row * size + rng.randrange(size)
@@ -0,0 +1,181 @@
+import random
+from typing import NamedTuple
+
+import pygame
+
+__all__ = ['VirtualKey', 'key_name', 'KeyState', 'InputProvider', 'KeyboardInput', 'KEYBOARD', 'Bot', 'RandomWalker']
+
+# Bit assigned to each key that has been asked about, in the order they were first seen
+_KEY_BITS = {}
+_KEYS = []
+
+
+def _bit(key):
+    bit = _KEY_BITS.get(key)
+    if bit is None:
+        bit = _KEY_BITS[key] = 1 << len(_KEYS)
+        _KEYS.append(key)
+    return bit
+
+
+class VirtualKey(NamedTuple):
+    """
+    A key that exists on no keyboard, for players driven by bots or remote input.
+    It can be pressed on a ``KeyState`` and sent in KEYDOWN events like a real key.
+    """
+    seat: int
+    control: str
+
+    def __str__(self):
+        return f'P{self.seat + 1} {self.control}'
+
+
+def key_name(key) -> str:
+    """A readable name for a pygame key code or a ``VirtualKey``."""
+    return pygame.key.name(key) if type(key) is int else str(key)
+
+
+class KeyState:
+    """
+    The keys held during one frame, as a bitmask, together with the mask of the
+    frame before so that presses and releases can be told apart from holds.
+
+    It is indexed like ``pygame.key.get_pressed()``. Every key gets a bit the first
+    time it is used, so the masks only cover keys that some player listens to.
+
+    Attributes:
+        mask (int): One bit per held key.
+        previous (int): The mask of the previous frame.
+    """
+    __slots__ = ('mask', 'previous')
+
+    def __init__(self, down=(), previous=0):
+        self.mask = 0
+        self.previous = previous
+        for key in down:
+            self.press(key)
+
+    def __getitem__(self, key):
+        return bool(self.mask & _bit(key))
+
+    def press(self, key):
+        self.mask |= _bit(key)
+
+    def pressed(self, key) -> bool:
+        """Whether ``key`` went down this frame."""
+        bit = _bit(key)
+        return bool(self.mask & bit and not self.previous & bit)
+
+    def released(self, key) -> bool:
+        """Whether ``key`` went up this frame."""
+        bit = _bit(key)
+        return bool(self.previous & bit and not self.mask & bit)
+
+    def newly_pressed(self):
+        """The keys that went down this frame."""
+        edges = self.mask & ~self.previous
+        return [key for index, key in enumerate(_KEYS) if edges >> index & 1]
+
+
+class InputProvider:
+    """Supplies the key state a player reacts to. Players poll it once per frame."""
+
+    def get_pressed(self) -> KeyState:
+        raise NotImplementedError
+
+
+class KeyboardInput(InputProvider):
+    """
+    The real keyboard, read once per frame by ``capture`` and shared by every player.
+
+    Attributes:
+        state (KeyState): The keys held during the current frame.
+    """
+
+    def __init__(self):
+        self.state = KeyState()
+
+    def capture(self):
+        """Take the snapshot for a new frame. The game loop calls this after handling events."""
+        held = pygame.key.get_pressed()
+        mask = 0
+        for key, bit in _KEY_BITS.items():
+            # Only real key codes can be looked up; anything else is never held on a keyboard
+            if type(key) is int and held[key]:
+                mask |= bit
+        state = KeyState(previous=self.state.mask)
+        state.mask = mask
+        self.state = state
+
+    def get_pressed(self):
+        return self.state
+
+
+KEYBOARD = KeyboardInput()
+
+
+class Bot(InputProvider):
+    """
+    Base class for scripted players.
+
+    Once per frame, ``update`` asks ``think`` which keys to hold. Games that poll the
+    keyboard read the result through ``get_pressed``, and games that react to key
+    presses receive the newly pressed keys as synthetic KEYDOWN events from ``events``.
+
+    Creating a bot takes over the player's input.
+
+    Attributes:
+        player: The player this bot controls.
+        rng (random.Random): Source of randomness, seeded for reproducible runs.
+    """
+
+    def __init__(self, player, rng: random.Random = None):
+        self.player = player
+        player.input = self
+        self.rng = rng if rng is not None else random.Random()
+        self.keys = KeyState()
+        self.previous_keys = KeyState()
+
+    def update(self):
+        self.previous_keys = self.keys
+        self.keys = KeyState(previous=self.previous_keys.mask)
+        self.think(self.keys)
+
+    def think(self, keys: KeyState):
+        """Press the keys to hold this frame."""
+        raise NotImplementedError
+
+    def get_pressed(self):
+        return self.keys
+
+    def events(self):
+        """KEYDOWN events for the keys pressed this frame but not the previous one."""
+        return [pygame.event.Event(pygame.KEYDOWN, key=key) for key in self.keys.newly_pressed()]
+
+
+class RandomWalker(Bot):
+    """
+    Walks in a random direction for a random number of frames, then picks again,
+    and jumps now and then.
+
+    Attributes:
+        jump_control (str): The name of the jump control in the player's controls.
+        jump_chance (float): The chance of jumping on any given frame.
+    """
+
+    def __init__(self, player, rng: random.Random = None, jump_control='up', jump_chance=0.05):
+        super().__init__(player, rng)
+        self.jump_control = jump_control
+        self.jump_chance = jump_chance
+        self.direction = None
+        self.frames_left = 0
+
+    def think(self, keys):
+        if self.frames_left <= 0:
+            self.direction = self.rng.choice(['left', 'right', None])
+            self.frames_left = self.rng.randint(10, 90)
+        self.frames_left -= 1
+        if self.direction is not None:
+            keys.press(self.player.controls[self.direction])
+        if self.jump_control in self.player.controls and self.rng.random() < self.jump_chance:
+            keys.press(self.player.controls[self.jump_control])
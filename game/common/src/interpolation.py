@@ -0,0 +1,53 @@
+from contextlib import contextmanager
+
+__all__ = ['lerp', 'MotionHistory']
+
+
+def lerp(start, end, amount):
+    """The value ``amount`` of the way from ``start`` to ``end``."""
+    return start + (end - start) * amount
+
+
+class MotionHistory:
+    """
+    Where entities were at the previous simulation step, so they can be drawn part
+    of the way between that step and the current one.
+
+    Sessions ``record`` their moving entities at the start of each step and draw
+    inside ``blend``. Entities created since the last record are drawn where they are.
+    """
+
+    def __init__(self):
+        self._previous = {}
+
+    def record(self, entities):
+        """Remember the positions of ``entities``, forgetting any others."""
+        self._previous = {entity: (entity.x, entity.y) for entity in entities}
+
+    def settle(self, entities):
+        """Draw ``entities`` where they are now, for entities that were moved by a jump rather than by motion."""
+        previous = self._previous
+        for entity in entities:
+            previous[entity] = (entity.x, entity.y)
+
+    @contextmanager
+    def blend(self, entities, amount):
+        """Move ``entities`` ``amount`` of the way from their recorded positions for the ``with`` block."""
+        previous = self._previous
+        if amount >= 1 or not previous:
+            yield
+            return
+        moved = []
+        for entity in entities:
+            start = previous.get(entity)
+            if start is not None:
+                x, y = entity.x, entity.y
+                moved.append((entity, x, y))
+                entity.x = lerp(start[0], x, amount)
+                entity.y = lerp(start[1], y, amount)
+        try:
+            yield
+        finally:
+            for entity, x, y in moved:
+                entity.x = x
+                entity.y = y
@@ -0,0 +1,192 @@
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import List, NamedTuple
+
+from utils.constants import LEADERBOARD_FLUSH_INTERVAL, LEADERBOARD_PATH
+
+__all__ = ['LeaderboardEntry', 'Leaderboard', 'default_leaderboard']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    game TEXT NOT NULL,
+    players INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_rank ON scores (game, players, score DESC, recorded_at);
+"""
+
+_LOAD = """
+SELECT game, players, score, recorded_at FROM (
+    SELECT *, ROW_NUMBER() OVER (PARTITION BY game, players ORDER BY score DESC, recorded_at) AS rank
+    FROM scores
+) WHERE rank <= ? ORDER BY game, players, rank
+"""
+
+_INSERT = 'INSERT INTO scores (game, players, score, recorded_at) VALUES (?, ?, ?, ?)'
+
+# Queued after the last score to make the writer thread exit
+_STOP = object()
+
+_log = logging.getLogger(__name__)
+
+
+class LeaderboardEntry(NamedTuple):
+    """One recorded score."""
+    score: int
+    recorded_at: float
+
+
+class Leaderboard:
+    """
+    High scores kept in an SQLite database, per game and number of players.
+
+    Scores are written by a background thread, which waits up to ``flush_interval``
+    seconds to commit several at once, so ``submit`` never touches the disk. The
+    database is in WAL mode, so other processes can read it while it is written.
+    The best ``cache_size`` scores of each board are kept in memory, and ``top``
+    reads only those, waiting for the thread to load them the first time.
+
+    If the database cannot be opened or written, the error is logged once, later
+    scores are dropped, and the boards keep what they held, so a game carries on
+    without its scores rather than crashing.
+
+    Attributes:
+        path (str): The database file, or ``':memory:'``.
+        flush_interval (float): How long the writer waits to batch more scores.
+        cache_size (int): How many scores of each board are kept in memory.
+    """
+
+    def __init__(self, path=LEADERBOARD_PATH, flush_interval=LEADERBOARD_FLUSH_INTERVAL, cache_size=100):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.cache_size = cache_size
+        self._boards = {}
+        self._queue = queue.SimpleQueue()
+        self._loaded = threading.Event()
+        # Scores submitted before the database has loaded, ranked once it has
+        self._unranked = []
+        self._lock = threading.Lock()
+        self._error = None
+        self._writer = threading.Thread(target=self._run, name='leaderboard', daemon=True)
+        self._writer.start()
+
+    def submit(self, game: str, players: int, score: int):
+        """
+        Record a score without waiting for the disk. It is ranked at once, or as soon as
+        the database has loaded, and written to disk within ``flush_interval``. It is
+        dropped if the database has failed.
+        """
+        if self._error is not None:
+            return
+        entry = LeaderboardEntry(score, time.time())
+        with self._lock:
+            if self._loaded.is_set():
+                self._rank(game, players, entry)
+            else:
+                self._unranked.append((game, players, entry))
+        self._queue.put((game, players, score, entry.recorded_at))
+
+    def top(self, game: str, players: int, n=10) -> List[LeaderboardEntry]:
+        """The best ``n`` scores of a board, highest first and oldest first among equals."""
+        self._loaded.wait()
+        return self._boards.get((game, players), [])[:n]
+
+    def best(self, game: str, players: int) -> int:
+        """The highest score of a board, or 0 if it is empty."""
+        entries = self.top(game, players, 1)
+        return entries[0].score if entries else 0
+
+    def flush(self):
+        """Wait until every submitted score has been committed."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        """Commit the remaining scores and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    def _rank(self, game, players, entry):
+        entries = self._boards.setdefault((game, players), [])
+        entries.append(entry)
+        entries.sort(key=lambda entry: (-entry.score, entry.recorded_at))
+        del entries[self.cache_size:]
+
+    def _fail(self, error):
+        if self._error is None:
+            _log.warning('Scores will not be saved to the leaderboard at %s: %s', self.path, error)
+            self._error = error
+
+    def _run(self):
+        connection = None
+        try:
+            connection = self._open()
+        except (sqlite3.Error, OSError) as error:
+            self._boards.clear()
+            self._fail(error)
+        finally:
+            with self._lock:
+                if connection is not None:
+                    for game, players, entry in self._unranked:
+                        self._rank(game, players, entry)
+                self._unranked.clear()
+                # Set however opening went, so nothing waits for the scores forever
+                self._loaded.set()
+        try:
+            # Without a database scores are dropped, but flush and close still return
+            while self._write_batch(connection):
+                pass
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def _open(self):
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute('PRAGMA journal_mode=WAL')
+        # WAL commits are durable against application crashes without syncing every one
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.executescript(_SCHEMA)
+        for game, players, score, recorded_at in connection.execute(_LOAD, (self.cache_size,)):
+            self._boards.setdefault((game, players), []).append(LeaderboardEntry(score, recorded_at))
+        return connection
+
+    def _write_batch(self, connection) -> bool:
+        """Commit the next batch of scores, returning ``False`` once asked to stop."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while isinstance(batch[-1], tuple):
+            try:
+                batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                break
+
+        rows = [item for item in batch if isinstance(item, tuple)]
+        if rows and connection is not None and self._error is None:
+            try:
+                with connection:
+                    connection.executemany(_INSERT, rows)
+            except (sqlite3.Error, OSError) as error:
+                self._fail(error)
+        for item in batch:
+            if isinstance(item, threading.Event):
+                item.set()
+        return batch[-1] is not _STOP
+
+
+@lru_cache(maxsize=None)
+def default_leaderboard() -> Leaderboard:
+    """The leaderboard at ``LEADERBOARD_PATH``, opened on first use and closed at exit."""
+    leaderboard = Leaderboard()
+    atexit.register(leaderboard.close)
+    return leaderboard
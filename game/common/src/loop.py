@@ -0,0 +1,240 @@
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, NamedTuple
+
+import pygame
+
+from common.src.budget import FrameBudget
+from common.src.canvas import present
+from common.src.analytics import EventType, default_event_log
+from common.src.input import KEYBOARD
+from common.src.leaderboard import default_leaderboard
+from common.src.profiling import default_profiler
+from common.src.session import Session
+from common.src.streaming import default_streamer
+
+__all__ = ['run_interactive', 'run_pipelined', 'run_headless', 'SoakWindow', 'soak']
+
+# Simulation time that may build up while a fixed-rate loop is stalled, in seconds
+MAX_LAG = 0.25
+# Fixed-rate steps taken at most per frame drawn
+MAX_STEPS_PER_FRAME = 5
+
+
+def _start(new_session: Callable[[], Session], event_log, leaderboard=None) -> Session:
+    """
+    Create a session, sending its events to ``event_log`` if it is recorded.
+
+    Recorded sessions recall their past scores from ``leaderboard``, which also opens
+    the default leaderboard long before the session ends and submits to it.
+    """
+    session = new_session()
+    if session.game_name is not None:
+        session.event_log = default_event_log() if event_log is None else event_log
+        session.log_event(EventType.START)
+        session.recall(default_leaderboard() if leaderboard is None else leaderboard)
+    return session
+
+
+def _record(session: Session, leaderboard):
+    """Submit the scores of ``session`` once, when it is over or being left."""
+    if session.game_name is None or session.recorded:
+        return
+    session.recorded = True
+    session.log_event(EventType.END)
+    session.record(default_leaderboard() if leaderboard is None else leaderboard)
+
+
+def _dispatch_events(session: Session, new_session: Callable[[], Session], leaderboard=None, event_log=None,
+                     profiler=None):
+    """
+    Handle pending events for ``session`` and return the session to continue with, or
+    ``None`` if the player asked to return to the menu.
+    """
+    for event in pygame.event.get():
+        if profiler is not None and profiler.handle_event(event, session.game_name or 'game'):
+            continue
+        if event.type == pygame.QUIT:
+            _record(session, leaderboard)
+            pygame.quit()
+            sys.exit()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            _record(session, leaderboard)
+            return None
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE and session.game_over:
+            session = _start(new_session, event_log, leaderboard)
+        else:
+            session.handle_event(event)
+    return session
+
+
+def _advance_fixed(session: Session, lag: float, step: float) -> float:
+    """
+    Advance ``session`` once per whole ``step`` seconds in ``lag`` and return the time left over.
+
+    At most ``MAX_STEPS_PER_FRAME`` steps are taken, so a slow frame makes the game run
+    slower for a moment instead of falling further and further behind.
+    """
+    steps = 0
+    while lag >= step and not session.game_over:
+        if steps == MAX_STEPS_PER_FRAME:
+            return lag % step
+        KEYBOARD.capture()
+        session.advance()
+        lag -= step
+        steps += 1
+    return lag
+
+
+def run_interactive(screen, new_session: Callable[[], Session], fps=60, leaderboard=None, event_log=None,
+                    tick_rate=None, profiler=None, streamer=None):
+    """
+    Play sessions on ``screen`` until ESC is pressed or the session is finished.
+
+    Closing the window quits the program, and SPACE starts a new session once the
+    current one is over. The session's ``quality`` follows a ``FrameBudget`` for ``fps``.
+    Scores go to ``leaderboard``, by default ``default_leaderboard()``, when a session
+    ends or is left, and gameplay events go to ``event_log``, by default ``default_event_log()``.
+
+    By default the session is advanced once per frame drawn. With a ``tick_rate`` it is
+    advanced that many times per second of wall time however fast frames are drawn,
+    and ``session.interpolation`` tells ``draw`` how far the next step is towards being due.
+    Quality is then only lowered when frames cannot keep up with the tick rate.
+
+    Pressing ``PROFILE_KEY`` profiles the next frames with ``profiler``, by default
+    ``default_profiler()``. Each frame drawn is sent to spectators through ``streamer``,
+    by default ``default_streamer()``, which is ``None`` unless ``STREAMING`` is set.
+    """
+    profiler = default_profiler() if profiler is None else profiler
+    streamer = default_streamer() if streamer is None else streamer
+    clock = pygame.time.Clock()
+    budget = FrameBudget(tick_rate or fps or 60)
+    step = 1 / tick_rate if tick_rate else None
+    lag = 0.0
+    session = _start(new_session, event_log, leaderboard)
+    while not session.finished:
+        current = session
+        session = _dispatch_events(session, new_session, leaderboard, event_log, profiler)
+        if session is None:
+            return
+
+        start = time.perf_counter()
+        session.quality = budget.quality
+        if step is None:
+            KEYBOARD.capture()
+            session.advance()
+        else:
+            if session is not current:
+                lag = 0.0
+            lag = _advance_fixed(session, min(lag + clock.get_time() / 1000, MAX_LAG), step)
+            session.interpolation = lag / step
+        if session.game_over:
+            _record(session, leaderboard)
+        session.draw(screen)
+        if streamer is not None:
+            streamer.send(screen)
+        present(screen)
+        budget.record((time.perf_counter() - start) * 1000)
+        clock.tick(fps)
+        if profiler.active:
+            profiler.end_frame()
+
+
+def _advance_and_snapshot(session: Session):
+    session.advance()
+    return session.snapshot()
+
+
+def run_pipelined(screen, new_session: Callable[[], Session], fps=60, leaderboard=None, event_log=None,
+                  profiler=None, streamer=None):
+    """
+    Like ``run_interactive``, but simulate the next frame on a worker thread while
+    the current one is drawn from a snapshot.
+
+    Pygame releases the GIL while it blits and flips, so when both phases are heavy a
+    frame costs closer to the slower of the two than to their sum. Events are handled
+    between frames, while the worker is idle, and what is on screen trails the
+    simulation by one frame. Sessions must implement ``Session.snapshot``.
+    """
+    profiler = default_profiler() if profiler is None else profiler
+    streamer = default_streamer() if streamer is None else streamer
+    clock = pygame.time.Clock()
+    budget = FrameBudget(fps or 60)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='simulation') as simulation:
+        session = _start(new_session, event_log, leaderboard)
+        snapshot = session.snapshot()
+        while not session.finished:
+            current = session
+            session = _dispatch_events(session, new_session, leaderboard, event_log, profiler)
+            if session is None:
+                return
+            KEYBOARD.capture()
+            if session.game_over:
+                _record(session, leaderboard)
+            if session is not current:
+                snapshot = session.snapshot()
+
+            start = time.perf_counter()
+            session.quality = budget.quality
+            next_snapshot = simulation.submit(profiler.runcall, _advance_and_snapshot, session)
+            snapshot.draw(screen)
+            if streamer is not None:
+                streamer.send(screen)
+            present(screen)
+            snapshot = next_snapshot.result()
+            budget.record((time.perf_counter() - start) * 1000)
+            clock.tick(fps)
+            if profiler.active:
+                profiler.end_frame()
+
+
+def run_headless(session: Session, frames: int, screen=None) -> Session:
+    """Advance ``session`` for up to ``frames`` frames as fast as possible, drawing only if given a surface."""
+    for _ in range(frames):
+        if session.game_over:
+            break
+        session.advance()
+        if screen is not None:
+            session.draw(screen)
+    return session
+
+
+class SoakWindow(NamedTuple):
+    """Frame-time and memory statistics for one window of a soak run."""
+    frame: int
+    mean_ms: float
+    p99_ms: float
+    max_ms: float
+    memory_kb: float
+
+
+def soak(new_session: Callable[[], Session], frames: int, window=600, screen=None) -> Iterator[SoakWindow]:
+    """
+    Run sessions back to back for ``frames`` frames, yielding statistics every ``window`` frames.
+
+    A new session is started whenever one ends. Memory is the Python heap as traced by
+    ``tracemalloc``, so growth between windows points at objects that are never released.
+    """
+    tracemalloc.start()
+    try:
+        session = new_session()
+        times = []
+        for frame in range(1, frames + 1):
+            if session.game_over:
+                session = new_session()
+            start = time.perf_counter()
+            session.advance()
+            if screen is not None:
+                session.draw(screen)
+            times.append((time.perf_counter() - start) * 1000)
+            if frame % window == 0 or frame == frames:
+                times.sort()
+                p99 = times[min(len(times) - 1, int(len(times) * 0.99))]
+                memory_kb = tracemalloc.get_traced_memory()[0] / 1024
+                yield SoakWindow(frame, statistics.fmean(times), p99, times[-1], memory_kb)
+                times = []
+    finally:
+        tracemalloc.stop()
@@ -1,10 +1,42 @@
-from dataclasses import dataclass
-from pygame.sprite import Sprite
-from typing import Any
-
-@dataclass
-class Player(Sprite):
-    x: int
-    y: int
-    controls: dict[str, Any]
-    color: str
\ No newline at end of file
+from typing import Any, Dict, Sequence
+
+from common.src.entity import Entity
+from common.src.input import KEYBOARD, InputProvider, VirtualKey
+from utils.constants import KEYBOARD_ZONES
+
+__all__ = ['Player', 'seat_controls']
+
+
+def seat_controls(seat: int, names: Sequence[str], zones=KEYBOARD_ZONES) -> Dict[str, Any]:
+    """
+    The controls of the 0-based ``seat``, keyed by ``names``.
+
+    Seats with a keyboard zone get its keys, matched to ``names`` in the zone's
+    order: left, right, up, down. Later seats get ``VirtualKey`` controls, which
+    only bots and remote inputs press.
+    """
+    if seat < len(zones):
+        return dict(zip(names, zones[seat]))
+    return {name: VirtualKey(seat, name) for name in names}
+
+
+class Player(Entity):
+    """
+    Base class for a player-controlled entity, shared by all games.
+
+    Attributes:
+        color (tuple): The RGB color the player is drawn with.
+        controls (Any): The keys this player reacts to. Most games use a dict
+            such as ``{'left': key, 'right': key, 'up': key}``.
+        player_id (int): The 1-based number of the player.
+        input (InputProvider): Where the player reads its key state from. Defaults to
+            the real keyboard; bots replace it with themselves.
+    """
+    __slots__ = ('color', 'controls', 'player_id', 'input')
+
+    def __init__(self, x, y, width, height, color, controls: Any, player_id: int = 0):
+        super().__init__(x, y, width, height)
+        self.color = color
+        self.controls = controls
+        self.player_id = player_id
+        self.input: InputProvider = KEYBOARD
@@ -0,0 +1,149 @@
+import cProfile
+import io
+import os
+import pstats
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from functools import lru_cache
+
+import pygame
+
+from utils.constants import PROFILE_FRAMES, PROFILE_KEY, PROFILE_PATH
+
+__all__ = ['FrameProfiler', 'default_profiler']
+
+# Rows in each table of a capture's summary
+_SUMMARY_ROWS = 30
+# Allocations made by the profiling itself, left out of the heap table
+_HEAP_FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__),
+                 tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+                 tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+                 tracemalloc.Filter(False, cProfile.__file__),
+                 tracemalloc.Filter(False, pstats.__file__),
+                 tracemalloc.Filter(False, __file__))
+# From Python 3.12 a profile sees every thread, and only one profile may be enabled at a time
+_PROFILES_ALL_THREADS = sys.version_info >= (3, 12)
+
+
+class FrameProfiler:
+    """
+    Captures the next ``frames`` frames under ``cProfile`` when ``key`` is pressed, and
+    how the Python heap grew meanwhile according to ``tracemalloc``.
+
+    Each capture is written to ``directory`` as ``<game>-<time>.prof``, for ``pstats``
+    or a viewer such as snakeviz, and ``<game>-<time>.txt``, a summary of frame times,
+    the costliest functions and the lines that allocated the most. The files are
+    written on a background thread, so the game carries on meanwhile.
+
+    Loops pass their events to ``handle_event`` and, while ``active``, call
+    ``end_frame`` after each frame, so a disarmed profiler costs one attribute check
+    per frame. Work handed to another thread during a capture is profiled too, as
+    long as it runs through ``runcall``: before Python 3.12 it gets a second profile,
+    merged into the capture, while from 3.12 the capture's profile already sees it.
+
+    Attributes:
+        frames (int): The number of frames a capture lasts.
+        directory (str): Where captures are written.
+        key (int): The key that starts a capture.
+        active (bool): Whether a capture is running.
+        captures (list): The paths of the captures written so far, without extension.
+    """
+
+    def __init__(self, frames=PROFILE_FRAMES, directory=PROFILE_PATH, key=PROFILE_KEY):
+        self.frames = frames
+        self.directory = directory
+        self.key = key
+        self.active = False
+        self.captures = []
+        self._writer = None
+
+    def handle_event(self, event, name='game') -> bool:
+        """Start capturing ``name`` if ``event`` is a press of ``key``, and return whether it was."""
+        if event.type != pygame.KEYDOWN or event.key != self.key:
+            return False
+        self.start(name)
+        return True
+
+    def start(self, name='game'):
+        """Start capturing, unless a capture is already running."""
+        if self.active:
+            return
+        self.active = True
+        self._name = name
+        self._frame_times = []
+        self._owns_tracing = not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+        self._heap_before = tracemalloc.take_snapshot()
+        self._helper_profile = None if _PROFILES_ALL_THREADS else cProfile.Profile()
+        self._profile = cProfile.Profile()
+        self._last_frame = time.perf_counter()
+        self._profile.enable()
+
+    def runcall(self, function, *args):
+        """Call ``function(*args)`` on any thread, profiled as part of the capture if one is running."""
+        if not self.active or self._helper_profile is None:
+            return function(*args)
+        return self._helper_profile.runcall(function, *args)
+
+    def end_frame(self):
+        """Count a frame of the capture, finishing it after the last one."""
+        now = time.perf_counter()
+        self._frame_times.append((now - self._last_frame) * 1000)
+        self._last_frame = now
+        if len(self._frame_times) >= self.frames:
+            self._finish()
+
+    def wait(self):
+        """Block until the last capture has been written."""
+        if self._writer is not None:
+            self._writer.join()
+
+    def _finish(self):
+        self._profile.disable()
+        heap_after = tracemalloc.take_snapshot()
+        if self._owns_tracing:
+            tracemalloc.stop()
+        self.active = False
+        path = os.path.join(self.directory, f"{self._name}-{time.strftime('%Y%m%d-%H%M%S')}")
+        self.wait()
+        self._writer = threading.Thread(target=self._write, name='profile-writer', daemon=True,
+                                        args=(path, self._name, self._profile, self._helper_profile,
+                                              self._heap_before, heap_after, self._frame_times))
+        self._writer.start()
+
+    def _write(self, path, name, profile, helper_profile, heap_before, heap_after, frame_times):
+        stats = pstats.Stats(profile)
+        if helper_profile is not None:
+            helper_profile.create_stats()
+            if helper_profile.stats:
+                stats.add(helper_profile)
+        os.makedirs(self.directory, exist_ok=True)
+        stats.dump_stats(path + '.prof')
+
+        heap = heap_after.filter_traces(_HEAP_FILTERS).compare_to(heap_before.filter_traces(_HEAP_FILTERS), 'lineno')
+        ordered = sorted(frame_times)
+        summary = io.StringIO()
+        summary.write(f"{name}: {len(frame_times)} frames, {sum(frame_times) / 1000:.2f} s\n")
+        summary.write(f"frame ms: mean {statistics.fmean(ordered):.2f}, "
+                      f"p99 {ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]:.2f}, max {ordered[-1]:.2f}\n")
+        summary.write(f"heap growth: {sum(stat.size_diff for stat in heap) / 1024:+.1f} KiB\n")
+        for title, order in (('cumulative time', pstats.SortKey.CUMULATIVE), ('own time', pstats.SortKey.TIME)):
+            summary.write(f"\nFunctions by {title}\n")
+            stats.stream = summary
+            stats.sort_stats(order).print_stats(_SUMMARY_ROWS)
+        summary.write("\nHeap growth by line\n")
+        for stat in heap[:_SUMMARY_ROWS]:
+            summary.write(f"{stat}\n")
+        with open(path + '.txt', 'w') as file:
+            file.write(summary.getvalue())
+        self.captures.append(path)
+
+
+@lru_cache(maxsize=None)
+def default_profiler() -> FrameProfiler:
+    """The profiler every game loop listens to, writing to ``PROFILE_PATH``."""
+    return FrameProfiler()
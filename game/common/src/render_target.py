@@ -0,0 +1,97 @@
+from contextlib import contextmanager
+
+import numpy as np
+import pygame
+
+__all__ = ['RenderTarget']
+
+# ITU-R BT.601 luma weights, scaled so they sum to 256
+_LUMA_WEIGHTS = (77, 150, 29)
+
+
+class RenderTarget:
+    """
+    A surface that sessions draw into, with NumPy views of its pixels for agents,
+    video capture and golden-image tests.
+
+    Offscreen targets own their pixel memory as a NumPy array and build the surface
+    on top of it, so their pixel view is permanent and needs neither a copy nor a
+    surface lock. Targets wrapping an existing surface, such as the display, borrow a
+    locked ``pygame.surfarray.pixels3d`` view for the duration of a ``with`` block.
+
+    Pixel arrays are indexed ``[x, y, channel]``, like ``pygame.surfarray``.
+
+    Attributes:
+        surface (pygame.Surface): The surface to draw into.
+    """
+
+    def __init__(self, surface: pygame.Surface, buffer: np.ndarray = None):
+        self.surface = surface
+        self._buffer = buffer
+        self._view = None if buffer is None else buffer[:, :, :3].transpose(1, 0, 2)
+        self._grayscale_buffers = {}
+
+    @classmethod
+    def offscreen(cls, size):
+        """A target with its own pixel memory, independent of the display."""
+        width, height = size
+        buffer = np.zeros((height, width, 4), dtype=np.uint8)
+        return cls(pygame.image.frombuffer(buffer, (width, height), 'RGBX'), buffer)
+
+    @classmethod
+    def display(cls):
+        """A target wrapping the current display surface."""
+        return cls(pygame.display.get_surface())
+
+    @property
+    def size(self):
+        return self.surface.get_size()
+
+    def render(self, session):
+        """Draw the current frame of ``session`` into this target."""
+        session.draw(self.surface)
+        return self
+
+    @contextmanager
+    def pixels(self):
+        """
+        A ``(width, height, 3)`` uint8 view of the pixels. Writes go straight to the surface.
+
+        Borrowed surfaces stay locked, and cannot be drawn to, until the ``with``
+        block ends and no other reference to the view is left.
+        """
+        if self._view is not None:
+            yield self._view
+            return
+        view = pygame.surfarray.pixels3d(self.surface)
+        try:
+            yield view
+        finally:
+            del view
+
+    def grayscale(self, factor=1) -> np.ndarray:
+        """
+        The frame as ``(width // factor, height // factor)`` uint8 luma, keeping every
+        ``factor``-th pixel in each direction.
+
+        The result is computed in buffers that belong to the target and is overwritten
+        by the next call with the same ``factor``; copy it to keep it.
+        """
+        width, height = self.size
+        shape = (width // factor, height // factor)
+        if factor not in self._grayscale_buffers:
+            self._grayscale_buffers[factor] = (np.empty(shape, dtype=np.uint16),
+                                               np.empty(shape, dtype=np.uint16),
+                                               np.empty(shape, dtype=np.uint8))
+        luma, channel, out = self._grayscale_buffers[factor]
+
+        with self.pixels() as pixels:
+            sampled = pixels[:shape[0] * factor:factor, :shape[1] * factor:factor]
+            np.multiply(sampled[..., 0], _LUMA_WEIGHTS[0], out=luma, dtype=np.uint16)
+            for index in (1, 2):
+                np.multiply(sampled[..., index], _LUMA_WEIGHTS[index], out=channel, dtype=np.uint16)
+                np.add(luma, channel, out=luma)
+            del sampled
+        np.right_shift(luma, 8, out=luma)
+        np.copyto(out, luma, casting='unsafe')
+        return out
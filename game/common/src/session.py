@@ -0,0 +1,91 @@
+from typing import Dict, List
+
+from common.src.budget import Quality
+from common.src.timers import TimerWheel
+
+__all__ = ['Session']
+
+
+class Session:
+    """
+    One play-through of a game that can be advanced a frame at a time.
+
+    The interactive loop, bots and headless runners all drive games through this
+    interface, so none of them needs to know the rules of a particular game.
+
+    Attributes:
+        game_over (bool): Whether the game has ended. Ended sessions are still drawn
+            but no longer stepped.
+        finished (bool): Whether the interactive loop should return to the menu.
+        quality (Quality): How much optional detail to draw and spawn, lowered by the
+            interactive loop when frames run over budget.
+        game_name (str): The game's name, under which its scores and events are
+            recorded, or ``None`` for sessions that are not recorded.
+        recorded (bool): Whether the scores have been recorded.
+        event_log (EventLog): Where gameplay events go, or ``None`` to drop them.
+        interpolation (float): How far between the previous step and the current one
+            to draw moving things, from 0 to 1. Only a loop with a fixed tick rate
+            sets it below 1.
+        bots (list): Bots controlling some or all of the players.
+        frame (int): The number of frames advanced so far.
+        timers (TimerWheel): Cooldowns and durations, advanced once per frame stepped.
+    """
+    game_over = False
+    finished = False
+    quality = Quality.HIGH
+    game_name = None
+    recorded = False
+    event_log = None
+    interpolation = 1.0
+
+    def __init__(self):
+        self.bots: List = []
+        self.frame = 0
+        self.timers = TimerWheel()
+
+    def handle_event(self, event):
+        """React to a pygame event. Quit, ESC and restart are handled by the loop."""
+
+    def step(self):
+        """Advance the game by one frame."""
+        raise NotImplementedError
+
+    def draw(self, screen):
+        """Draw the current frame onto ``screen``."""
+        raise NotImplementedError
+
+    def snapshot(self):
+        """
+        Capture what ``draw`` needs as an object with a ``draw(screen)`` method, so the
+        pipelined loop can draw one frame while the next is simulated.
+
+        Snapshots are double-buffered: a snapshot must stay unchanged until ``snapshot``
+        has been called twice more, after which its memory may be reused.
+        """
+        raise NotImplementedError
+
+    def scores(self) -> Dict[str, int]:
+        """The current scores, keyed by a short name such as ``'score'`` or ``'p1'``."""
+        raise NotImplementedError
+
+    def recall(self, leaderboard):
+        """Read past scores from ``leaderboard``, such as the best to beat. Called once, when the session starts."""
+
+    def record(self, leaderboard):
+        """Submit the final scores to ``leaderboard``. Called once, when the session ends or is left."""
+
+    def log_event(self, event, entity=0, x=0.0, y=0.0):
+        """Add a gameplay event to the event log, if there is one."""
+        if self.event_log is not None:
+            self.event_log.log(self.game_name, event, entity, x, y)
+
+    def advance(self):
+        """Run one frame: let the bots act, then step the game and its timers unless it is over."""
+        for bot in self.bots:
+            bot.update()
+            for event in bot.events():
+                self.handle_event(event)
+        if not self.game_over:
+            self.step()
+            self.timers.advance()
+            self.frame += 1
@@ -0,0 +1,300 @@
+import atexit
+import os
+import queue
+import socket
+import struct
+import threading
+import time
+import zlib
+from functools import lru_cache
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pygame
+
+from utils.constants import STREAM_BACKLOG, STREAM_COMPRESSION, STREAM_PATH, STREAM_TILE, STREAMING
+
+__all__ = ['FrameEncoder', 'FrameDecoder', 'FrameStreamer', 'default_streamer', 'read_messages']
+
+# Flags, frame number, width, height, number of rects, compressed payload size
+_HEADER = struct.Struct('<BIHHHI')
+# The message's pixels replace the frame instead of being XORed into it
+KEYFRAME = 1
+
+
+class FrameEncoder:
+    """
+    Turns successive frames into messages holding only the parts that changed.
+
+    Frames are compared a ``tile`` by ``tile`` square at a time. Each run of changed
+    squares along a row becomes a rect, and the rect's pixels are sent XORed with the
+    previous frame's, so pixels that did not change are zeros and compress to almost
+    nothing. The rects and pixels are compressed with zlib at ``level``. A keyframe,
+    sent first and whenever the frame size changes, holds the whole frame as it is.
+
+    A message is a header of flags, frame number, width, height, number of rects and
+    payload size, followed by the payload: the rects as little-endian ``uint16``
+    ``(x, y, width, height)`` rows, then the pixels of each rect in turn as ``RGBX``.
+
+    Attributes:
+        tile (int): The width and height of the squares compared.
+        level (int): The zlib compression level.
+        frames (int): The number of frames encoded.
+        raw_bytes (int): The size of those frames uncompressed.
+        encoded_bytes (int): The size of the messages they were encoded into.
+        seconds (float): The time spent encoding them.
+    """
+
+    def __init__(self, tile=STREAM_TILE, level=STREAM_COMPRESSION):
+        self.tile = tile
+        self.level = level
+        self.frames = 0
+        self.raw_bytes = 0
+        self.encoded_bytes = 0
+        self.seconds = 0.0
+        self._size = None
+        self._previous = None
+        self._current = None
+        self._delta = None
+
+    def encode(self, surface: pygame.Surface, keyframe=False) -> bytes:
+        """The message that brings a viewer of the previous frames up to ``surface``."""
+        start = time.perf_counter()
+        width, height = size = surface.get_size()
+        pixels = np.frombuffer(pygame.image.tobytes(surface, 'RGBX'), np.uint32).reshape(height, width)
+        if size != self._size:
+            # Pad the frames to whole tiles, so they split into squares with a reshape
+            tile = self.tile
+            shape = (-(-height // tile) * tile, -(-width // tile) * tile)
+            self._previous = np.zeros(shape, np.uint32)
+            self._current = np.zeros(shape, np.uint32)
+            self._delta = np.zeros(shape, np.uint32)
+            self._size = size
+            keyframe = True
+
+        if keyframe:
+            rects = np.array([[0, 0, width, height]], np.uint16)
+            data = [pixels.tobytes()]
+            self._previous[:height, :width] = pixels
+        else:
+            current, previous = self._current, self._previous
+            current[:height, :width] = pixels
+            delta = np.bitwise_xor(current, previous, out=self._delta)
+            rects = self._changed_rects(delta)
+            data = [delta[y:y + h, x:x + w].tobytes() for x, y, w, h in rects.tolist()]
+            self._previous, self._current = current, previous
+
+        payload = zlib.compress(b''.join([rects.tobytes(), *data]), self.level)
+        message = _HEADER.pack(KEYFRAME if keyframe else 0, self.frames, width, height, len(rects),
+                               len(payload)) + payload
+        self.frames += 1
+        self.raw_bytes += pixels.nbytes
+        self.encoded_bytes += len(message)
+        self.seconds += time.perf_counter() - start
+        return message
+
+    def _changed_rects(self, delta: np.ndarray) -> np.ndarray:
+        """The ``(x, y, width, height)`` of each run of changed tiles, clipped to the frame."""
+        tile = self.tile
+        rows, columns = delta.shape[0] // tile, delta.shape[1] // tile
+        # OR each tile's rows together first, which is much faster than reducing both axes at once
+        changed = np.bitwise_or.reduce(delta.reshape(rows, tile, columns * tile), axis=1)
+        changed = changed.reshape(rows, columns, tile).any(axis=2)
+        # Runs start where a row of tiles goes from unchanged to changed, and end where it goes back
+        edges = np.diff(np.pad(changed, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+        starts = np.argwhere(edges == 1)
+        ends = np.argwhere(edges == -1)[:, 1]
+        width, height = self._size
+        x = starts[:, 1] * tile
+        y = starts[:, 0] * tile
+        return np.stack([x, y, np.minimum(ends * tile, width) - x, np.minimum(y + tile, height) - y],
+                        axis=1).astype(np.uint16)
+
+
+class FrameDecoder:
+    """
+    Rebuilds the frames sent by a ``FrameEncoder`` from its messages.
+
+    Attributes:
+        frame (np.ndarray): The latest frame, ``height`` rows of ``width`` ``RGBX``
+            pixels packed into ``uint32``, or ``None`` before the first keyframe. It is
+            updated in place, so a surface made from it with ``pygame.image.frombuffer``
+            stays current until the frame size changes.
+        number (int): The number of the latest frame.
+    """
+
+    def __init__(self):
+        self.frame: Optional[np.ndarray] = None
+        self.number = -1
+
+    def apply(self, message: bytes) -> List[List[int]]:
+        """Apply one message and return the rects it changed."""
+        flags, self.number, width, height, count, _ = _HEADER.unpack_from(message)
+        data = zlib.decompress(memoryview(message)[_HEADER.size:])
+        rects = np.frombuffer(data, np.uint16, count * 4).reshape(count, 4).tolist()
+        keyframe = flags & KEYFRAME
+        if keyframe and (self.frame is None or self.frame.shape != (height, width)):
+            self.frame = np.zeros((height, width), np.uint32)
+        elif self.frame is None:
+            # Deltas from before this viewer's first keyframe
+            return []
+
+        offset = count * 8
+        for x, y, w, h in rects:
+            pixels = np.frombuffer(data, np.uint32, w * h, offset).reshape(h, w)
+            if keyframe:
+                self.frame[y:y + h, x:x + w] = pixels
+            else:
+                self.frame[y:y + h, x:x + w] ^= pixels
+            offset += pixels.nbytes
+        return rects
+
+
+def _receive(connection: socket.socket, size: int) -> Optional[bytes]:
+    """Exactly ``size`` bytes from ``connection``, or ``None`` if it closes first."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    while view:
+        received = connection.recv_into(view)
+        if not received:
+            return None
+        view = view[received:]
+    return bytes(buffer)
+
+
+def read_messages(connection: socket.socket) -> Iterator[bytes]:
+    """Each message sent over ``connection``, until it closes."""
+    while True:
+        header = _receive(connection, _HEADER.size)
+        if header is None:
+            return
+        payload = _receive(connection, _HEADER.unpack(header)[-1])
+        if payload is None:
+            return
+        yield header + payload
+
+
+class _Viewer:
+    """A connected viewer, sent its queued messages by a thread of its own."""
+
+    def __init__(self, connection: socket.socket, backlog: int):
+        self.connection = connection
+        self.closed = False
+        self._queue = queue.Queue(backlog)
+        self._sender = threading.Thread(target=self._run, name='stream-viewer', daemon=True)
+        self._sender.start()
+
+    def offer(self, message: bytes) -> bool:
+        """Queue ``message``, or drop everything queued and return ``False`` if the viewer has fallen behind."""
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except queue.Full:
+            self._drain()
+            return False
+
+    def close(self):
+        """Disconnect once the queued messages are sent, dropping them instead if the viewer has fallen behind."""
+        if not self.offer(None):
+            self._queue.put_nowait(None)
+
+    def _drain(self):
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _run(self):
+        try:
+            message = self._queue.get()
+            while message is not None:
+                self.connection.sendall(message)
+                message = self._queue.get()
+        except OSError:
+            pass
+        finally:
+            self.closed = True
+            self.connection.close()
+
+
+class FrameStreamer:
+    """
+    Streams what a game draws to viewers connected to a Unix domain socket at ``path``.
+
+    Loops pass each frame to ``send`` once drawn. Frames are only encoded while a
+    viewer is connected; until then ``send`` costs a non-blocking ``accept``. Each
+    viewer is sent its messages by a thread of its own, so a slow viewer never holds
+    up the game: once ``backlog`` messages are waiting for it, they are dropped and
+    every viewer is sent a keyframe next. New viewers start from a keyframe too.
+
+    The time spent encoding and the bytes produced are counted by ``encoder``.
+
+    Attributes:
+        path (str): The socket viewers connect to.
+        backlog (int): How many messages may wait for a viewer.
+        encoder (FrameEncoder): Encodes the frames sent.
+    """
+
+    def __init__(self, path=STREAM_PATH, backlog=STREAM_BACKLOG, encoder=None):
+        self.path = path
+        self.backlog = backlog
+        self.encoder = FrameEncoder() if encoder is None else encoder
+        self._viewers: List[_Viewer] = []
+        self._resync = True
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if os.path.exists(path):
+            # Left behind by a game that did not close its socket
+            os.unlink(path)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(path)
+        self._server.listen()
+        self._server.setblocking(False)
+
+    @property
+    def viewers(self) -> int:
+        """The number of connected viewers."""
+        return len(self._viewers)
+
+    def send(self, target):
+        """Stream the frame drawn on ``target``, a surface or anything with a ``to_surface`` method."""
+        self._accept()
+        if not self._viewers:
+            return
+        surface = target if isinstance(target, pygame.Surface) else target.to_surface()
+        message = self.encoder.encode(surface, keyframe=self._resync)
+        self._resync = False
+        for viewer in self._viewers:
+            if not viewer.offer(message):
+                self._resync = True
+
+    def close(self):
+        """Disconnect every viewer once it has been sent the frames queued for it, and remove the socket."""
+        for viewer in self._viewers:
+            viewer.close()
+        self._viewers.clear()
+        self._server.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _accept(self):
+        while True:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                break
+            connection.setblocking(True)
+            self._viewers.append(_Viewer(connection, self.backlog))
+            self._resync = True
+        if any(viewer.closed for viewer in self._viewers):
+            self._viewers = [viewer for viewer in self._viewers if not viewer.closed]
+
+
+@lru_cache(maxsize=None)
+def default_streamer() -> Optional[FrameStreamer]:
+    """The streamer at ``STREAM_PATH`` every game loop sends its frames to, or ``None`` unless ``STREAMING``."""
+    if not STREAMING:
+        return None
+    streamer = FrameStreamer()
+    atexit.register(streamer.close)
+    return streamer
@@ -0,0 +1,122 @@
+from typing import Callable, List, Optional
+
+__all__ = ['Timer', 'TimerWheel']
+
+# Each level of the wheel has 2 ** _BITS slots, and covers 2 ** _BITS times the span of the one below
+_BITS = 6
+_SLOTS = 1 << _BITS
+_MASK = _SLOTS - 1
+_LEVELS = 4
+
+
+class Timer:
+    """
+    A callback scheduled on a ``TimerWheel``.
+
+    Attributes:
+        deadline (int): The tick on which the timer fires.
+        callback (callable): Called with ``args`` when the timer fires, or ``None``
+            for timers that only mark a span of time.
+        args (tuple): The arguments for ``callback``.
+        pending (bool): Whether the timer has neither fired nor been cancelled.
+    """
+    __slots__ = ('deadline', 'callback', 'args', 'pending')
+
+    def __init__(self, deadline, callback, args):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.pending = True
+
+
+class TimerWheel:
+    """
+    Schedules callbacks a number of ticks ahead, such as frames, for cooldowns and
+    durations.
+
+    Timers are kept in a hierarchical wheel: the lowest level has a slot per tick for
+    the next 64 ticks, and each level above has slots 64 times as wide. Advancing a
+    tick only looks at the one slot that is due, and a timer moves down a level at
+    most three times on its way there, so pending timers cost nothing per tick
+    however many there are. Timers further ahead than the top level wait in an
+    overflow list that is looked at each time the top level moves on a slot.
+
+    Attributes:
+        now (int): The number of ticks advanced so far.
+    """
+
+    def __init__(self):
+        self.now = 0
+        self._wheels: List[List[List[Timer]]] = [[[] for _ in range(_SLOTS)] for _ in range(_LEVELS)]
+        self._overflow: List[Timer] = []
+        self._pending = 0
+
+    def __len__(self):
+        """The number of pending timers."""
+        return self._pending
+
+    def schedule(self, delay: int, callback: Callable = None, *args) -> Timer:
+        """
+        Call ``callback(*args)`` once ``delay`` more ticks have been advanced, at least one.
+        Without a callback the timer only counts down, for ``remaining`` to read.
+        """
+        timer = Timer(self.now + max(1, int(delay)), callback, args)
+        self._insert(timer)
+        self._pending += 1
+        return timer
+
+    def cancel(self, timer: Optional[Timer]):
+        """Stop ``timer`` from firing. Timers that already fired, and ``None``, are ignored."""
+        if timer is not None and timer.pending:
+            timer.pending = False
+            self._pending -= 1
+
+    def remaining(self, timer: Optional[Timer]) -> int:
+        """Ticks until ``timer`` fires, or 0 if it is ``None``, fired or cancelled."""
+        if timer is None or not timer.pending:
+            return 0
+        return timer.deadline - self.now
+
+    def advance(self, ticks=1):
+        """Advance ``ticks`` ticks, calling the callbacks of the timers that come due in order."""
+        for _ in range(ticks):
+            self.now += 1
+            now = self.now
+            # Once a level's span has gone by, spread its next slot over the levels below
+            for level in range(1, _LEVELS):
+                if now & ((1 << (_BITS * level)) - 1):
+                    break
+                self._cascade(self._wheels[level], (now >> (_BITS * level)) & _MASK)
+            else:
+                overflow, self._overflow = self._overflow, []
+                for timer in overflow:
+                    if timer.pending:
+                        self._insert(timer)
+
+            slot = self._wheels[0][now & _MASK]
+            if not slot:
+                continue
+            due = slot[:]
+            slot.clear()
+            for timer in due:
+                if timer.pending:
+                    timer.pending = False
+                    self._pending -= 1
+                    if timer.callback is not None:
+                        timer.callback(*timer.args)
+
+    def _cascade(self, wheel, index):
+        timers = wheel[index]
+        wheel[index] = []
+        for timer in timers:
+            if timer.pending:
+                self._insert(timer)
+
+    def _insert(self, timer: Timer):
+        deadline = timer.deadline
+        delay = deadline - self.now
+        for level in range(_LEVELS):
+            if delay < 1 << (_BITS * (level + 1)):
+                self._wheels[level][(deadline >> (_BITS * level)) & _MASK].append(timer)
+                return
+        self._overflow.append(timer)
@@ -0,0 +1,603 @@
+import os
+import pstats
+import random
+import socket
+import sqlite3
+import threading
+from collections import Counter
+from unittest.mock import patch
+
+import numpy as np
+import pygame
+import pytest
+
+from common import (KEYBOARD, Bot, Entity, EventLog, EventType, FrameBudget, FrameDecoder, FrameEncoder, FrameProfiler,
+                    FrameStreamer, KeyState, Leaderboard, MotionHistory, OccupancyGrid, Player, Quality, RenderTarget,
+                    Session, SpatialGrid, TextureCanvas, TimerWheel, VirtualKey, World, apply_gravity, draw_circle,
+                    draw_line, draw_polygon, draw_rect, expired, key_name, move, outside, overlapping, read_events,
+                    read_messages, run_headless, run_interactive, run_pipelined, seat_controls, spawn_cap, sprite_blits)
+from common.src.analytics import entity_counts, event_counts, heatmap, session_rates
+
+
+def test_entity_has_no_instance_dict():
+    entity = Entity(10, 20, 30, 40)
+    assert not hasattr(entity, '__dict__')
+    with pytest.raises(AttributeError):
+        entity.velocity = 1
+
+
+def test_entity_rect():
+    entity = Entity(10.7, 20.2, 30, 40)
+    rect = entity.rect
+    assert (rect.x, rect.y, rect.width, rect.height) == (10, 20, 30, 40)
+
+
+def test_entity_overlaps():
+    a = Entity(0, 0, 10, 10)
+    assert a.overlaps(Entity(5, 5, 10, 10))
+    assert not a.overlaps(Entity(10, 0, 10, 10))  # Touching edges do not overlap
+
+
+def test_player_initialization():
+    player = Player(1, 2, 3, 4, (255, 0, 0), {'left': 'a'}, 2)
+    assert player.color == (255, 0, 0)
+    assert player.controls == {'left': 'a'}
+    assert player.player_id == 2
+    assert not hasattr(player, '__dict__')
+
+
+class HoldRight(Bot):
+    def think(self, keys):
+        keys.press(self.player.controls['right'])
+
+
+def test_bot_takes_over_player_input():
+    player = Player(0, 0, 10, 10, (255, 0, 0), {'left': 1, 'right': 2})
+    bot = HoldRight(player)
+    assert player.input is bot
+    bot.update()
+    assert player.input.get_pressed()[2]
+    assert not player.input.get_pressed()[1]
+
+
+def test_bot_events_only_on_new_presses():
+    bot = HoldRight(Player(0, 0, 10, 10, (255, 0, 0), {'left': 1, 'right': 2}))
+    bot.update()
+    assert [event.key for event in bot.events()] == [2]
+    bot.update()
+    assert bot.events() == []
+
+
+def test_key_state_edges():
+    state = KeyState(['a', 'b'], previous=KeyState(['b', 'c']).mask)
+    assert state['a'] and state['b'] and not state['c']
+    assert state.pressed('a') and not state.pressed('b')
+    assert state.released('c') and not state.released('b')
+    assert state.newly_pressed() == ['a']
+
+
+def test_keyboard_is_read_once_per_capture():
+    # Keys are tracked once something has asked about them
+    KEYBOARD.get_pressed()[pygame.K_a]
+    KEYBOARD.get_pressed()[pygame.K_d]
+    frames = [Counter([pygame.K_a]), Counter([pygame.K_d])]
+    with patch('pygame.key.get_pressed', side_effect=frames) as read:
+        KEYBOARD.capture()
+        state = KEYBOARD.get_pressed()
+        assert state[pygame.K_a] and state.pressed(pygame.K_a) and not state[pygame.K_d]
+        KEYBOARD.capture()
+        state = KEYBOARD.get_pressed()
+        assert state.released(pygame.K_a) and state.pressed(pygame.K_d)
+    assert read.call_count == 2
+
+
+class CountingSession(Session):
+    def __init__(self, frames_to_play):
+        super().__init__()
+        self.frames = 0
+        self.frames_to_play = frames_to_play
+
+    def step(self):
+        self.frames += 1
+        self.game_over = self.frames >= self.frames_to_play
+
+
+def test_run_headless_stops_at_game_over():
+    assert run_headless(CountingSession(5), 100).frames == 5
+    assert run_headless(CountingSession(500), 100).frames == 100
+
+
+
+class FrameSnapshot:
+    def __init__(self, drawn):
+        self.drawn = drawn
+        self.frame = None
+
+    def draw(self, screen):
+        self.drawn.append(self.frame)
+
+
+class PipelinedSession(CountingSession):
+    def __init__(self, frames_to_play):
+        super().__init__(frames_to_play)
+        self.drawn = []
+        self.buffers = (FrameSnapshot(self.drawn), FrameSnapshot(self.drawn))
+
+    def advance(self):
+        super().advance()
+        self.finished = self.game_over
+
+    def snapshot(self):
+        snapshot = self.buffers[self.frames % 2]
+        snapshot.frame = self.frames
+        return snapshot
+
+
+def test_run_pipelined_draws_each_frame_from_its_snapshot():
+    session = PipelinedSession(5)
+    with patch('pygame.event.get', return_value=[]), patch('pygame.display.flip'), patch.object(KEYBOARD, 'capture'):
+        run_pipelined(None, lambda: session, fps=0)
+    assert session.frames == 5
+    assert session.drawn == [0, 1, 2, 3, 4]
+
+
+class SquareSession(Session):
+    def draw(self, screen):
+        screen.fill((0, 0, 0))
+        pygame.draw.rect(screen, (255, 0, 0), (1, 2, 2, 2))
+
+
+def test_offscreen_render_target_is_a_live_view():
+    target = RenderTarget.offscreen((6, 4)).render(SquareSession())
+    with target.pixels() as pixels:
+        assert pixels.shape == (6, 4, 3)
+        assert pixels[1, 2].tolist() == [255, 0, 0]
+        assert pixels[0, 0].tolist() == [0, 0, 0]
+        pixels[5, 3] = (0, 255, 0)
+    assert target.surface.get_at((5, 3))[:3] == (0, 255, 0)
+
+    target.surface.fill((0, 0, 255))
+    with target.pixels() as pixels:
+        assert pixels[1, 2].tolist() == [0, 0, 255]
+
+
+def test_render_target_grayscale():
+    target = RenderTarget.offscreen((6, 4)).render(SquareSession())
+    gray = target.grayscale()
+    assert gray.shape == (6, 4)
+    assert gray[1, 2] == 255 * 77 >> 8
+    assert gray[0, 0] == 0
+    assert target.grayscale() is gray
+
+    half = target.grayscale(2)
+    assert half.shape == (3, 2)
+    assert half.tolist() == [[0, 0], [0, 255 * 77 >> 8], [0, 0]]
+    target.surface.fill((255, 255, 255))
+    assert np.all(target.grayscale(2) == 255)
+
+
+def test_borrowed_render_target_releases_the_surface():
+    target = RenderTarget(pygame.Surface((6, 4))).render(SquareSession())
+    with target.pixels() as pixels:
+        assert pixels[1, 2].tolist() == [255, 0, 0]
+        assert target.surface.get_locked()
+    del pixels
+    assert not target.surface.get_locked()
+    assert target.grayscale()[1, 2] == 255 * 77 >> 8
+
+
+def test_frame_budget_degrades_and_restores_quality():
+    budget = FrameBudget(fps=60, window=4)
+    for _ in range(3):
+        assert budget.record(30) == Quality.HIGH
+    assert budget.record(30) == Quality.MEDIUM
+    for _ in range(4):
+        budget.record(30)
+    assert budget.quality == Quality.LOW
+    for _ in range(4):
+        budget.record(30)
+    assert budget.quality == Quality.LOW
+
+    # Between the thresholds nothing changes
+    for _ in range(8):
+        budget.record(12)
+    assert budget.quality == Quality.LOW
+    for _ in range(8):
+        budget.record(2)
+    assert budget.quality == Quality.HIGH
+
+
+def test_spawn_cap():
+    assert spawn_cap(10, Quality.HIGH) == 10
+    assert spawn_cap(10, Quality.MEDIUM) == 7
+    assert spawn_cap(10, Quality.LOW) == 5
+    assert spawn_cap(1, Quality.LOW) == 1
+
+
+def test_leaderboard_ranks_from_memory_and_persists(tmp_path):
+    path = str(tmp_path / 'leaderboard.db')
+    leaderboard = Leaderboard(path, flush_interval=0.01, cache_size=3)
+    for score in (5, 9, 7, 9, 1):
+        leaderboard.submit('jumper', 2, score)
+    leaderboard.submit('jumper', 1, 4)
+    assert [entry.score for entry in leaderboard.top('jumper', 2)] == [9, 9, 7]
+    assert leaderboard.best('jumper', 1) == 4
+    assert leaderboard.top('catcher', 2) == []
+    leaderboard.close()
+
+    reopened = Leaderboard(path)
+    assert [entry.score for entry in reopened.top('jumper', 2, n=2)] == [9, 9]
+    assert reopened.best('jumper', 1) == 4
+    reopened.close()
+    with sqlite3.connect(path) as connection:
+        assert connection.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+        assert connection.execute('SELECT COUNT(*) FROM scores').fetchone() == (6,)
+
+
+def test_leaderboard_submits_without_waiting_for_the_database(tmp_path):
+    path = str(tmp_path / 'leaderboard.db')
+    earlier = Leaderboard(path)
+    earlier.submit('jumper', 1, 5)
+    earlier.close()
+
+    opened = threading.Event()
+    open_database = Leaderboard._open
+
+    def slow_open(self):
+        opened.wait()
+        return open_database(self)
+
+    with patch.object(Leaderboard, '_open', slow_open):
+        leaderboard = Leaderboard(path, flush_interval=0.01)
+        leaderboard.submit('jumper', 1, 8)
+        leaderboard.submit('jumper', 1, 2)
+        opened.set()
+        assert [entry.score for entry in leaderboard.top('jumper', 1)] == [8, 5, 2]
+    leaderboard.close()
+
+
+def test_leaderboard_that_cannot_open_drops_scores_without_raising(tmp_path, caplog):
+    (tmp_path / 'afile').write_text('')
+    # A file where its directory should be, and a directory where the database should be
+    for path in (tmp_path / 'afile' / 'sub' / 'x.db', tmp_path):
+        leaderboard = Leaderboard(str(path), flush_interval=0.01)
+        leaderboard.submit('jumper', 1, 8)
+        assert leaderboard.top('jumper', 1) == []
+        assert leaderboard.best('jumper', 1) == 0
+        leaderboard.submit('jumper', 1, 9)
+        leaderboard.flush()
+        leaderboard.close()
+    assert len([record for record in caplog.records if 'will not be saved' in record.getMessage()]) == 2
+
+
+class RecordedSession(CountingSession):
+    game_name = 'jumper'
+    best = None
+
+    def recall(self, leaderboard):
+        self.best = leaderboard.best(self.game_name, 1)
+
+    def record(self, leaderboard):
+        leaderboard.submit(self.game_name, 1, self.frames)
+
+
+def test_interactive_loop_records_finished_sessions_once(tmp_path):
+    leaderboard = Leaderboard(':memory:')
+    leaderboard.submit('jumper', 1, 2)
+    event_log = EventLog(str(tmp_path / 'events.bin'))
+    session = RecordedSession(3)
+    frames = iter([[]] * 5 + [[pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE)]])
+    with patch('pygame.event.get', side_effect=lambda: next(frames)), patch('pygame.display.flip'), \
+            patch.object(KEYBOARD, 'capture'), patch.object(session, 'draw'):
+        run_interactive(None, lambda: session, fps=0, leaderboard=leaderboard, event_log=event_log)
+    assert session.best == 2
+    assert [entry.score for entry in leaderboard.top('jumper', 1)] == [3, 2]
+    leaderboard.close()
+    event_log.close()
+    assert list(read_events(event_log.path)['event']) == [EventType.START, EventType.END]
+
+
+def test_event_log_round_trip_and_aggregates(tmp_path):
+    path = str(tmp_path / 'events.bin')
+    event_log = EventLog(path, capacity=4)
+    for _ in range(2):
+        event_log.log('catcher', EventType.START)
+    for player, x in ((1, 10), (1, 50), (2, 90)):
+        event_log.log('catcher', EventType.BOMB, player, x, 500)
+    event_log.log('cooperative', EventType.DEATH, 3, 120, -400)
+    event_log.close()
+    with open(path, 'ab') as file:
+        file.write(b'torn')
+
+    events = read_events(path)
+    assert len(events) == 6
+    assert event_counts(events) == {('catcher', EventType.START): 2, ('catcher', EventType.BOMB): 3,
+                                    ('cooperative', EventType.DEATH): 1}
+    assert session_rates(events) == {('catcher', EventType.BOMB): 1.5}
+    assert list(entity_counts(events, 'catcher', EventType.BOMB)) == [0, 2, 1]
+    counts, x_edges, y_edges = heatmap(events, 'catcher', EventType.BOMB, cell=40)
+    assert list(x_edges) == [0, 40, 80, 120] and list(y_edges) == [480, 520]
+    assert list(counts[:, 0]) == [1, 1, 1]
+
+
+def test_spatial_grid_finds_neighbours_after_moves():
+    entities = [Entity(x, 0, 10, 10) for x in (0, 30, 120, 400)]
+    grid = SpatialGrid(50, entities)
+    assert set(grid.near(10, 0, 50)) == set(entities[:2])
+    entities[3].x = 60
+    grid.move(entities[3])
+    assert entities[3] in set(grid.near(10, 0, 50))
+    grid.remove(entities[0])
+    assert len(grid) == 3 and entities[0] not in set(grid.near(10, 0, 50))
+
+
+def test_seats_past_the_keyboard_get_virtual_keys():
+    zones = [(pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s)]
+    assert seat_controls(0, ('left', 'right', 'jump'), zones) == {'left': pygame.K_a, 'right': pygame.K_d,
+                                                                  'jump': pygame.K_w}
+    controls = seat_controls(7, ('left', 'right', 'jump'), zones)
+    assert controls['jump'] == VirtualKey(7, 'jump') and key_name(controls['jump']) == 'P8 jump'
+
+    player = Player(0, 0, 10, 10, (255, 0, 0), controls)
+    bot = Bot(player)
+    bot.think = lambda keys: keys.press(player.controls['jump'])
+    bot.update()
+    assert player.input.get_pressed()[controls['jump']]
+    assert [event.key for event in bot.events()] == [controls['jump']]
+
+
+class SteadyClock:
+    """A stand-in for ``pygame.time.Clock`` whose every frame takes ``milliseconds``."""
+    def __init__(self, milliseconds):
+        self.milliseconds = milliseconds
+        self.ticked = False
+
+    def tick(self, fps=0):
+        self.ticked = True
+        return self.milliseconds
+
+    def get_time(self):
+        return self.milliseconds if self.ticked else 0
+
+
+def _run_fixed_rate(frame_ms, tick_rate, frames):
+    """Run a CountingSession at ``tick_rate`` for ``frames`` frames, returning it and what each draw saw."""
+    session = CountingSession(1000)
+    drawn = []
+    session.draw = lambda screen: drawn.append((session.frames, session.interpolation))
+    events = iter([[]] * frames + [[pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE)]])
+    with patch('pygame.event.get', side_effect=lambda: next(events)), patch('pygame.display.flip'), \
+            patch('pygame.time.Clock', lambda: SteadyClock(frame_ms)), patch.object(KEYBOARD, 'capture') as capture:
+        run_interactive(None, lambda: session, fps=0, tick_rate=tick_rate)
+    return session, drawn, capture.call_count
+
+
+def test_fixed_tick_rate_is_independent_of_frame_rate():
+    # The first frame has no elapsed time, then 30 ms frames at 20 ms steps make 1.5 steps a frame
+    session, drawn, captures = _run_fixed_rate(30, 50, 11)
+    assert drawn[0] == (0, 0.0)
+    assert session.frames in (14, 15)
+    assert captures == session.frames
+    assert all(0 <= interpolation < 1 for _, interpolation in drawn)
+    assert any(interpolation == pytest.approx(0.5) for _, interpolation in drawn)
+
+
+def test_fixed_tick_rate_catches_up_a_few_steps_at_a_time():
+    session, drawn, _ = _run_fixed_rate(1000, 60, 3)
+    assert [frames for frames, _ in drawn] == [0, 5, 10]
+
+
+def test_profile_key_captures_the_next_frames(tmp_path):
+    session = CountingSession(1000)
+    handled = []
+    session.handle_event = handled.append
+    session.draw = lambda screen: None
+    profiler = FrameProfiler(frames=3, directory=str(tmp_path), key=pygame.K_F9)
+    press = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F9)
+    events = iter([[], [press], [], [], [], [], [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE)]])
+    with patch('pygame.event.get', side_effect=lambda: next(events)), patch('pygame.display.flip'), \
+            patch.object(KEYBOARD, 'capture'):
+        run_interactive(None, lambda: session, fps=0, profiler=profiler)
+    profiler.wait()
+
+    assert handled == [] and not profiler.active
+    [capture] = profiler.captures
+    assert os.path.basename(capture).startswith('game-')
+    stats = pstats.Stats(capture + '.prof')
+    assert sum(calls for (_, _, name), (calls, *_) in stats.stats.items() if name == 'step') == 3
+    with open(capture + '.txt') as summary:
+        text = summary.read()
+    assert text.startswith('game: 3 frames') and 'Heap growth by line' in text
+
+
+def test_profile_key_captures_the_simulation_thread_when_pipelined(tmp_path):
+    session = PipelinedSession(1000)
+    profiler = FrameProfiler(frames=3, directory=str(tmp_path), key=pygame.K_F9)
+    press = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F9)
+    events = iter([[], [press], [], [], [], [], [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE)]])
+    with patch('pygame.event.get', side_effect=lambda: next(events)), patch('pygame.display.flip'), \
+            patch.object(KEYBOARD, 'capture'):
+        run_pipelined(None, lambda: session, fps=0, profiler=profiler)
+    profiler.wait()
+
+    assert not profiler.active
+    [capture] = profiler.captures
+    stats = pstats.Stats(capture + '.prof')
+    # Steps run on the worker thread while the main thread draws
+    assert sum(calls for (_, _, name), (calls, *_) in stats.stats.items() if name == 'step') == 3
+
+
+def _pixels(surface):
+    width, height = surface.get_size()
+    return np.frombuffer(pygame.image.tobytes(surface, 'RGBX'), np.uint32).reshape(height, width)
+
+
+def test_frame_encoder_sends_only_the_tiles_that_changed():
+    surface = pygame.Surface((100, 70))
+    surface.fill((10, 20, 30))
+    encoder, decoder = FrameEncoder(tile=40), FrameDecoder()
+
+    def round_trip(surface):
+        return decoder.apply(encoder.encode(surface))
+
+    assert round_trip(surface) == [[0, 0, 100, 70]]
+    surface.fill((200, 0, 0), (45, 5, 10, 10))
+    surface.fill((0, 200, 0), (85, 50, 5, 5))
+    assert round_trip(surface) == [[40, 0, 40, 40], [80, 40, 20, 30]]
+    assert (decoder.frame == _pixels(surface)).all()
+    assert round_trip(surface) == []
+
+    resized = pygame.Surface((30, 30))
+    resized.fill((1, 2, 3))
+    assert round_trip(resized) == [[0, 0, 30, 30]]
+    assert (decoder.frame == _pixels(resized)).all() and encoder.frames == 4
+
+
+def test_frame_streamer_sends_viewers_a_keyframe_then_deltas(tmp_path):
+    streamer = FrameStreamer(str(tmp_path / 'stream.sock'))
+    surface = pygame.Surface((80, 80))
+    surface.fill((0, 0, 255))
+    streamer.send(surface)
+    assert streamer.viewers == 0 and streamer.encoder.frames == 0
+
+    viewer = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    viewer.connect(streamer.path)
+    for x in range(3):
+        surface.fill((255, 255, 0), (x * 20, 10, 5, 5))
+        streamer.send(surface)
+    assert streamer.viewers == 1
+    streamer.close()
+
+    decoder = FrameDecoder()
+    with viewer:
+        changes = [decoder.apply(message) for message in read_messages(viewer)]
+    assert len(changes) == 3 and changes[0] == [[0, 0, 80, 80]]
+    assert (decoder.frame == _pixels(surface)).all() and decoder.number == 2
+    assert not os.path.exists(streamer.path)
+
+
+def test_motion_history_blends_and_restores_positions():
+    moving, teleported, spawned = Entity(0, 0, 1, 1), Entity(0, 0, 1, 1), Entity(50, 50, 1, 1)
+    motion = MotionHistory()
+    motion.record([moving, teleported])
+    moving.x, moving.y = 10, -20
+    teleported.x = 100
+    motion.settle([teleported])
+
+    with motion.blend([moving, teleported, spawned], 0.25):
+        assert (moving.x, moving.y) == (2.5, -5)
+        assert teleported.x == 100 and (spawned.x, spawned.y) == (50, 50)
+    assert (moving.x, moving.y) == (10, -20)
+
+
+def _draw_scene(target, sprite):
+    target.fill((0, 0, 40))
+    draw_rect(target, (200, 200, 200), (10.5, 60, 50, 10))
+    draw_rect(target, (0, 255, 0), (70, 10, 20, 20), 2)
+    draw_circle(target, (255, 255, 0), (30, 30), 8)
+    draw_polygon(target, (255, 0, 255), [(100, 10), (110, 30), (90, 30)])
+    draw_line(target, (0, 0, 255), (0, 90), (119, 90), 3)
+    draw_line(target, (0, 255, 255), (115, 40), (115, 60), 2)
+    target.blit(sprite, (70.0, 40.0))
+    target.blit(sprite, (90, 40), (0, 0, 5, 10))
+
+
+def test_texture_canvas_draws_like_a_surface():
+    pygame.init()
+    sprite = pygame.Surface((10, 10), pygame.SRCALPHA)
+    sprite.fill((255, 0, 0, 255))
+    surface = pygame.Surface((120, 100))
+    _draw_scene(surface, sprite)
+    canvas = TextureCanvas.create((120, 100), accelerated=0)
+    _draw_scene(canvas, sprite)
+    _draw_scene(canvas, sprite)
+    drawn = canvas.to_surface()
+
+    for point in [(0, 0), (30, 60), (70, 10), (72, 12), (75, 20), (30, 30), (100, 25), (60, 90), (60, 89), (75, 45),
+                  (92, 45), (97, 45), (114, 50), (115, 50), (116, 50), (117, 50)]:
+        assert drawn.get_at(point) == surface.get_at(point), point
+    # Each distinct sprite and shape was uploaded once, however often it was drawn
+    assert len(canvas._textures) == 1 and len(canvas._shapes) == 2
+
+
+def test_occupancy_grid_samples_only_free_space():
+    grid = OccupancyGrid(100, 50, 10, margin=5)
+    assert len(grid) == 50
+    grid.occupy('wall', pygame.Rect(0, 0, 45, 50))
+    grid.occupy('block', (60, 0, 10, 10))
+    # The margin widens the block to three columns and two rows
+    assert len(grid) == 50 - 25 - 6
+
+    rng = random.Random(0)
+    for _ in range(200):
+        x, y = grid.sample(rng)
+        assert x >= 50 and not (50 <= x < 80 and y < 20)
+
+    grid.occupy('overlap', (60, 0, 10, 10))
+    grid.release('block')
+    assert len(grid) == 19
+    grid.release('overlap')
+    grid.release('unknown')
+    assert len(grid) == 25
+    grid.occupy('everything', (0, 0, 100, 50))
+    assert grid.sample(rng) is None
+    grid.clear()
+    assert len(grid) == 50
+
+
+def test_timer_wheel_fires_each_timer_on_its_tick():
+    wheel = TimerWheel()
+    fired = []
+    # Delays on every level of the wheel, either side of where one level ends and the next begins
+    delays = [1, 5, 63, 64, 65, 100, 4095, 4096, 5000, 262143, 262144, 300000]
+    for delay in delays:
+        wheel.schedule(delay, lambda delay=delay: fired.append((delay, wheel.now)))
+    cancelled = wheel.schedule(70, fired.append, 'cancelled')
+    assert len(wheel) == len(delays) + 1
+    assert wheel.remaining(cancelled) == 70
+
+    wheel.advance(10)
+    wheel.cancel(cancelled)
+    wheel.cancel(None)
+    assert wheel.remaining(cancelled) == 0
+    wheel.advance(300000 - 10)
+    assert fired == [(delay, delay) for delay in delays]
+    assert len(wheel) == 0
+
+
+def test_timer_wheel_advances_with_the_session():
+    class CountingSession(Session):
+        def step(self):
+            pass
+
+    session = CountingSession()
+    timer = session.timers.schedule(3)
+    run_headless(session, 2)
+    assert session.timers.remaining(timer) == 1
+    run_headless(session, 1)
+    assert not timer.pending
+
+
+def test_world_systems_update_every_entity():
+    world = World(capacity=2, hits=np.int32)
+    for x in range(5):
+        world.spawn(x=x * 100, y=0, vx=1, width=10, height=10, kind=x % 2, hits=x)
+    world.spawn(x=0, y=0, expires=3)
+    assert len(world) == 6 and world['expires'].tolist() == [-1] * 5 + [3]
+
+    world.record()
+    apply_gravity(world, 2, max_speed=3)
+    apply_gravity(world, 2, max_speed=3)
+    move(world)
+    assert world['x'][:5].tolist() == [1, 101, 201, 301, 401] and (world['y'] == 3).all()
+    assert world.blended(0.5)[0][:2].tolist() == [0.5, 100.5]
+
+    assert overlapping(world, 100, 0, 2, 5).tolist() == [False, True, False, False, False, False]
+    assert expired(world, 2).sum() == 0 and expired(world, 3)[-1]
+    world.remove(overlapping(world, 100, 0, 2, 5) | expired(world, 3))
+    assert world['hits'].tolist() == [0, 2, 3, 4]
+
+    world['x'] = [-20, 0, 790, 900]
+    assert outside(world, 0, 0, 800, 600).tolist() == [True, False, False, True]
+    assert sprite_blits(world, ['even', 'odd'].__getitem__, (0, -3)) == [('even', (-20, 0)), ('even', (0, 0)),
+                                                     ('odd', (790, 0)), ('even', (900, 0))]
@@ -1,8 +1,15 @@
 import pygame
-import sys
+import os
 import random
 import math
-from game.utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, RED, BLUE, GREEN, GRAY, YELLOW, BLACK, FPS
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import NamedTuple
+from game.utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, RED, BLUE, GREEN, GRAY, YELLOW, BLACK, FPS, \
+    PIPELINED_RENDERING, RENDER_FPS, TICK_RATE, KEYBOARD_ZONES, MAX_PLAYERS, PLAYER_COLORS as SEAT_COLORS
+from common import Entity, EventType, MotionHistory, Player as BasePlayer, Quality, Session, SpatialGrid, TimerWheel, \
+    display_canvas, draw_circle, draw_line, draw_rect, key_name, lerp, run_interactive, run_pipelined, seat_controls
 
 # Cooperative platformer specific constants
 GRAVITY = 0.8
@@ -20,29 +27,101 @@ PLATFORM_WIDTH = 100
 PLATFORM_HEIGHT = 20
 PLAYER_SIZE = 30
 SCROLL_SPEED = 2  # Auto-scroll speed
+GROUND_Y = 500  # World y of the starting platform
+CHUNK_HEIGHT = SCREEN_HEIGHT  # Levels are generated a screen at a time
+PLATFORMS_PER_CHUNK = 8
+MAX_PLATFORM_SHIFT = 150  # Horizontal distance between platforms on neighbouring rows, within jumping reach
+MIN_PLATFORM_X = 50
+MAX_PLATFORM_X = SCREEN_WIDTH - PLATFORM_WIDTH - 50
+MOMENTUM_BAR_WIDTH = 30
+MOMENTUM_BAR_HEIGHT = 4
+GLOW_RINGS = 2
+TRAIL_LENGTH = 20  # motion lines span this far behind a sliding player
+BOOST_DISTANCE = 50  # Players closer than this can boost each other
+SLIDE_BOOST_DISTANCE = 40
+CONTROLS = ('left', 'right', 'jump', 'boost')  # Named in keyboard zone order
+# The first three players keep their usual colors; the shared seat colors start RED, BLUE, GRAY
+PLAYER_COLORS = [BLUE, RED, GREEN, *(color for color in SEAT_COLORS if color not in (BLUE, RED, GREEN))]
+SPAWN_X = (300, 500, 400)  # Up to three players keep their usual spots
+SPAWN_Y = 480
 
-class Player:
-    def __init__(self, x, y, color, controls, player_id):
-        self.x = x
-        self.y = y
-        self.width = PLAYER_SIZE
-        self.height = PLAYER_SIZE
-        self.color = color
+
+class EffectSprites(NamedTuple):
+    """Translucent effect graphics for one player color, each drawn at ``offset`` from where it is blitted."""
+    glow: pygame.Surface
+    glow_offset: int
+    flash: pygame.Surface
+    flash_offset: int
+    trail_left: pygame.Surface
+    trail_right: pygame.Surface
+
+
+def _alpha_surface(width, height):
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    return surface.convert_alpha() if pygame.display.get_surface() else surface
+
+
+@lru_cache(maxsize=None)
+def effect_sprites(color, width=PLAYER_SIZE, height=PLAYER_SIZE) -> EffectSprites:
+    """Render the glow, bounce flash and motion trails of a ``width`` by ``height`` player once per color."""
+    # Momentum glow: rings 2 pixels apart around the player
+    glow_offset = GLOW_RINGS * 2
+    glow = _alpha_surface(width + glow_offset * 2, height + glow_offset * 2)
+    for i in range(GLOW_RINGS):
+        inset = glow_offset - (i + 1) * 2
+        pygame.draw.rect(glow, (*color, 50), (inset, inset, width + (i + 1) * 4, height + (i + 1) * 4), 2)
+
+    flash = _alpha_surface(width + 6, height + 6)
+    pygame.draw.rect(flash, (255, 255, 255, 100), flash.get_rect(), 3)
+
+    # Three 5 pixel motion lines end to end, starting 5 pixels behind the player
+    trail_right = _alpha_surface(TRAIL_LENGTH, 2)
+    for i in range(3):
+        trail_right.fill((*color, 128), (5 + i * 5, 0, 5, 2))
+    trail_left = pygame.transform.flip(trail_right, True, False)
+    return EffectSprites(glow, glow_offset, flash, 3, trail_left, trail_right)
+
+
+@lru_cache(maxsize=None)
+def momentum_bars():
+    """The momentum bar background and its full charging and charged fills."""
+    bars = []
+    for color in ((50, 50, 50), (255, 165, 0), (0, 255, 255)):
+        bar = pygame.Surface((MOMENTUM_BAR_WIDTH, MOMENTUM_BAR_HEIGHT))
+        bar.fill(color)
+        bars.append(bar)
+    return tuple(bars)
+
+
+@lru_cache(maxsize=None)
+def boost_prompt(boost_key):
+    """The rendered "Press <key>" prompt shown over a player who can boost."""
+    return pygame.font.Font(None, 20).render(f"Press {boost_key}", True, YELLOW)
+
+
+class Player(BasePlayer):
+    __slots__ = ('vel_x', 'vel_y', 'on_ground', 'score', 'can_boost', 'boost_cooldown', 'alive',
+                 'boost_display_timer', 'is_sliding', 'slide_timer', 'slide_cooldown', 'slide_direction',
+                 'momentum', 'last_direction', 'just_bounced', 'bounce_cooldown', 'boosting', '_timers')
+
+    def __init__(self, x, y, color, controls, player_id, timers=None):
+        # controls: {'left': key, 'right': key, 'jump': key, 'boost': key}
+        super().__init__(x, y, PLAYER_SIZE, PLAYER_SIZE, color, controls, player_id)
+        # Cooldowns are timers on this wheel, None until first started
+        self._timers = timers
         self.vel_x = 0
         self.vel_y = 0
         self.on_ground = False
-        self.controls = controls  # {'left': key, 'right': key, 'jump': key}
-        self.player_id = player_id
         self.score = 0
         self.can_boost = False
-        self.boost_cooldown = 0
+        self.boost_cooldown = None
         self.alive = True
         self.boost_display_timer = 0  # Timer to stabilize boost display
         
         # Sliding mechanics
         self.is_sliding = False
-        self.slide_timer = 0
-        self.slide_cooldown = 0
+        self.slide_timer = None
+        self.slide_cooldown = None
         self.slide_direction = 0  # -1 for left, 1 for right
         
         # Momentum system
@@ -51,26 +130,29 @@ class Player:
         
         # Edge bouncing
         self.just_bounced = False
-        self.bounce_cooldown = 0
+        self.bounce_cooldown = None
         
         # Boost flag to prevent simultaneous jump
         self.boosting = False
-        
-    def update(self, platforms, other_players, scroll_offset):
+
+    @property
+    def timers(self):
+        """The session's wheel, or one of the player's own made on first use when there is none."""
+        if self._timers is None:
+            self._timers = TimerWheel()
+        return self._timers
+
+    def update(self, platforms, nearby, scroll_offset, scroll_delta=0):
+        """
+        Move for one frame. ``nearby(player, distance)`` lists the other players near a
+        player, and ``scroll_delta`` is how far the platforms scrolled down this frame.
+        """
         if not self.alive:
             return
             
         # Handle input
-        keys = pygame.key.get_pressed()
-        
-        # Handle cooldowns
-        if self.slide_cooldown > 0:
-            self.slide_cooldown -= 1
-            
-        if self.bounce_cooldown > 0:
-            self.bounce_cooldown -= 1
-            if self.bounce_cooldown == 0:
-                self.just_bounced = False
+        keys = self.input.get_pressed()
+        controls = self.controls
         
         # Apply gravity
         self.vel_y += GRAVITY
@@ -80,25 +162,40 @@ class Player:
             self.vel_y = 20
             
         # Update position
+        start_x = self.x
+        start_y = self.y
         self.x += self.vel_x
         self.y += self.vel_y
         
         # Check collisions with platforms
         self.on_ground = False
-        for platform in platforms:
-            if self.check_collision(platform, scroll_offset):
-                # Landing on top of platform
-                if self.vel_y > 0 and self.y < platform.y + scroll_offset:
-                    self.y = platform.y + scroll_offset - self.height
-                    self.vel_y = 0
-                    self.on_ground = True
+        x = self.x
+        width = self.width
+        height = self.height
+        landing_y = self.find_landing(platforms, start_x, start_y, scroll_offset, scroll_delta)
+        if landing_y is not None:
+            self.y = landing_y - height
+            self.vel_y = 0
+            self.on_ground = True
+        else:
+            # Players whose feet rose just past a platform's top while jumping through it step up onto it
+            for platform in platforms:
+                platform_y = platform.y + scroll_offset
+                y = self.y
+                if (x < platform.x + platform.width and x + width > platform.x and
+                        y < platform_y + platform.height and y + height > platform_y):
+                    # Landing on top of platform
+                    if self.vel_y > 0 and y < platform_y:
+                        self.y = platform_y - height
+                        self.vel_y = 0
+                        self.on_ground = True
                     
         # Update momentum based on movement and collision state
         if not self.is_sliding:
             current_direction = 0
-            if keys[self.controls['left']]:
+            if keys[controls['left']]:
                 current_direction = -1
-            elif keys[self.controls['right']]:
+            elif keys[controls['right']]:
                 current_direction = 1
             
             # Build momentum when running on ground or platforms
@@ -112,14 +209,6 @@ class Player:
                     self.momentum -= MOMENTUM_DECAY_RATE / 60
                     self.momentum = max(0, self.momentum)
         
-        # Handle sliding state
-        if self.is_sliding:
-            self.slide_timer -= 1
-            if self.slide_timer <= 0:
-                self.is_sliding = False
-                self.slide_direction = 0
-                self.momentum = 0  # Reset momentum after slide
-        
         # Calculate movement for NEXT frame
         if self.is_sliding:
             # Use momentum-based sliding speed (legacy cooperative slide boost)
@@ -134,14 +223,14 @@ class Player:
                 base_speed *= speed_boost
                 
             self.vel_x = 0
-            if keys[self.controls['left']]:
+            if keys[controls['left']]:
                 self.vel_x = -base_speed
-            if keys[self.controls['right']]:
+            if keys[controls['right']]:
                 self.vel_x = base_speed
                 
         # Handle jumping
-        is_jump_pressed = keys[self.controls['jump']]
-        is_boost_pressed = keys[self.controls['boost']] if 'boost' in self.controls else False
+        is_jump_pressed = keys[controls['jump']]
+        is_boost_pressed = keys[controls['boost']] if 'boost' in controls else False
         
         if is_jump_pressed and self.on_ground and not self.is_sliding and not self.boosting and not is_boost_pressed:
             # Momentum-boosted jumping
@@ -171,7 +260,7 @@ class Player:
                 # Reduce momentum slightly
                 self.momentum *= 0.9
                 self.just_bounced = True
-                self.bounce_cooldown = 5  # Prevent jitter
+                self.bounce_cooldown = self.timers.schedule(5, self.end_bounce)  # Prevent jitter
                 
         elif self.x > SCREEN_WIDTH - self.width:
             self.x = SCREEN_WIDTH - self.width
@@ -185,13 +274,10 @@ class Player:
                 # Reduce momentum slightly
                 self.momentum *= 0.9
                 self.just_bounced = True
-                self.bounce_cooldown = 5  # Prevent jitter
-            
-        # Update cooldowns
-        if self.boost_cooldown > 0:
-            self.boost_cooldown -= 1
+                self.bounce_cooldown = self.timers.schedule(5, self.end_bounce)  # Prevent jitter
             
         # Check for cooperative boost
+        other_players = nearby(self, BOOST_DISTANCE)
         self.check_cooperative_boost(other_players)
         
         # Check for slide boost interactions
@@ -201,6 +287,39 @@ class Player:
         if self.y > SCREEN_HEIGHT:
             self.alive = False
             
+    def find_landing(self, platforms, start_x, start_y, scroll_offset, scroll_delta):
+        """
+        The screen y of the first platform top the player's feet crossed on the way
+        from ``(start_x, start_y)`` to where the player is now, or ``None``.
+
+        The motion is swept, with the platforms moving down by ``scroll_delta`` during
+        the frame, so a fast fall cannot carry the player through a platform between
+        two frames.
+        """
+        # How far the feet dropped relative to the scrolling platforms
+        fall = self.y - start_y - scroll_delta
+        if fall <= 0:
+            return None
+        bottom = start_y + self.height
+        shift_x = self.x - start_x
+        width = self.width
+        first_time = 1.0
+        landing_y = None
+        for platform in platforms:
+            top = platform.y + scroll_offset
+            # Distance from the feet down to the top at the start of the frame
+            gap = top - scroll_delta - bottom
+            if gap < 0 or gap >= fall:
+                continue
+            time = gap / fall
+            if time >= first_time:
+                continue
+            x = start_x + shift_x * time
+            if x < platform.x + platform.width and x + width > platform.x:
+                first_time = time
+                landing_y = top
+        return landing_y
+
     def check_collision(self, platform, scroll_offset):
         platform_y = platform.y + scroll_offset
         return (self.x < platform.x + platform.width and
@@ -212,8 +331,21 @@ class Player:
         """Initiate sliding in the given direction (-1 for left, 1 for right)"""
         self.is_sliding = True
         self.slide_direction = direction
-        self.slide_timer = SLIDE_DURATION
-        self.slide_cooldown = SLIDE_COOLDOWN
+        timers = self.timers
+        timers.cancel(self.slide_timer)
+        timers.cancel(self.slide_cooldown)
+        self.slide_timer = timers.schedule(SLIDE_DURATION, self.end_slide)
+        self.slide_cooldown = timers.schedule(SLIDE_COOLDOWN)
+
+    def end_slide(self):
+        """Stop sliding once the slide has run its course."""
+        self.is_sliding = False
+        self.slide_direction = 0
+        self.momentum = 0  # Reset momentum after slide
+
+    def end_bounce(self):
+        """Allow bouncing off the screen edge again."""
+        self.just_bounced = False
         
     def check_cooperative_boost(self, other_players):
         # Check if any nearby player is close enough for boost (display only)
@@ -221,7 +353,7 @@ class Player:
         for other_player in other_players:
             if other_player.player_id != self.player_id and other_player.alive:
                 distance = math.sqrt((self.x - other_player.x)**2 + (self.y - other_player.y)**2)
-                if distance < 50 and self.boost_cooldown == 0:
+                if distance < BOOST_DISTANCE and self.timers.remaining(self.boost_cooldown) == 0:
                     new_can_boost = True
                     break
         
@@ -242,12 +374,13 @@ class Player:
             for other_player in other_players:
                 if other_player.player_id != self.player_id and other_player.alive:
                     distance = math.sqrt((self.x - other_player.x)**2 + (self.y - other_player.y)**2)
-                    if distance < 40:  # Close contact for slide boost
+                    if distance < SLIDE_BOOST_DISTANCE:  # Close contact for slide boost
                         # Give the other player a horizontal speed boost
                         other_player.vel_x = self.slide_direction * MOVE_SPEED * SLIDE_SPEED_MULTIPLIER * 1.2
                         # Add small vertical boost for fun
                         other_player.vel_y = min(other_player.vel_y, JUMP_STRENGTH * 0.5)
                         # End slide after boost
+                        self.timers.cancel(self.slide_timer)
                         self.is_sliding = False
                         self.slide_direction = 0
                         return True
@@ -266,33 +399,26 @@ class Player:
             closest_player = None
             min_distance = float('inf')
             
-            print(f"\n=== Player {self.player_id} attempting boost ===")
-            print(f"Player {self.player_id} position: ({self.x}, {self.y})")
-            
             for other_player in other_players:
                 if other_player.player_id != self.player_id and other_player.alive:
                     distance = math.sqrt((self.x - other_player.x)**2 + (self.y - other_player.y)**2)
-                    print(f"Distance to player {other_player.player_id}: {distance:.2f} (position: {other_player.x}, {other_player.y})")
-                    if distance < 50 and distance < min_distance:
+                    if distance < BOOST_DISTANCE and distance < min_distance:
                         min_distance = distance
                         closest_player = other_player
             
             if closest_player:
-                print(f"-> Boosting player {closest_player.player_id} (closest at {min_distance:.2f})")
-                print(f"Before boost: Player {self.player_id} vel_y: {self.vel_y}, Player {closest_player.player_id} vel_y: {closest_player.vel_y}")
                 closest_player.vel_y = JUMP_STRENGTH * 1.5  # Super jump
-                print(f"After boost: Player {self.player_id} vel_y: {self.vel_y}, Player {closest_player.player_id} vel_y: {closest_player.vel_y}")
-                self.boost_cooldown = 42  # 0.7 second cooldown (30% reduction from 60)
+                self.boost_cooldown = self.timers.schedule(42)  # 0.7 second cooldown (30% reduction from 60)
                 return True
             else:
-                print("-> No valid target to boost (no one within 50 units)")
                 # Reset boost flag if no target found
                 self.boosting = False
         return False
         
-    def draw(self, screen):
+    def draw(self, screen, quality=Quality.HIGH):
         if not self.alive:
             return
+        effects = quality == Quality.HIGH
             
         # Draw player with sliding effect
         if self.is_sliding:
@@ -301,396 +427,467 @@ class Player:
             slide_height = int(self.height * 0.7)
             slide_x = self.x - (slide_width - self.width) // 2
             slide_y = self.y + (self.height - slide_height) // 2
-            pygame.draw.rect(screen, self.color, (slide_x, slide_y, slide_width, slide_height))
+            draw_rect(screen, self.color, (slide_x, slide_y, slide_width, slide_height))
             # Add motion lines
-            for i in range(3):
-                line_x = slide_x - 10 - i * 5 if self.slide_direction == -1 else slide_x + slide_width + 10 + i * 5
-                pygame.draw.line(screen, (*self.color, 128), 
-                               (line_x, slide_y + slide_height // 2),
-                               (line_x - 5 * self.slide_direction, slide_y + slide_height // 2), 2)
+            if effects:
+                sprites = effect_sprites(self.color, self.width, self.height)
+                line_y = slide_y + slide_height // 2
+                if self.slide_direction == -1:
+                    screen.blit(sprites.trail_left, (slide_x - TRAIL_LENGTH, line_y))
+                else:
+                    screen.blit(sprites.trail_right, (slide_x + slide_width, line_y))
         else:
             # Draw player with momentum glow effect
-            if self.momentum >= MOMENTUM_THRESHOLD * 0.8:
-                # Draw glow effect for high momentum
-                glow_size = 2
-                glow_color = (*self.color, 50)
-                for i in range(glow_size):
-                    pygame.draw.rect(screen, glow_color, 
-                                   (self.x - (i+1)*2, self.y - (i+1)*2, 
-                                    self.width + (i+1)*4, self.height + (i+1)*4), 2)
-            
-            # Draw bounce effect
-            if self.just_bounced:
+            if effects and (self.momentum >= MOMENTUM_THRESHOLD * 0.8 or self.just_bounced):
+                sprites = effect_sprites(self.color, self.width, self.height)
+                if self.momentum >= MOMENTUM_THRESHOLD * 0.8:
+                    screen.blit(sprites.glow, (self.x - sprites.glow_offset, self.y - sprites.glow_offset))
                 # Draw bounce flash
-                pygame.draw.rect(screen, (255, 255, 255, 100), 
-                               (self.x - 3, self.y - 3, self.width + 6, self.height + 6), 3)
+                if self.just_bounced:
+                    screen.blit(sprites.flash, (self.x - sprites.flash_offset, self.y - sprites.flash_offset))
             
-            pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
+            draw_rect(screen, self.color, (self.x, self.y, self.width, self.height))
             
             # Draw momentum indicator
             if self.momentum > 0 and not self.is_sliding:
-                bar_width = 30
-                bar_height = 4
-                bar_x = self.x + (self.width - bar_width) // 2
+                background, charging, charged = momentum_bars()
+                bar_x = self.x + (self.width - MOMENTUM_BAR_WIDTH) // 2
                 bar_y = self.y - 8
-                # Background
-                pygame.draw.rect(screen, (50, 50, 50), (bar_x, bar_y, bar_width, bar_height))
+                screen.blit(background, (bar_x, bar_y))
                 # Momentum fill
-                fill_width = int((self.momentum / MOMENTUM_THRESHOLD) * bar_width)
-                fill_color = (0, 255, 255) if self.momentum >= MOMENTUM_THRESHOLD * 0.8 else (255, 165, 0)
-                pygame.draw.rect(screen, fill_color, (bar_x, bar_y, min(fill_width, bar_width), bar_height))
+                fill_width = min(int((self.momentum / MOMENTUM_THRESHOLD) * MOMENTUM_BAR_WIDTH), MOMENTUM_BAR_WIDTH)
+                fill = charged if self.momentum >= MOMENTUM_THRESHOLD * 0.8 else charging
+                screen.blit(fill, (bar_x, bar_y), (0, 0, fill_width, MOMENTUM_BAR_HEIGHT))
         
         # Draw boost indicator
         if self.can_boost:
-            pygame.draw.circle(screen, YELLOW, 
+            draw_circle(screen, YELLOW, 
                              (int(self.x + self.width//2), int(self.y - 15)), 5)
+            if quality == Quality.LOW:
+                return
             # Draw boost prompt with background to prevent flicker
-            font_small = pygame.font.Font(None, 20)
-            boost_key_map = {1: "S", 2: "DOWN", 3: "K"}
-            boost_key = boost_key_map.get(self.player_id, "?")
-            prompt_text = font_small.render(f"Press {boost_key}", True, YELLOW)
+            prompt_text = boost_prompt(key_name(self.controls['boost']).upper())
             # Create a small background rectangle for the text
             text_rect = prompt_text.get_rect()
             text_rect.topleft = (self.x - 10, self.y - 35)
-            pygame.draw.rect(screen, BLACK, text_rect.inflate(4, 2))  # Black background
+            draw_rect(screen, BLACK, text_rect.inflate(4, 2))  # Black background
             screen.blit(prompt_text, text_rect)
 
-class Platform:
+# Every slot of Player, including those declared by its bases
+_PLAYER_SLOTS = tuple(name for cls in Player.__mro__ for name in getattr(cls, '__slots__', ()))
+
+class Platform(Entity):
+    __slots__ = ('platform_type', 'color')
+
     def __init__(self, x, y, width=PLATFORM_WIDTH, height=PLATFORM_HEIGHT, 
                  platform_type='normal'):
-        self.x = x
-        self.y = y
-        self.width = width
-        self.height = height
+        super().__init__(x, y, width, height)
         self.platform_type = platform_type
         self.color = GRAY if platform_type == 'normal' else GREEN
         
     def draw(self, screen, scroll_offset):
         draw_y = self.y + scroll_offset
         if -50 < draw_y < SCREEN_HEIGHT + 50:
-            pygame.draw.rect(screen, self.color, (self.x, draw_y, self.width, self.height))
+            draw_rect(screen, self.color, (self.x, draw_y, self.width, self.height))
             if self.platform_type == 'cooperative':
-                pygame.draw.circle(screen, YELLOW, 
+                draw_circle(screen, YELLOW, 
                                  (int(self.x + self.width//2), int(draw_y + self.height//2)), 8)
 
-def cooperative_platformer_game(screen, num_players=1):
-    clock = pygame.time.Clock()
-    font = pygame.font.Font(None, 36)
-    
-    # Initialize players (spawn just above the starting platform)
-    player1 = Player(300, 480, BLUE, 
-                     {'left': pygame.K_a, 'right': pygame.K_d, 'jump': pygame.K_w, 'boost': pygame.K_s}, 1)
-    players = [player1]
-    print(f"After init: player1 ID: {player1.player_id}, color: {player1.color}, controls: {player1.controls}")
-    
-    # Add second player if num_players is 2
-    if num_players > 1:
-        player2 = Player(500, 480, RED, 
-                        {'left': pygame.K_LEFT, 'right': pygame.K_RIGHT, 'jump': pygame.K_UP, 'boost': pygame.K_DOWN}, 2)
-        players.append(player2)
-        print(f"After init: player2 ID: {player2.player_id}, color: {player2.color}, controls: {player2.controls}")
-    
-    
-    
-    # Add third player if num_players is 3
-    if num_players > 2:
-        player3 = Player(400, 480, GREEN, 
-                        {'left': pygame.K_j, 'right': pygame.K_l, 'jump': pygame.K_i, 'boost': pygame.K_k}, 3)
-        players.append(player3)
-        print(f"After init: player3 ID: {player3.player_id}, color: {player3.color}, controls: {player3.controls}")
-    
-    # Game state
-    platforms = []
-    scroll_offset = 0  # How much the screen has scrolled
-    score = 0
-    coop_bonus = 1
-    game_over = False
-    shared_lives = 3  # Following existing project pattern
-    game_started = False  # Flag to control when scrolling starts
-    
-    # Initialize platforms
-    generate_initial_platforms(platforms)
-    
-    running = True
-    while running:
-        dt = clock.tick(60)
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.KEYDOWN and not game_over:
-                if event.key == pygame.K_ESCAPE:
-                    return
-                # Cooperative boost mechanics
-                elif event.key == pygame.K_s:  # Player 1 boost
-                    # Find player 1 by ID (should be the blue player)
-                    player1 = None
-                    for p in players:
-                        if p.player_id == 1:
-                            player1 = p
-                            break
-                    if player1:
-                        print(f"S key pressed - calling boost on player1 (ID: {player1.player_id})")
-                        if player1.boost_other_player(players):
-                            score += 50
-                elif event.key == pygame.K_DOWN and num_players > 1:  # Player 2 boost
-                    # Find player 2 by ID (should be the red player)
-                    player2 = None
-                    for p in players:
-                        if p.player_id == 2:
-                            player2 = p
-                            break
-                    if player2:
-                        print(f"DOWN key pressed - calling boost on player2 (ID: {player2.player_id})")
-                        if player2.boost_other_player(players):
-                            score += 50
-                elif event.key == pygame.K_k and num_players == 3:  # Player 3 boost
-                    # Find player 3 by ID (should be the green player)
-                    player3 = None
-                    for p in players:
-                        if p.player_id == 3:
-                            player3 = p
-                            break
-                    if player3:
-                        print(f"K key pressed - calling boost on player3 (ID: {player3.player_id})")
-                        if player3.boost_other_player(players):
-                            score += 50
-            elif event.type == pygame.KEYDOWN and game_over:
-                if event.key == pygame.K_SPACE:
-                    return cooperative_platformer_game(screen, num_players)
-                elif event.key == pygame.K_ESCAPE:
-                    return
-        
-        if not game_over:
-            # Check if game should start scrolling (when any player reaches 75% screen height)
-            if not game_started:
-                highest_player = min(players, key=lambda p: p.y)
-                if highest_player.y < SCREEN_HEIGHT * 0.25:  # 75% of screen height means top 25%
-                    game_started = True
-            
-            # Update scroll offset (auto-scrolling) only after game has started
-            if game_started:
-                # Calculate dynamic scroll speed based on score
-                # 0.1% increase per point (base speed 2, so 0.002 per point)
-                speed_multiplier = 1 + (score * 0.001)
-                dynamic_scroll_speed = SCROLL_SPEED * speed_multiplier
-                
-                # Cap the maximum scroll speed to prevent it from becoming impossible
-                max_scroll_speed = SCROLL_SPEED * 5  # Maximum 5x base speed
-                dynamic_scroll_speed = min(dynamic_scroll_speed, max_scroll_speed)
-                
-                scroll_offset += dynamic_scroll_speed
-            
-            # Update players
-            for player in players:
-                other_players = [p for p in players if p != player]
-                player.update(platforms, other_players, scroll_offset)
-            
-            # Check if any player died
-            if not all(player.alive for player in players):
-                shared_lives -= 1
-                if shared_lives <= 0:
-                    game_over = True
-                else:
-                    # Reset players and continue
-                    for i, player in enumerate(players):
-                        player.x = 300 + i * 200
-                        player.y = 480  # Match new spawn height
-                        player.vel_x = 0
-                        player.vel_y = 0
-                        player.alive = True
-                    scroll_offset = 0
-                    game_started = False  # Reset scrolling flag
-                    platforms.clear()
-                    generate_initial_platforms(platforms)
-            
-            # Generate new platforms as needed
-            generate_new_platforms(platforms, scroll_offset)
-            
-            # Remove platforms that are too far above screen
-            platforms = [p for p in platforms if p.y + scroll_offset < SCREEN_HEIGHT + 100]
-            
-            # Check cooperative platforms for bonus
-            coop_bonus = check_cooperative_platforms(players, platforms, scroll_offset)
-            
-            # Update score based on height
-            height_score = int(scroll_offset * 0.1)
-            total_player_score = sum(p.score for p in players)
-            score = (height_score + total_player_score) * coop_bonus
-        
-        # Draw everything
-        screen.fill(BLACK)
-        
-        # Draw platforms
-        for platform in platforms:
-            platform.draw(screen, scroll_offset)
-        
-        # Draw players
+class CooperativeSession(Session):
+    game_name = 'cooperative'
+
+    def __init__(self, num_players=1, scroll_speed=SCROLL_SPEED, seed=None):
+        super().__init__()
+        self.rng = random.Random(random.getrandbits(32) if seed is None else seed)
+        self.num_players = num_players
+        self.scroll_speed = scroll_speed
+        self.font = None
+
+        # Initialize players (spawn just above the starting platform)
+        self.players = []
+        for seat in range(num_players):
+            player = Player(spawn_x(seat, num_players), SPAWN_Y, PLAYER_COLORS[seat],
+                            seat_controls(seat, CONTROLS), seat + 1, self.timers)
+            self.players.append(player)
+
+        # Boost key to player, so events are routed without scanning every player
+        self.players_by_boost_key = {player.controls['boost']: player for player in self.players}
+        # Players by position, so each finds its neighbours without looking at every other player
+        self.grid = SpatialGrid(BOOST_DISTANCE, self.players)
+
+        # Game state
+        self.platforms = []
+        self.scroll_offset = 0  # How much the screen has scrolled
+        self.previous_scroll_offset = 0  # The scroll offset before the last step, for drawing between steps
+        self.motion = MotionHistory()
+        self.score = 0
+        self.coop_bonus = 1
+        self.game_over = False
+        self.shared_lives = 3  # Following existing project pattern
+        self.game_started = False  # Flag to control when scrolling starts
+
+        # Initialize platforms
+        self.level = ChunkGenerator(self.rng.getrandbits(32))
+        self.level.extend(self.platforms, -self.scroll_offset)
+
+        # Two snapshots, so one can be drawn while the other is filled
+        self._snapshots = (CooperativeSnapshot(), CooperativeSnapshot())
+        self._snapshot_index = 0
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and not self.game_over:
+            # Cooperative boost mechanics
+            player = self.players_by_boost_key.get(event.key)
+            if player is not None:
+                if player.boost_other_player(self.nearby(player, BOOST_DISTANCE)):
+                    self.score += 50
+
+    def step(self):
+        players = self.players
+        self.previous_scroll_offset = self.scroll_offset
+        self.motion.record(players)
+
+        # Check if game should start scrolling (when any player reaches 75% screen height)
+        if not self.game_started:
+            highest_player = min(players, key=lambda p: p.y)
+            if highest_player.y < SCREEN_HEIGHT * 0.25:  # 75% of screen height means top 25%
+                self.game_started = True
+
+        # Update scroll offset (auto-scrolling) only after game has started
+        scroll_delta = 0
+        if self.game_started:
+            # Calculate dynamic scroll speed based on score
+            # 0.1% increase per point (base speed 2, so 0.002 per point)
+            speed_multiplier = 1 + (self.score * 0.001)
+            dynamic_scroll_speed = self.scroll_speed * speed_multiplier
+
+            # Cap the maximum scroll speed to prevent it from becoming impossible
+            max_scroll_speed = self.scroll_speed * 5  # Maximum 5x base speed
+            dynamic_scroll_speed = min(dynamic_scroll_speed, max_scroll_speed)
+
+            self.scroll_offset += dynamic_scroll_speed
+            scroll_delta = dynamic_scroll_speed
+
+        # Update players
+        grid = self.grid
         for player in players:
-            player.draw(screen)
-        
-        # Draw connection lines when players can boost
-        for i, player_a in enumerate(players):
-            for player_b in players[i+1:]:
-                if player_a.alive and player_b.alive:
-                    distance = math.sqrt((player_a.x - player_b.x)**2 + (player_a.y - player_b.y)**2)
-                    if distance < 50:
-                        pygame.draw.line(screen, (100, 255, 100), 
-                                       (player_a.x + player_a.width//2, player_a.y + player_a.height//2),
-                                       (player_b.x + player_b.width//2, player_b.y + player_b.height//2), 2)
-        
-        # Draw UI
-        score_text = font.render(f"Score: {score}", True, WHITE)
-        screen.blit(score_text, (10, 10))
-        
-        lives_text = font.render(f"Lives: {shared_lives}", True, WHITE if shared_lives > 1 else RED)
-        screen.blit(lives_text, (10, 50))
-        
-        # Cooperative bonus indicator
-        if coop_bonus > 1:
-            bonus_text = font.render(f"COOP x{coop_bonus}!", True, YELLOW)
-            screen.blit(bonus_text, (10, 90))
-        
-        # Controls
-        font_small = pygame.font.Font(None, 24)
-        controls1 = font_small.render("P1: A/D to move, W to jump, S to boost", True, BLUE)
-        controls2 = font_small.render("P2: Arrows to move, Up to jump, Down to boost", True, RED)
-        screen.blit(controls1, (10, SCREEN_HEIGHT - 50))
-        screen.blit(controls2, (10, SCREEN_HEIGHT - 25))
-        
+            player.update(self.platforms, self.nearby, self.scroll_offset, scroll_delta)
+            grid.move(player)
+
+        # Check if any player died
+        if not all(player.alive for player in players):
+            for player in players:
+                if not player.alive:
+                    # Heights in the level, so deaths line up across runs
+                    self.log_event(EventType.DEATH, player.player_id, player.x, player.y - self.scroll_offset)
+            self.shared_lives -= 1
+            if self.shared_lives <= 0:
+                self.game_over = True
+            else:
+                # Reset players and continue
+                for i, player in enumerate(players):
+                    player.x = spawn_x(i, len(players))
+                    player.y = SPAWN_Y
+                    player.vel_x = 0
+                    player.vel_y = 0
+                    player.alive = True
+                    grid.move(player)
+                self.scroll_offset = 0
+                self.previous_scroll_offset = 0
+                self.motion.settle(players)
+                self.game_started = False  # Reset scrolling flag
+                self.platforms.clear()
+                self.level.reseed(self.rng.getrandbits(32))
+
+        # Take generated chunks as the screen climbs
+        self.level.extend(self.platforms, -self.scroll_offset)
+
+        # Remove platforms that are too far above screen
+        self.platforms = [p for p in self.platforms if p.y + self.scroll_offset < SCREEN_HEIGHT + 100]
+
+        # Check cooperative platforms for bonus
+        self.coop_bonus = check_cooperative_platforms(players, self.platforms, self.scroll_offset)
+
+        # Update score based on height
+        height_score = int(self.scroll_offset * 0.1)
+        total_player_score = sum(p.score for p in players)
+        self.score = (height_score + total_player_score) * self.coop_bonus
+
+    def nearby(self, player, distance):
+        """The other players within ``distance`` of ``player`` along both axes, and perhaps a few more."""
+        return [other for other in self.grid.near(player.x, player.y, distance) if other is not player]
+
+    def scores(self):
+        return {'score': self.score, 'lives': self.shared_lives}
+
+    def record(self, leaderboard):
+        leaderboard.submit(self.game_name, self.num_players, self.score)
+
+    def draw(self, screen):
+        scroll_offset = lerp(self.previous_scroll_offset, self.scroll_offset, self.interpolation)
+        with self.motion.blend(self.players, self.interpolation):
+            draw_frame(screen, self, scroll_offset)
+
+    def snapshot(self):
+        self._snapshot_index ^= 1
+        return self._snapshots[self._snapshot_index].capture(self)
+
+
+class CooperativeSnapshot:
+    """
+    Everything ``draw_frame`` reads from a CooperativeSession, copied so that the
+    next frame can be simulated while this one is drawn.
+
+    Players are copied into shells that are reused from capture to capture, and
+    platforms are shared since they never change once created.
+
+    Attributes:
+        players (list): Copies of the session's players.
+        platforms (tuple): The session's platforms.
+        font (pygame.font.Font): The HUD font, created on first draw.
+    """
+    __slots__ = ('players', 'platforms', 'scroll_offset', 'score', 'shared_lives', 'coop_bonus', 'num_players',
+                 'game_over', 'quality', 'font')
+
+    def __init__(self):
+        self.players = []
+        self.platforms = ()
+        self.scroll_offset = 0
+        self.score = 0
+        self.shared_lives = 0
+        self.coop_bonus = 1
+        self.num_players = 0
+        self.game_over = False
+        self.quality = Quality.HIGH
+        self.font = None
+
+    def capture(self, session):
+        players = self.players
+        del players[len(session.players):]
+        while len(players) < len(session.players):
+            players.append(Player.__new__(Player))
+        for copy, player in zip(players, session.players):
+            for name in _PLAYER_SLOTS:
+                setattr(copy, name, getattr(player, name))
+
+        self.platforms = tuple(session.platforms)
+        self.scroll_offset = session.scroll_offset
+        self.score = session.score
+        self.shared_lives = session.shared_lives
+        self.coop_bonus = session.coop_bonus
+        self.num_players = session.num_players
+        self.game_over = session.game_over
+        self.quality = session.quality
+        return self
+
+    def draw(self, screen):
+        draw_frame(screen, self)
+
+
+def cooperative_platformer_game(screen, num_players=1, pipelined=PIPELINED_RENDERING):
+    num_players = min(num_players, MAX_PLAYERS)
+    with display_canvas(screen) as target:
+        if pipelined:
+            run_pipelined(target, lambda: CooperativeSession(num_players))
+        else:
+            run_interactive(target, lambda: CooperativeSession(num_players), RENDER_FPS, tick_rate=TICK_RATE)
+
+def draw_frame(screen, state, scroll_offset=None):
+    """
+    Draw a frame of ``state``, a CooperativeSession or a CooperativeSnapshot, with
+    the platforms at ``scroll_offset`` if given instead of the state's own.
+    """
+    if scroll_offset is None:
+        scroll_offset = state.scroll_offset
+    if state.font is None:
+        state.font = pygame.font.Font(None, 36)
+    font = state.font
+    players = state.players
+
+    screen.fill(BLACK)
+
+    # Draw platforms
+    for platform in state.platforms:
+        platform.draw(screen, scroll_offset)
+
+    # Draw players
+    for player in players:
+        player.draw(screen, state.quality)
+
+    # Draw connection lines when players can boost
+    alive = [player for player in players if player.alive]
+    grid = SpatialGrid(BOOST_DISTANCE, alive)
+    for player_a in alive:
+        for player_b in grid.near(player_a.x, player_a.y, BOOST_DISTANCE):
+            # Each pair once
+            if player_b.player_id > player_a.player_id:
+                distance = math.sqrt((player_a.x - player_b.x)**2 + (player_a.y - player_b.y)**2)
+                if distance < BOOST_DISTANCE:
+                    draw_line(screen, (100, 255, 100), 
+                                   (player_a.x + player_a.width//2, player_a.y + player_a.height//2),
+                                   (player_b.x + player_b.width//2, player_b.y + player_b.height//2), 2)
+
+    # Draw UI
+    score_text = font.render(f"Score: {state.score}", True, WHITE)
+    screen.blit(score_text, (10, 10))
+
+    lives_text = font.render(f"Lives: {state.shared_lives}", True, WHITE if state.shared_lives > 1 else RED)
+    screen.blit(lives_text, (10, 50))
+
+    # Cooperative bonus indicator
+    if state.coop_bonus > 1:
+        bonus_text = font.render(f"COOP x{state.coop_bonus}!", True, YELLOW)
+        screen.blit(bonus_text, (10, 90))
+
+    # Controls
+    if state.quality > Quality.LOW:
+        hints = control_hints(min(state.num_players, len(KEYBOARD_ZONES)))
+        for i, hint in enumerate(hints):
+            screen.blit(hint, (10, SCREEN_HEIGHT - 25 * (len(hints) - i)))
+
         # Momentum instructions
-        momentum_text = font_small.render("Build momentum for super jumps & edge bounces!", True, (0, 255, 255))
+        momentum_text = momentum_hint()
         screen.blit(momentum_text, (SCREEN_WIDTH - 300, SCREEN_HEIGHT - 25))
-        
-        if num_players == 3:
-            controls3 = font_small.render("P3: J/L to move, I to jump, K to boost", True, GREEN)
-            screen.blit(controls3, (10, SCREEN_HEIGHT - 75))
-        
-        if game_over:
-            game_over_text = font.render("GAME OVER!", True, RED)
-            screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 2 - 50))
-            
-            final_score_text = font.render(f"Final Score: {score}", True, WHITE)
-            screen.blit(final_score_text, (SCREEN_WIDTH // 2 - final_score_text.get_width() // 2, SCREEN_HEIGHT // 2))
-            
-            restart_text = font.render("Press SPACE to restart or ESC to return to menu", True, WHITE)
-            screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 50))
-        
-        pygame.display.flip()
-    
-    return
 
-def generate_initial_platforms(platforms):
-    # Starting platform - full width to prevent immediate falls
-    platforms.append(Platform(0, 500, SCREEN_WIDTH, PLATFORM_HEIGHT))
-    
-    # Generate just enough platforms for the starting screen (8-10 platforms)
-    last_x = SCREEN_WIDTH // 2
-    last_y = 500
-    
-    # Generate platforms to fill about 2 screens worth of initial gameplay
-    # 20% more platforms at lower levels (increased from 9 to 11)
-    target_platforms = 11
-    for i in range(target_platforms):
-        # Use lane-based horizontal positioning for better distribution
-        lanes = [150, 300, 450, 600]  # 4 horizontal lanes
-        target_lane = random.choice(lanes)
-        
-        # Add some randomness to the lane position
-        x = target_lane + random.randint(-30, 30)
-        x = max(50, min(SCREEN_WIDTH - PLATFORM_WIDTH - 50, x))
-        
-        # Vertical spacing with consistent density (about 70 units apart)
-        y_offset = random.randint(60, 80)
-        y = last_y - y_offset
-        
-        # Calculate platform width based on height (wider at lower levels)
-        height_factor = max(0, 500 - y) / 1000  # 0 to 0.5 based on height
-        width_multiplier = 1.8 - height_factor * 0.5  # 1.8x at bottom (30% wider), 1.3x at top
-        platform_width = int(PLATFORM_WIDTH * width_multiplier)
-        platform_width = max(90, min(platform_width, 180))  # Clamp between 90 and 180
-        
-        # Check for overlaps with existing platforms
-        valid_position = True
-        for platform in platforms:
-            if (abs(x - platform.x) < platform_width + 20 and 
-                abs(y - platform.y) < PLATFORM_HEIGHT + 20):
-                valid_position = False
-                break
-        
-        if valid_position:
-            platform_type = 'cooperative' if random.random() < 0.15 else 'normal'
-            platforms.append(Platform(x, y, platform_width, PLATFORM_HEIGHT, platform_type))
-            last_x = x
-            last_y = y
+    if state.game_over:
+        game_over_text = font.render("GAME OVER!", True, RED)
+        screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 2 - 50))
+
+        final_score_text = font.render(f"Final Score: {state.score}", True, WHITE)
+        screen.blit(final_score_text, (SCREEN_WIDTH // 2 - final_score_text.get_width() // 2, SCREEN_HEIGHT // 2))
+
+        restart_text = font.render("Press SPACE to restart or ESC to return to menu", True, WHITE)
+        screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 50))
+
+@lru_cache(maxsize=None)
+def control_hints(keyboard_players):
+    """Rendered control lines for the players on the keyboard, first player first."""
+    font_small = pygame.font.Font(None, 24)
+    hints = []
+    for seat in range(keyboard_players):
+        names = {name: key_name(key).upper() for name, key in seat_controls(seat, CONTROLS).items()}
+        text = f"P{seat + 1}: {names['left']}/{names['right']} to move, {names['jump']} to jump, {names['boost']} to boost"
+        hints.append(font_small.render(text, True, PLAYER_COLORS[seat]))
+    return tuple(hints)
+
+
+@lru_cache(maxsize=None)
+def momentum_hint():
+    return pygame.font.Font(None, 24).render("Build momentum for super jumps & edge bounces!", True, (0, 255, 255))
+
+
+def spawn_x(seat, num_players):
+    """Where the player in ``seat`` starts, spreading crowds evenly over the ground."""
+    if num_players <= len(SPAWN_X):
+        return SPAWN_X[seat]
+    return int((seat + 0.5) * SCREEN_WIDTH / num_players - PLAYER_SIZE / 2)
+
+
+def platform_width_at(y):
+    """Platforms are widest near the ground and narrow as the level climbs."""
+    height_factor = max(0, GROUND_Y - y) / 1000
+    width_multiplier = 1.8 - height_factor * 0.5
+    return max(80, min(int(PLATFORM_WIDTH * width_multiplier), 180))
+
+
+def generate_chunk(seed, index):
+    """
+    Create the platforms of chunk ``index``, the ``index``-th screen-height band of
+    the level counting up from the ground. The result depends only on ``seed`` and
+    ``index``, so chunks can be made in any order and on any thread.
+
+    Every chunk has ``PLATFORMS_PER_CHUNK`` platforms, one per evenly spaced row.
+    Its top row sits at an anchor position that the next chunk starts from. Each
+    platform is at most ``MAX_PLATFORM_SHIFT`` across from the one below it, and
+    every row stays close enough to that anchor to reach it.
+    """
+    rng = random.Random(f'{seed}:{index}')
+    bottom = GROUND_Y - index * CHUNK_HEIGHT
+    platforms = []
+    if index == 0:
+        # Starting platform - full width to prevent immediate falls
+        platforms.append(Platform(0, GROUND_Y, SCREEN_WIDTH, PLATFORM_HEIGHT))
+        x = None
+    else:
+        x = _anchor_x(seed, index - 1)
+    target_x = _anchor_x(seed, index)
+
+    row_height = CHUNK_HEIGHT // PLATFORMS_PER_CHUNK
+    for row in range(1, PLATFORMS_PER_CHUNK + 1):
+        rows_left = PLATFORMS_PER_CHUNK - row
+        if rows_left == 0:
+            x = target_x
+            y = bottom - CHUNK_HEIGHT
         else:
-            # Try again if position is invalid
-            i -= 1
+            low = max(MIN_PLATFORM_X, target_x - MAX_PLATFORM_SHIFT * rows_left)
+            high = min(MAX_PLATFORM_X, target_x + MAX_PLATFORM_SHIFT * rows_left)
+            if x is not None:
+                low = max(low, x - MAX_PLATFORM_SHIFT)
+                high = min(high, x + MAX_PLATFORM_SHIFT)
+            x = rng.randint(low, high)
+            y = bottom - row * row_height + rng.randint(-5, 5)
+        platform_type = 'cooperative' if rng.random() < 0.15 else 'normal'
+        platforms.append(Platform(x, y, platform_width_at(y), PLATFORM_HEIGHT, platform_type))
+    return platforms
+
+
+def _anchor_x(seed, index):
+    """Where the top platform of chunk ``index`` goes."""
+    return random.Random(f'{seed}:{index}:anchor').randint(MIN_PLATFORM_X, MAX_PLATFORM_X)
+
+
+_executor = None
+_executor_pid = None
+
+
+def _level_executor():
+    # Created lazily and again after a fork, since worker threads do not survive one
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='level')
+        _executor_pid = os.getpid()
+    return _executor
+
+
+class ChunkGenerator:
+    """
+    Generates the chunks of one seeded level on a worker thread, ``lookahead`` chunks
+    ahead of what the game has taken.
+
+    Attributes:
+        seed (int): The level seed.
+        lookahead (int): How many chunks are generated ahead.
+        top (float): The world y of the top of the chunks taken so far.
+    """
+
+    def __init__(self, seed, lookahead=2):
+        self.lookahead = lookahead
+        self._pending = deque()
+        self.reseed(seed)
+
+    def reseed(self, seed):
+        """Start over from the ground with a new level, dropping the chunks queued for the old one."""
+        for future in self._pending:
+            future.cancel()
+        self.seed = seed
+        self.top = GROUND_Y
+        self._pending = deque(_level_executor().submit(generate_chunk, seed, index)
+                              for index in range(self.lookahead))
+        self._submitted = self.lookahead
+
+    def next_chunk(self):
+        """The platforms of the next chunk up, waiting for the worker if it is behind."""
+        platforms = self._pending.popleft().result()
+        self._pending.append(_level_executor().submit(generate_chunk, self.seed, self._submitted))
+        self._submitted += 1
+        self.top -= CHUNK_HEIGHT
+        return platforms
+
+    def extend(self, platforms, view_top):
+        """Append chunks to ``platforms`` until they reach a screen above ``view_top``."""
+        while self.top > view_top - SCREEN_HEIGHT:
+            platforms.extend(self.next_chunk())
 
-def generate_new_platforms(platforms, scroll_offset):
-    # Rolling window approach: maintain platforms within viewable range
-    # Spawn platforms only when needed, based on highest player position
-    
-    # Find the highest platform
-    if not platforms:
-        return
-    
-    highest_platform = min(platforms, key=lambda p: p.y)
-    highest_platform_y = highest_platform.y
-    
-    # Check if we need to spawn more platforms
-    # Spawn when highest platform is less than 200 units above the top of screen
-    # At lower levels, spawn more frequently (20% more density)
-    # At higher levels, spawn even faster to keep up with climbing
-    spawn_threshold = -scroll_offset + 150  # Reduced from 200 for faster spawning
-    
-    # Adjust spawn threshold based on height for dynamic platform density
-    if highest_platform_y > 0:  # Still in lower half
-        spawn_threshold = -scroll_offset + 200  # Spawn earlier at lower levels
-    elif highest_platform_y < -500:  # Higher levels - spawn much faster
-        spawn_threshold = -scroll_offset + 80  # Spawn much earlier at high levels
-    elif highest_platform_y < -200:  # Mid-high levels
-        spawn_threshold = -scroll_offset + 100  # Spawn earlier at mid-high levels
-    
-    if highest_platform_y > spawn_threshold:
-        # Spawn 1-2 platforms at a time to maintain consistent density
-        # Increased chance for 2 platforms for even faster spawning
-        platforms_to_spawn = 2 if random.random() < 0.6 else 1  # 60% chance for 2 platforms
-        
-        for _ in range(platforms_to_spawn):
-            # Use lane-based system for consistent horizontal distribution
-            lanes = [150, 300, 450, 600]  # 4 horizontal lanes
-            target_lane = random.choice(lanes)
-            
-            # Add some randomness to the lane position
-            x = target_lane + random.randint(-30, 30)
-            x = max(50, min(SCREEN_WIDTH - PLATFORM_WIDTH - 50, x))
-            
-            # Vertical spacing based on target density (70 units on average)
-            y_offset = random.randint(60, 80)
-            y = highest_platform_y - y_offset
-            
-            # Calculate platform width based on height (wider at lower levels)
-            # Use absolute height from starting position
-            absolute_height = 500 + y  # Convert to world coordinates
-            height_factor = max(0, absolute_height) / 2000  # 0 to 0.5 based on height
-            width_multiplier = 1.8 - height_factor * 0.5  # 1.8x at bottom (30% wider), 1.3x higher up
-            platform_width = int(PLATFORM_WIDTH * width_multiplier)
-            platform_width = max(80, min(platform_width, 180))  # Clamp between 80 and 180
-            
-            # Check for overlaps with existing platforms
-            valid_position = True
-            for platform in platforms:
-                if (abs(x - platform.x) < platform_width + 20 and 
-                    abs(y - platform.y) < PLATFORM_HEIGHT + 20):
-                    valid_position = False
-                    break
-            
-            if valid_position:
-                platform_type = 'cooperative' if random.random() < 0.15 else 'normal'
-                platforms.append(Platform(x, y, platform_width, PLATFORM_HEIGHT, platform_type))
-                highest_platform_y = y  # Update for next platform
 
 def check_cooperative_platforms(players, platforms, scroll_offset):
     # Check if all players are on cooperative platforms for bonus
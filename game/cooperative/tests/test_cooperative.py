@@ -0,0 +1,82 @@
+from cooperative.src.cooperative import (CHUNK_HEIGHT, GRAVITY, GROUND_Y, JUMP_STRENGTH, MAX_PLATFORM_SHIFT,
+                                         MOVE_SPEED, PLATFORMS_PER_CHUNK, ChunkGenerator, CooperativeSession,
+                                         Platform, Player, generate_chunk)
+from utils.constants import BLUE, GREEN, MAX_PLAYERS, RED
+
+CONTROLS = {'left': 1, 'right': 2, 'jump': 3, 'boost': 4}
+
+
+def _layout(platforms):
+    return [(p.x, p.y, p.width, p.height, p.platform_type) for p in platforms]
+
+
+def test_every_chunk_has_its_platforms_inside_its_band():
+    for seed in range(20):
+        for index in range(5):
+            platforms = generate_chunk(seed, index)
+            # The ground is an extra platform in the first chunk
+            assert len(platforms) == PLATFORMS_PER_CHUNK + (index == 0)
+            bottom = GROUND_Y - index * CHUNK_HEIGHT
+            assert all(bottom - CHUNK_HEIGHT <= p.y <= bottom for p in platforms)
+
+
+def test_neighbouring_platforms_are_within_a_jump():
+    jump_height = JUMP_STRENGTH ** 2 / (2 * GRAVITY)
+    airtime = 2 * -JUMP_STRENGTH / GRAVITY
+    assert MAX_PLATFORM_SHIFT <= MOVE_SPEED * airtime
+    for seed in range(20):
+        platforms = [platform for index in range(6) for platform in generate_chunk(seed, index)]
+        # Climbing order, the ground first; chunk tops must lead into the next chunk too
+        platforms.sort(key=lambda platform: -platform.y)
+        for lower, upper in zip(platforms[1:], platforms[2:]):
+            assert abs(upper.x - lower.x) <= MAX_PLATFORM_SHIFT
+            assert 0 < lower.y - upper.y <= jump_height
+
+
+def test_a_seed_always_gives_the_same_chunks():
+    assert _layout(generate_chunk(7, 3)) == _layout(generate_chunk(7, 3))
+    assert _layout(generate_chunk(7, 3)) != _layout(generate_chunk(8, 3))
+
+    generator = ChunkGenerator(7)
+    first = [_layout(generator.next_chunk()) for _ in range(4)]
+    assert first == [_layout(generate_chunk(7, index)) for index in range(4)]
+
+
+def test_reseeding_starts_a_new_level_from_the_ground():
+    generator = ChunkGenerator(7)
+    generator.next_chunk()
+    generator.reseed(8)
+    assert generator.top == GROUND_Y
+    assert _layout(generator.next_chunk()) == _layout(generate_chunk(8, 0))
+    assert _layout(generator.next_chunk()) == _layout(generate_chunk(8, 1))
+
+
+def test_the_first_three_players_keep_their_colors_among_more_seats():
+    assert [player.color for player in CooperativeSession(3).players] == [BLUE, RED, GREEN]
+    colors = [player.color for player in CooperativeSession(MAX_PLAYERS).players]
+    assert colors[:3] == [BLUE, RED, GREEN] and len(set(colors)) == MAX_PLAYERS
+
+
+def test_a_long_fall_lands_on_the_first_platform_top_crossed():
+    player = Player(100, 0, BLUE, CONTROLS, 1)
+    upper, lower = Platform(80, 100, 100, 20), Platform(80, 140, 100, 20)
+    # Feet from 90 to 190 in one step, further than the player and a platform are tall
+    player.y = 160
+    assert player.y - 60 > player.height + upper.height
+    assert player.find_landing([lower, upper], 100, 60, 0, 0) == 100
+    # Sideways motion is swept too: the player ends over the upper platform, but was
+    # still to the right of it when crossing its top
+    upper.x, upper.width = 0, 60
+    player.x = 50
+    assert player.find_landing([lower, upper], 150, 60, 0, 0) == 140
+
+
+def test_a_fall_lands_on_a_scrolling_platform():
+    player = Player(100, 0, BLUE, CONTROLS, 1)
+    platform = Platform(80, 95, 100, 20)
+    # The platform scrolled down from 95 to 105 while the feet fell from 90 to 120
+    player.y = 90
+    assert player.find_landing([platform], 100, 60, 10, 10) == 105
+    # Feet that only kept pace with the scroll never reached it
+    player.y = 65
+    assert player.find_landing([platform], 100, 55, 10, 10) is None
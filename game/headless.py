@@ -0,0 +1,219 @@
+"""
+Headless, bot-driven runs of the arcade games.
+
+Run from the repository root, for example:
+
+    python game/headless.py soak catcher --players 3 --minutes 60
+    python game/headless.py batch catcher --seeds 500 --param item_spawn_interval=20,30,40
+"""
+import argparse
+import itertools
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+# SDL turns SIGTERM into a quit event, which would keep pool workers from terminating
+os.environ.setdefault('SDL_NO_SIGNAL_HANDLERS', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from common import EventLog, EventType, RandomWalker, RenderTarget, Session, VirtualClock, run_headless, soak
+from utils.constants import FPS, SCREEN_HEIGHT, SCREEN_WIDTH, WINDOW_HEIGHT, WINDOW_WIDTH
+
+GAMES = ['platformer', 'racer', 'jumper', 'catcher', 'cooperative']
+BOTS = ['smart', 'random']
+
+
+def make_session(game: str, num_players=2, bot='smart', seed=None, **params) -> Session:
+    """
+    Create a session of ``game`` with every player controlled by a bot.
+
+    ``bot`` is either ``'smart'`` (the game's scripted strategy) or ``'random'``.
+    Extra keyword arguments are passed on to the session, so tunables such as
+    ``item_spawn_interval`` can be overridden per run.
+    """
+    if seed is not None:
+        random.seed(seed)
+    rng = random.Random(seed)
+
+    if game == 'platformer':
+        from platformer.src.bots import CoinSeeker
+        from platformer.src.platformer import new_game
+        # Simulated time, so timed power-ups and spawns keep pace with frames rather than the wall clock
+        params.setdefault('clock', VirtualClock(FPS))
+        session = new_game(num_players, **params)
+        for player in session.players:
+            session.bots.append(CoinSeeker(player, session, rng) if bot == 'smart' else RandomWalker(player, rng))
+    elif game == 'racer':
+        from racer.bots import TypingBot
+        from racer.racer import RacerGame
+        session = RacerGame(pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)), num_players, **params)
+        for player in session.players:
+            wpm = 60 if bot == 'smart' else rng.randint(20, 120)
+            session.bots.append(TypingBot(player, rng, wpm=wpm))
+    elif game == 'jumper':
+        from jumper.src.bots import FlapBot
+        from jumper.src.jumper import JumperSession
+        session = JumperSession(num_players, **params)
+        for bird in session.birds:
+            session.bots.append(FlapBot(bird, session, rng) if bot == 'smart' else RandomWalker(bird, rng))
+    elif game == 'catcher':
+        from catcher.src.bots import CoinCatcher
+        from catcher.src.catcher import CatcherSession
+        session = CatcherSession(num_players, **params)
+        for player in session.players:
+            session.bots.append(CoinCatcher(player, session, rng) if bot == 'smart'
+                                else RandomWalker(player, rng, jump_chance=0))
+    elif game == 'cooperative':
+        from cooperative.src.cooperative import CooperativeSession
+        session = CooperativeSession(num_players, **params)
+        for player in session.players:
+            session.bots.append(RandomWalker(player, rng, jump_control='jump'))
+    else:
+        raise ValueError(f"Unknown game {game!r}, expected one of {', '.join(GAMES)}")
+    return session
+
+
+def run_soak(args):
+    frames = int(args.minutes * 60 * FPS)
+    screen = RenderTarget.offscreen((SCREEN_WIDTH, SCREEN_HEIGHT)).surface if args.render else None
+    seeds = iter(range(args.seed, sys.maxsize))
+    event_log = EventLog(args.events) if args.events else None
+
+    def new_session():
+        session = make_session(args.game, args.players, args.bot, next(seeds))
+        if event_log is not None:
+            session.event_log = event_log
+            session.log_event(EventType.START)
+        return session
+
+    print(f"{'frame':>9}{'mean ms':>10}{'p99 ms':>10}{'max ms':>10}{'heap KiB':>11}")
+    first = last = None
+    for window in soak(new_session, frames, window=args.window, screen=screen):
+        print(f"{window.frame:>9}{window.mean_ms:>10.3f}{window.p99_ms:>10.3f}{window.max_ms:>10.3f}"
+              f"{window.memory_kb:>11.0f}")
+        first = first or window
+        last = window
+    if event_log is not None:
+        event_log.close()
+
+    frame_creep = last.mean_ms / first.mean_ms if first.mean_ms else 1.0
+    memory_growth = last.memory_kb - first.memory_kb
+    print(f"frame time x{frame_creep:.2f}, heap {memory_growth:+.0f} KiB since the first window")
+    if args.max_memory_growth is not None and memory_growth > args.max_memory_growth:
+        return 1
+    if args.max_frame_creep is not None and frame_creep > args.max_frame_creep:
+        return 1
+    return 0
+
+
+def _parse_param(text):
+    """Parse ``name=v1,v2,...`` into a name and a list of ints or floats."""
+    name, _, values = text.partition('=')
+    if not name or not values:
+        raise argparse.ArgumentTypeError(f"expected name=value[,value...], got {text!r}")
+    parsed = []
+    for value in values.split(','):
+        try:
+            parsed.append(int(value))
+        except ValueError:
+            parsed.append(float(value))
+    return name, parsed
+
+
+def _play(job):
+    """Pool worker: play one session to game over or the frame limit and return its result."""
+    game, num_players, bot, seed, params, frames = job
+    session = run_headless(make_session(game, num_players, bot, seed, **params), frames)
+    return seed, params, session.frame, session.scores()
+
+
+def run_batch(args):
+    names = [name for name, _ in args.param]
+    grid = [dict(zip(names, values)) for values in itertools.product(*(values for _, values in args.param))]
+    jobs = [(args.game, args.players, args.bot, seed, params, args.frames)
+            for params in grid for seed in range(args.seed, args.seed + args.seeds)]
+
+    results = {}
+    columns = None
+    start = time.perf_counter()
+    out = open(args.out, 'w') if args.out else None
+    try:
+        with multiprocessing.Pool(args.workers) as pool:
+            for done, (seed, params, frames, scores) in enumerate(
+                    pool.imap_unordered(_play, jobs, chunksize=args.chunksize), 1):
+                if columns is None:
+                    columns = sorted(scores)
+                    if out:
+                        out.write('\t'.join(['seed', *names, 'frames', *columns]) + '\n')
+                if out:
+                    row = [seed, *(params[name] for name in names), frames, *(scores[c] for c in columns)]
+                    out.write('\t'.join(str(value) for value in row) + '\n')
+                results.setdefault(tuple(params[name] for name in names), []).append(scores)
+                if done % args.progress == 0 or done == len(jobs):
+                    elapsed = time.perf_counter() - start
+                    print(f"{done}/{len(jobs)} sessions, {done / elapsed:.1f} sessions/s", file=sys.stderr)
+            pool.close()
+            pool.join()
+    finally:
+        if out:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    print('\t'.join([*names, 'n', *(f'{c}_mean' for c in columns), *(f'{c}_sd' for c in columns)]))
+    for key in sorted(results):
+        rows = results[key]
+        means = [statistics.fmean(row[c] for row in rows) for c in columns]
+        deviations = [statistics.pstdev(row[c] for row in rows) for c in columns]
+        print('\t'.join(str(v) for v in [*key, len(rows)] + [f'{v:.2f}' for v in means + deviations]))
+    print(f"{len(jobs)} sessions in {elapsed:.1f}s ({len(jobs) / elapsed:.1f} sessions/s)", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    soak_parser = subparsers.add_parser('soak', help='Run bots for a long time and watch frame time and memory.')
+    soak_parser.add_argument('game', choices=GAMES)
+    soak_parser.add_argument('--players', type=int, default=2)
+    soak_parser.add_argument('--bot', choices=BOTS, default='smart')
+    soak_parser.add_argument('--minutes', type=float, default=10, help='Simulated minutes of play.')
+    soak_parser.add_argument('--window', type=int, default=60 * FPS, help='Frames per reported window.')
+    soak_parser.add_argument('--seed', type=int, default=0)
+    soak_parser.add_argument('--render', action='store_true', help='Also draw every frame offscreen.')
+    soak_parser.add_argument('--events', metavar='PATH', help='Append gameplay events to this event log.')
+    soak_parser.add_argument('--max-memory-growth', type=float, metavar='KIB',
+                             help='Exit with status 1 if the heap grows by more than this.')
+    soak_parser.add_argument('--max-frame-creep', type=float, metavar='RATIO',
+                             help='Exit with status 1 if mean frame time grows by more than this factor.')
+
+    batch_parser = subparsers.add_parser('batch', help='Play many sessions across all cores and aggregate scores.')
+    batch_parser.add_argument('game', choices=GAMES)
+    batch_parser.add_argument('--players', type=int, default=2)
+    batch_parser.add_argument('--bot', choices=BOTS, default='smart')
+    batch_parser.add_argument('--seeds', type=int, default=100, help='Sessions per parameter combination.')
+    batch_parser.add_argument('--seed', type=int, default=0, help='First seed.')
+    batch_parser.add_argument('--frames', type=int, default=60 * 60 * FPS, help='Frame limit per session.')
+    batch_parser.add_argument('--param', type=_parse_param, action='append', default=[], metavar='NAME=V1,V2',
+                              help='Session parameter to sweep, e.g. scroll_speed=2,3. Repeat for a grid.')
+    batch_parser.add_argument('--workers', type=int, default=os.cpu_count())
+    batch_parser.add_argument('--chunksize', type=int, default=4)
+    batch_parser.add_argument('--progress', type=int, default=100, help='Report throughput every N sessions.')
+    batch_parser.add_argument('--out', help='Write one tab-separated row per session to this file.')
+
+    args = parser.parse_args(argv)
+    pygame.init()
+    if args.command == 'soak':
+        return run_soak(args)
+    if args.command == 'batch':
+        return run_batch(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
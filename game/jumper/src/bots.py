@@ -0,0 +1,34 @@
+import numpy as np
+
+from common import Bot, RandomWalker
+from jumper.src.jumper import PIPE_GAP, JumperSession
+from utils.constants import SCREEN_HEIGHT
+
+__all__ = ['FlapBot', 'RandomWalker']
+
+
+class FlapBot(Bot):
+    """
+    Flaps whenever the bird drops below the lower part of the next pipe gap.
+
+    Attributes:
+        margin (int): How far above the bottom of the gap the bird tries to stay.
+    """
+
+    def __init__(self, bird, session: JumperSession, rng=None, margin=50):
+        super().__init__(bird, rng)
+        self.session = session
+        self.margin = margin
+
+    def think(self, keys):
+        bird = self.player
+        if not bird.alive or self.previous_keys.mask:
+            return  # Flaps are key presses, so release for a frame in between
+        target_y = SCREEN_HEIGHT // 2
+        # Pipes are kept in the order they spawned, so the first one not behind the bird is the next
+        pipes = self.session.pipes
+        ahead = np.flatnonzero(pipes['x'] + pipes['width'] >= bird.x - bird.size // 2)
+        if ahead.size:
+            target_y = pipes['gap_y'][ahead[0]] + PIPE_GAP - self.margin
+        if bird.y > target_y and bird.velocity >= 0:
+            keys.press(bird.controls['up'])
@@ -0,0 +1,206 @@
+"""
+Reinforcement-learning environments around the jumper's flight and pipe logic.
+
+Both environments follow the Gymnasium conventions: ``reset`` returns
+``(observation, info)`` and ``step`` returns
+``(observation, reward, terminated, truncated, info)``. Power-ups and shared lives
+are left out, an episode ends at the first pipe hit.
+
+Observations are float32 vectors of ``OBSERVATION_SIZE``:
+
+    0. bird height, 0 at the top of the screen and 1 at the bottom
+    1. bird vertical velocity, divided by 10
+    2. horizontal distance from the bird to the next pipe, divided by the screen width
+    3. top of the next gap, divided by the screen height
+    4. bottom of the next gap, divided by the screen height
+
+The action is 1 to flap and 0 to do nothing.
+"""
+import random
+
+import numpy as np
+
+from jumper.src.jumper import (Bird, Pipe, BIRD_SIZE, GRAVITY, JUMP_STRENGTH, PIPE_GAP, PIPE_SPAWN_INTERVAL, PIPE_SPEED,
+                               PIPE_WIDTH)
+from utils.constants import SCREEN_HEIGHT, SCREEN_WIDTH, RED, PLAYERS
+
+OBSERVATION_SIZE = 5
+ALIVE_REWARD = 0.1
+PIPE_REWARD = 1.0
+CRASH_REWARD = -1.0
+
+BIRD_X = SCREEN_WIDTH // 4
+# A pipe is on screen for (SCREEN_WIDTH + PIPE_WIDTH) / PIPE_SPEED frames
+MAX_PIPES = (SCREEN_WIDTH + PIPE_WIDTH) // (PIPE_SPEED * (PIPE_SPAWN_INTERVAL + 1)) + 1
+
+
+class JumperEnv:
+    """A single bird, stepped one frame per ``step`` using the game's own Bird and Pipe classes."""
+
+    def __init__(self, max_steps=None):
+        self.max_steps = max_steps
+        self.rng = random.Random()
+        self.bird = None
+        self.pipes = []
+        self.pipe_timer = 0
+        self.steps = 0
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        self.bird = Bird(BIRD_X, SCREEN_HEIGHT // 2, RED, list(PLAYERS.values())[0])
+        self.pipes = []
+        self.pipe_timer = 0
+        self.steps = 0
+        return self._observation(), {}
+
+    def step(self, action):
+        bird = self.bird
+        if action:
+            bird.jump()
+        bird.update()
+
+        self.pipe_timer += 1
+        if self.pipe_timer > PIPE_SPAWN_INTERVAL:
+            self.pipes.append(Pipe(SCREEN_WIDTH, self.rng))
+            self.pipe_timer = 0
+
+        reward = ALIVE_REWARD
+        terminated = False
+        for pipe in self.pipes:
+            pipe.update()
+            if pipe.collides_with(bird):
+                terminated = True
+            if not pipe.passed and pipe.x + pipe.width < BIRD_X:
+                pipe.passed = True
+                reward += PIPE_REWARD
+        self.pipes = [pipe for pipe in self.pipes if pipe.x + pipe.width >= 0]
+
+        if terminated:
+            reward = CRASH_REWARD
+        self.steps += 1
+        truncated = self.max_steps is not None and self.steps >= self.max_steps
+        return self._observation(), reward, terminated, truncated, {}
+
+    def _observation(self):
+        bird = self.bird
+        next_x, gap_y = SCREEN_WIDTH, (SCREEN_HEIGHT - PIPE_GAP) / 2
+        for pipe in self.pipes:
+            if pipe.x + pipe.width >= bird.x - bird.size // 2:
+                next_x, gap_y = pipe.x, pipe.gap_y
+                break
+        return np.array([bird.y / SCREEN_HEIGHT,
+                         bird.velocity / 10,
+                         (next_x - bird.x) / SCREEN_WIDTH,
+                         gap_y / SCREEN_HEIGHT,
+                         (gap_y + PIPE_GAP) / SCREEN_HEIGHT], dtype=np.float32)
+
+
+class VectorJumperEnv:
+    """
+    ``num_envs`` independent birds, each state held in NumPy arrays and stepped with
+    array operations instead of objects. Nothing is drawn.
+
+    Environments that end are reset on the spot, so the returned observation is
+    already the first one of the next episode.
+
+    Attributes:
+        num_envs (int): The number of environments stepped together.
+    """
+
+    def __init__(self, num_envs, max_steps=None):
+        self.num_envs = num_envs
+        self.max_steps = max_steps
+        self.rng = np.random.default_rng()
+        self.bird_y = np.zeros(num_envs)
+        self.bird_velocity = np.zeros(num_envs)
+        # Pipes live in a fixed number of slots per environment, inactive slots sit far to the right
+        self.pipe_x = np.zeros((num_envs, MAX_PIPES))
+        self.pipe_gap_y = np.zeros((num_envs, MAX_PIPES))
+        self.pipe_passed = np.zeros((num_envs, MAX_PIPES), dtype=bool)
+        self.next_slot = np.zeros(num_envs, dtype=np.intp)
+        self.pipe_timer = np.zeros(num_envs, dtype=np.intp)
+        self.steps = np.zeros(num_envs, dtype=np.intp)
+        self._rows = np.arange(num_envs)
+        self._observations = np.zeros((num_envs, OBSERVATION_SIZE), dtype=np.float32)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset(np.ones(self.num_envs, dtype=bool))
+        return self._observation(), {}
+
+    def _reset(self, mask):
+        self.bird_y[mask] = SCREEN_HEIGHT // 2
+        self.bird_velocity[mask] = 0
+        self.pipe_x[mask] = np.inf
+        self.pipe_passed[mask] = True
+        self.next_slot[mask] = 0
+        self.pipe_timer[mask] = 0
+        self.steps[mask] = 0
+
+    def step(self, actions):
+        y = self.bird_y
+        velocity = self.bird_velocity
+        pipe_x = self.pipe_x
+
+        # Bird.jump and Bird.update
+        velocity[np.asarray(actions, dtype=bool)] = JUMP_STRENGTH
+        velocity += GRAVITY
+        y += velocity
+        clamped = (y < 0) | (y > SCREEN_HEIGHT - BIRD_SIZE)
+        np.clip(y, 0, SCREEN_HEIGHT - BIRD_SIZE, out=y)
+        velocity[clamped] = 0
+
+        # Spawn pipes into the next slot of each environment that is due one
+        self.pipe_timer += 1
+        spawning = np.flatnonzero(self.pipe_timer > PIPE_SPAWN_INTERVAL)
+        if spawning.size:
+            slots = self.next_slot[spawning]
+            pipe_x[spawning, slots] = SCREEN_WIDTH
+            self.pipe_gap_y[spawning, slots] = self.rng.integers(100, SCREEN_HEIGHT - 100 - PIPE_GAP,
+                                                                 size=spawning.size, endpoint=True)
+            self.pipe_passed[spawning, slots] = False
+            self.next_slot[spawning] = (slots + 1) % MAX_PIPES
+            self.pipe_timer[spawning] = 0
+
+        # Pipe.update and Pipe.collides_with
+        pipe_x -= PIPE_SPEED
+        bird_top = np.trunc(y - BIRD_SIZE // 2)[:, None]
+        bird_bottom = bird_top + BIRD_SIZE
+        overlapping = (BIRD_X - BIRD_SIZE // 2 < pipe_x + PIPE_WIDTH) & (BIRD_X + BIRD_SIZE // 2 > pipe_x)
+        in_pipe = (bird_top < self.pipe_gap_y) | (bird_bottom > self.pipe_gap_y + PIPE_GAP)
+        terminated = (overlapping & in_pipe).any(axis=1)
+
+        passed = ~self.pipe_passed & (pipe_x + PIPE_WIDTH < BIRD_X)
+        self.pipe_passed |= passed
+        rewards = ALIVE_REWARD + PIPE_REWARD * passed.sum(axis=1)
+        rewards[terminated] = CRASH_REWARD
+
+        self.steps += 1
+        if self.max_steps is not None:
+            truncated = self.steps >= self.max_steps
+        else:
+            truncated = np.zeros(self.num_envs, dtype=bool)
+        done = terminated | truncated
+        if done.any():
+            self._reset(done)
+        return self._observation(), rewards, terminated, truncated, {}
+
+    def _observation(self):
+        # The next pipe is the nearest one whose right edge has not passed the bird's left edge
+        ahead = np.where(self.pipe_x + PIPE_WIDTH >= BIRD_X - BIRD_SIZE // 2, self.pipe_x, np.inf)
+        nearest = ahead.argmin(axis=1)
+        next_x = ahead[self._rows, nearest]
+        gap_y = self.pipe_gap_y[self._rows, nearest]
+        no_pipe = np.isinf(next_x)
+        next_x[no_pipe] = SCREEN_WIDTH
+        gap_y[no_pipe] = (SCREEN_HEIGHT - PIPE_GAP) / 2
+
+        observations = self._observations
+        observations[:, 0] = self.bird_y / SCREEN_HEIGHT
+        observations[:, 1] = self.bird_velocity / 10
+        observations[:, 2] = (next_x - BIRD_X) / SCREEN_WIDTH
+        observations[:, 3] = gap_y / SCREEN_HEIGHT
+        observations[:, 4] = (gap_y + PIPE_GAP) / SCREEN_HEIGHT
+        return observations.copy()
@@ -1,18 +1,82 @@
+import numpy as np
 import pygame
-import sys
 import random
-from utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, RED, BLUE, GRAY, YELLOW, GREEN, PLAYERS
+from functools import lru_cache
+from utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, RED, BLUE, GRAY, YELLOW, GREEN, ORANGE, PLAYERS, \
+    RENDER_FPS, TICK_RATE
+from common import (Entity, EventType, MotionHistory, Player, Quality, Session, World, display_canvas, move, outside,
+                    overlapping, run_interactive, sprite_blits)
 
-class Bird:
-    def __init__(self, x, y, color, controls):
-        self.x = x
-        self.y = y
+BIRD_SIZE = 30
+GRAVITY = 0.5
+JUMP_STRENGTH = -8
+PIPE_SPAWN_INTERVAL = 90  # frames between pipes
+PIPE_WIDTH = 80
+PIPE_GAP = 200
+PIPE_SPEED = 3
+POWERUP_TYPES = ("extra_life", "invincibility")  # Stored by index in the power-ups' kind field
+POWERUP_SIZE = 25
+POWERUP_SPEED = 3
+SHIELD_GAP = 5  # How far the invincibility shield rings a bird
+
+
+@lru_cache(maxsize=None)
+def small_font():
+    """The font for control hints, loaded once since loading looks the font file up again."""
+    return pygame.font.Font(None, 24)
+
+
+@lru_cache(maxsize=None)
+def bird_sprite(color, size, quality, shielded) -> pygame.Surface:
+    """A bird drawn once per look, centered in a surface with room for the shield."""
+    extent = size // 2 + SHIELD_GAP
+    surface = pygame.Surface((extent * 2, extent * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surface, color, (extent, extent), size // 2)
+    # Draw eye
+    if quality == Quality.HIGH:
+        pygame.draw.circle(surface, WHITE, (extent + 5, extent - 5), 3)
+    # Draw invincibility shield
+    if shielded:
+        pygame.draw.circle(surface, YELLOW, (extent, extent), size // 2 + SHIELD_GAP, 2)
+    return surface
+
+
+@lru_cache(maxsize=None)
+def powerup_sprite(powerup_type, size, quality) -> pygame.Surface:
+    """A power-up drawn once per type, centered in a surface twice its size."""
+    surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+    x = y = size
+    if powerup_type == "extra_life" and quality == Quality.LOW:
+        pygame.draw.circle(surface, RED, (x, y), size // 2)
+    elif powerup_type == "extra_life":
+        # Draw heart shape for extra life
+        pygame.draw.circle(surface, RED, (x - 5, y), 8)
+        pygame.draw.circle(surface, RED, (x + 5, y), 8)
+        pygame.draw.polygon(surface, RED, [(x - 12, y - 2), (x, y + 12), (x + 12, y - 2)])
+    elif powerup_type == "invincibility":
+        # Draw shield shape for invincibility
+        pygame.draw.circle(surface, YELLOW, (x, y), size // 2, 3)
+        if quality == Quality.HIGH:
+            pygame.draw.circle(surface, YELLOW, (x, y), 5)
+    return surface
+
+
+@lru_cache(maxsize=None)
+def pipe_sprite(width, height) -> pygame.Surface:
+    """A full-height pipe, blitted in two parts around the gap."""
+    surface = pygame.Surface((width, height))
+    surface.fill(GREEN)
+    return surface
+
+class Bird(Player):
+    """A flapping player. Unlike most entities, ``x`` and ``y`` are the center of the bird."""
+    __slots__ = ('velocity', 'gravity', 'jump_strength', 'alive')
+
+    def __init__(self, x, y, color, controls, player_id=0):
+        super().__init__(x, y, BIRD_SIZE, BIRD_SIZE, color, controls, player_id)
         self.velocity = 0
-        self.color = color
-        self.controls = controls
-        self.size = 30
-        self.gravity = 0.5
-        self.jump_strength = -8
+        self.gravity = GRAVITY
+        self.jump_strength = JUMP_STRENGTH
         self.alive = True
         
     def update(self):
@@ -32,289 +96,301 @@ class Bird:
         if self.alive:
             self.velocity = self.jump_strength
             
-    def draw(self, screen, invincibility_timer=0):
-        if self.alive:
-            # Flash during invincibility
-            if invincibility_timer > 0 and invincibility_timer % 10 < 5:
-                return  # Skip drawing every few frames for flashing effect
-            
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size // 2)
-            # Draw eye
-            pygame.draw.circle(screen, WHITE, (int(self.x + 5), int(self.y - 5)), 3)
-            
-            # Draw invincibility shield
-            if invincibility_timer > 0:
-                pygame.draw.circle(screen, YELLOW, (int(self.x), int(self.y)), self.size // 2 + 5, 2)
-
-class PowerUp:
-    def __init__(self, x, y, powerup_type):
-        self.x = x
-        self.y = y
-        self.type = powerup_type  # "extra_life" or "invincibility"
-        self.size = 25
-        self.speed = 3
-        self.collected = False
-        
-    def update(self):
-        self.x -= self.speed
-        
-    def draw(self, screen):
-        if not self.collected:
-            if self.type == "extra_life":
-                # Draw heart shape for extra life
-                pygame.draw.circle(screen, RED, (int(self.x - 5), int(self.y)), 8)
-                pygame.draw.circle(screen, RED, (int(self.x + 5), int(self.y)), 8)
-                pygame.draw.polygon(screen, RED, [
-                    (int(self.x - 12), int(self.y - 2)),
-                    (int(self.x), int(self.y + 12)),
-                    (int(self.x + 12), int(self.y - 2))
-                ])
-            elif self.type == "invincibility":
-                # Draw shield shape for invincibility
-                pygame.draw.circle(screen, YELLOW, (int(self.x), int(self.y)), self.size // 2, 3)
-                pygame.draw.circle(screen, YELLOW, (int(self.x), int(self.y)), 5)
-                
-    def collides_with(self, bird):
-        if self.collected or not bird.alive:
-            return False
-            
-        bird_rect = pygame.Rect(bird.x - bird.size // 2, bird.y - bird.size // 2, bird.size, bird.size)
-        powerup_rect = pygame.Rect(self.x - self.size // 2, self.y - self.size // 2, self.size, self.size)
-        
-        return bird_rect.colliderect(powerup_rect)
-
-class Pipe:
-    def __init__(self, x):
-        self.x = x
-        self.width = 80
-        self.gap = 200
-        self.gap_y = random.randint(100, SCREEN_HEIGHT - 100 - self.gap)
-        self.speed = 3
+    def sprite(self, invincibility_timer=0, quality=Quality.HIGH):
+        """The ``(surface, position)`` to blit for this bird, or ``None`` when it is not drawn."""
+        if not self.alive:
+            return None
+        # Flash during invincibility
+        if invincibility_timer > 0 and invincibility_timer % 10 < 5:
+            return None  # Skip drawing every few frames for flashing effect
+        extent = self.size // 2 + SHIELD_GAP
+        surface = bird_sprite(self.color, self.size, quality, invincibility_timer > 0)
+        return surface, (int(self.x) - extent, int(self.y) - extent)
+
+    def draw(self, screen, invincibility_timer=0, quality=Quality.HIGH):
+        sprite = self.sprite(invincibility_timer, quality)
+        if sprite is not None:
+            screen.blit(*sprite)
+
+    @property
+    def size(self):
+        return self.width
+
+    @property
+    def rect(self):
+        return pygame.Rect(self.x - self.size // 2, self.y - self.size // 2, self.size, self.size)
+
+class Pipe(Entity):
+    """A single pipe, as ``JumperEnv`` steps it. Sessions keep their pipes in a ``World`` instead."""
+    __slots__ = ('gap', 'gap_y', 'speed', 'passed')
+
+    def __init__(self, x, rng=random):
+        super().__init__(x, 0, PIPE_WIDTH, SCREEN_HEIGHT)
+        self.gap = PIPE_GAP
+        self.gap_y = rng.randint(100, SCREEN_HEIGHT - 100 - self.gap)
+        self.speed = PIPE_SPEED
         self.passed = False
         
     def update(self):
         self.x -= self.speed
         
-    def draw(self, screen):
-        # Draw top pipe
-        pygame.draw.rect(screen, GREEN, (self.x, 0, self.width, self.gap_y))
-        # Draw bottom pipe
-        pygame.draw.rect(screen, GREEN, (self.x, self.gap_y + self.gap, self.width, SCREEN_HEIGHT - self.gap_y - self.gap))
-        
     def collides_with(self, bird):
         if not bird.alive:
             return False
             
-        bird_rect = pygame.Rect(bird.x - bird.size // 2, bird.y - bird.size // 2, bird.size, bird.size)
+        bird_rect = bird.rect
         top_pipe_rect = pygame.Rect(self.x, 0, self.width, self.gap_y)
         bottom_pipe_rect = pygame.Rect(self.x, self.gap_y + self.gap, self.width, SCREEN_HEIGHT - self.gap_y - self.gap)
         
         return bird_rect.colliderect(top_pipe_rect) or bird_rect.colliderect(bottom_pipe_rect)
 
-def floppy_bird_game(screen, num_players=2):
-    clock = pygame.time.Clock()
-    font = pygame.font.Font(None, 36)
-    
-    # Initialize birds
-    birds = []
-    colors = [RED, BLUE, GRAY]
-    start_x = SCREEN_WIDTH // 4
-    
-    for i in range(num_players):
-        y_pos = SCREEN_HEIGHT // 2 + (i - num_players // 2) * 60
-        bird = Bird(start_x, y_pos, colors[i], list(PLAYERS.values())[i])
-        birds.append(bird)
-    
-    pipes = []
-    powerups = []
-    pipe_timer = 0
-    score = 0
-    game_over = False
-    shared_lives = 3
-    max_lives = 6
-    invincibility_timer = 0
-    powerup_spawn_counter = 0
-    collection_message = ""
-    collection_message_timer = 0
-    
-    running = True
-    while running:
-        dt = clock.tick(60)
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.KEYDOWN and not game_over:
-                if event.key == pygame.K_ESCAPE:
-                    return
-                for bird in birds:
-                    if event.key == bird.controls['up']:
-                        bird.jump()
-            elif event.type == pygame.KEYDOWN and game_over:
-                if event.key == pygame.K_SPACE:
-                    return floppy_bird_game(screen, num_players)
-                elif event.key == pygame.K_ESCAPE:
-                    return
-        
-        if not game_over:
-            # Update cooldowns and timers
-            if invincibility_timer > 0:
-                invincibility_timer -= 1
-            if collection_message_timer > 0:
-                collection_message_timer -= 1
-            
-            # Update birds
+
+def spawn_pipe(pipes: World, x=SCREEN_WIDTH, rng=random):
+    """Add a pipe at ``x`` with its gap at a random height."""
+    gap_y = rng.randint(100, SCREEN_HEIGHT - 100 - PIPE_GAP)
+    pipes.spawn(x=x, vx=-PIPE_SPEED, width=PIPE_WIDTH, height=SCREEN_HEIGHT, gap_y=gap_y)
+
+
+def spawn_powerup(powerups: World, x, y, powerup_type):
+    """Add a ``powerup_type`` power-up centered on ``(x, y)``."""
+    half = POWERUP_SIZE // 2
+    powerups.spawn(x=x - half, y=y - half, vx=-POWERUP_SPEED, width=POWERUP_SIZE, height=POWERUP_SIZE,
+                   kind=POWERUP_TYPES.index(powerup_type))
+
+
+def pipe_hits(pipes: World, rect: pygame.Rect):
+    """Which pipes ``rect`` overlaps the top or bottom part of, by the rules of ``pygame.Rect.colliderect``."""
+    x, gap_y = pipes['x'], pipes['gap_y']
+    return (x < rect.right) & (x + pipes['width'] > rect.left) & ((rect.top < gap_y) | (rect.bottom > gap_y + PIPE_GAP))
+
+
+def pipe_blits(pipes: World, amount=1):
+    """The ``(surface, position, area)`` blits for the top and bottom part of every pipe."""
+    surface = pipe_sprite(PIPE_WIDTH, SCREEN_HEIGHT)
+    x, _ = pipes.blended(amount)
+    blits = []
+    for left, gap_y in zip(x.astype(np.intp).tolist(), pipes['gap_y'].astype(np.intp).tolist()):
+        bottom = gap_y + PIPE_GAP
+        blits.append((surface, (left, 0), (0, 0, PIPE_WIDTH, gap_y)))
+        blits.append((surface, (left, bottom), (0, 0, PIPE_WIDTH, SCREEN_HEIGHT - bottom)))
+    return blits
+
+class JumperSession(Session):
+    game_name = 'jumper'
+
+    def __init__(self, num_players=2, pipe_spawn_interval=PIPE_SPAWN_INTERVAL):
+        super().__init__()
+        self.font = None
+
+        # Initialize birds
+        self.birds = []
+        colors = [RED, BLUE, GRAY]
+        self.start_x = SCREEN_WIDTH // 4
+
+        for i in range(num_players):
+            y_pos = SCREEN_HEIGHT // 2 + (i - num_players // 2) * 60
+            bird = Bird(self.start_x, y_pos, colors[i], list(PLAYERS.values())[i], i + 1)
+            self.birds.append(bird)
+        self.birds_by_key = {bird.controls['up']: bird for bird in self.birds}
+
+        # Pipes and power-ups are stepped as arrays, birds are few and each has its own controls
+        self.pipes = World(gap_y=np.float64, passed=bool)
+        self.powerups = World()
+        self.motion = MotionHistory()  # Where the birds were before the last step, for drawing between steps
+        self.pipe_timer = 0
+        self.pipe_spawn_interval = pipe_spawn_interval
+        self.score = 0
+        self.game_over = False
+        self.shared_lives = 3
+        self.max_lives = 6
+        self._invincibility = None  # Timer ending the shared invincibility
+        self.powerup_spawn_counter = 0
+        self.collection_message = ""
+        self._collection_message = None  # Timer ending the collection message
+
+    @property
+    def invincibility_timer(self):
+        """Frames of invincibility left. Setting it restarts the countdown."""
+        return self.timers.remaining(self._invincibility)
+
+    @invincibility_timer.setter
+    def invincibility_timer(self, frames):
+        self.timers.cancel(self._invincibility)
+        self._invincibility = self.timers.schedule(frames) if frames > 0 else None
+
+    @property
+    def collection_message_timer(self):
+        """Frames the collection message stays up for. Setting it restarts the countdown."""
+        return self.timers.remaining(self._collection_message)
+
+    @collection_message_timer.setter
+    def collection_message_timer(self, frames):
+        self.timers.cancel(self._collection_message)
+        self._collection_message = self.timers.schedule(frames) if frames > 0 else None
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and not self.game_over:
+            bird = self.birds_by_key.get(event.key)
+            if bird is not None:
+                bird.jump()
+
+    def step(self):
+        birds = self.birds
+        pipes = self.pipes
+        powerups = self.powerups
+        start_x = self.start_x
+        self.motion.record(birds)
+        pipes.record()
+        powerups.record()
+
+        # Update birds
+        for bird in birds:
+            bird.update()
+
+        # Generate pipes
+        self.pipe_timer += 1
+        if self.pipe_timer > self.pipe_spawn_interval:  # Generate pipe every 1.5 seconds at 60 FPS
+            spawn_pipe(pipes)
+            self.pipe_timer = 0
+
+            # Increment powerup counter when spawning pipes
+            self.powerup_spawn_counter += 1
+            if self.powerup_spawn_counter >= 5:  # Every 5 pipes, spawn a powerup
+                self.powerup_spawn_counter = 0
+                if len(pipes) >= 2:
+                    # Calculate midpoint between the last two pipes
+                    powerup_x = int(pipes['x'][-2:].sum()) // 2
+
+                    # Spawn powerup in safe area (middle of screen, no pipes above/below)
+                    powerup_y = SCREEN_HEIGHT // 2  # Center of screen is always safe
+                    powerup_type = random.choice(POWERUP_TYPES)
+                    spawn_powerup(powerups, powerup_x, powerup_y, powerup_type)
+
+        # Update powerups
+        move(powerups)
+
+        # Check powerup collisions
+        collected = np.zeros(len(powerups), dtype=bool)
+        for bird in birds:
+            if bird.alive:
+                collected |= overlapping(powerups, *bird.rect)
+        for kind in powerups['kind'][collected].tolist():
+            if POWERUP_TYPES[kind] == "extra_life":
+                if self.shared_lives < self.max_lives:
+                    self.shared_lives += 1
+                    self.collection_message = "EXTRA LIFE!"
+                    self.collection_message_timer = 120
+                else:
+                    self.collection_message = "MAX LIVES!"
+                    self.collection_message_timer = 60
+            else:
+                self.invincibility_timer += 180  # Add 3 seconds at 60 FPS
+                self.collection_message = "INVINCIBILITY!"
+                self.collection_message_timer = 120
+
+        # Remove collected and off-screen powerups
+        powerups_to_remove = collected | outside(powerups, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+        # Update pipes, and remove those that are off-screen
+        move(pipes)
+        pipes_to_remove = outside(pipes, 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+        # Check collisions (only if not invincible)
+        if self.invincibility_timer == 0:
             for bird in birds:
-                bird.update()
-            
-            # Generate pipes
-            pipe_timer += 1
-            if pipe_timer > 90:  # Generate pipe every 1.5 seconds at 60 FPS
-                pipes.append(Pipe(SCREEN_WIDTH))
-                pipe_timer = 0
-                
-                # Increment powerup counter when spawning pipes
-                powerup_spawn_counter += 1
-                if powerup_spawn_counter >= 5:  # Every 5 pipes, spawn a powerup
-                    powerup_spawn_counter = 0
-                    if len(pipes) >= 2:
-                        # Calculate midpoint between the last two pipes
-                        last_pipe = pipes[-1]
-                        second_last_pipe = pipes[-2]
-                        powerup_x = (last_pipe.x + second_last_pipe.x) // 2
-                        
-                        # Spawn powerup in safe area (middle of screen, no pipes above/below)
-                        powerup_y = SCREEN_HEIGHT // 2  # Center of screen is always safe
-                        powerup_type = random.choice(["extra_life", "invincibility"])
-                        powerups.append(PowerUp(powerup_x, powerup_y, powerup_type))
-            
-            # Update pipes and powerups
-            pipes_to_remove = []
-            powerups_to_remove = []
-            
-            # Update powerups
-            for powerup in powerups:
-                powerup.update()
-                
-                # Check powerup collisions
-                for bird in birds:
-                    if powerup.collides_with(bird):
-                        powerup.collected = True
-                        if powerup.type == "extra_life":
-                            if shared_lives < max_lives:
-                                shared_lives += 1
-                                collection_message = "EXTRA LIFE!"
-                                collection_message_timer = 120
-                            else:
-                                collection_message = "MAX LIVES!"
-                                collection_message_timer = 60
-                        elif powerup.type == "invincibility":
-                            invincibility_timer += 180  # Add 3 seconds at 60 FPS
-                            collection_message = "INVINCIBILITY!"
-                            collection_message_timer = 120
-                        powerups_to_remove.append(powerup)
-                        break
-                
-                # Remove off-screen powerups
-                if powerup.x + powerup.size < 0:
-                    powerups_to_remove.append(powerup)
-            
-            for pipe in pipes:
-                pipe.update()
-                
-                # Check collisions (only if not invincible)
-                if invincibility_timer == 0:
-                    collision_occurred = False
-                    for bird in birds:
-                        if pipe.collides_with(bird):
-                            shared_lives -= 1
-                            invincibility_timer = 90  # 1.5 seconds of invincibility
-                            collision_occurred = True
-                            if shared_lives <= 0:
-                                game_over = True
-                            else:
-                                # Reset bird positions and mark pipes for removal
-                                for i, b in enumerate(birds):
-                                    b.y = SCREEN_HEIGHT // 2 + (i - len(birds) // 2) * 60
-                                    b.velocity = 0
-                            break
-                    
-                    if collision_occurred:
-                        # Clear pipes that are too close to the starting position
-                        pipes_to_remove = [pipe for pipe in pipes if pipe.x <= start_x + 100]
-                        # Clear powerups that are too close to the starting position
-                        powerups_to_remove.extend([powerup for powerup in powerups if powerup.x <= start_x + 100])
-                        break
-                
-                # Check if pipe passed birds
-                if not pipe.passed and pipe.x + pipe.width < start_x:
-                    pipe.passed = True
-                    score += 1
-                
-                # Mark off-screen pipes for removal
-                if pipe.x + pipe.width < 0:
-                    pipes_to_remove.append(pipe)
-            
-            # Remove marked pipes and powerups
-            for pipe in pipes_to_remove:
-                if pipe in pipes:
-                    pipes.remove(pipe)
-            for powerup in powerups_to_remove:
-                if powerup in powerups:
-                    powerups.remove(powerup)
-        
-        # Draw everything
+                if bird.alive and pipe_hits(pipes, bird.rect).any():
+                    self.log_event(EventType.DEATH, bird.player_id, bird.x, bird.y)
+                    self.shared_lives -= 1
+                    self.invincibility_timer = 90  # 1.5 seconds of invincibility
+                    if self.shared_lives <= 0:
+                        self.game_over = True
+                    else:
+                        # Reset bird positions and mark pipes for removal
+                        for i, b in enumerate(birds):
+                            b.y = SCREEN_HEIGHT // 2 + (i - len(birds) // 2) * 60
+                            b.velocity = 0
+                        self.motion.settle(birds)
+
+                    # Clear pipes and powerups that are too close to the starting position
+                    pipes_to_remove |= pipes['x'] <= start_x + 100
+                    powerups_to_remove |= powerups['x'] + POWERUP_SIZE // 2 <= start_x + 100
+                    break
+
+        # Check if pipes passed birds
+        passed = ~pipes['passed'] & (pipes['x'] + pipes['width'] < start_x)
+        pipes['passed'] |= passed
+        self.score += int(passed.sum())
+
+        # Remove marked pipes and powerups
+        pipes.remove(pipes_to_remove)
+        powerups.remove(powerups_to_remove)
+
+    def scores(self):
+        return {'score': self.score, 'lives': self.shared_lives}
+
+    def record(self, leaderboard):
+        leaderboard.submit(self.game_name, len(self.birds), self.score)
+
+    def draw(self, screen):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 36)
+        font = self.font
+
         screen.fill((135, 206, 235))  # Sky blue
-        
-        # Draw pipes
-        for pipe in pipes:
-            pipe.draw(screen)
-            
-        # Draw powerups
-        for powerup in powerups:
-            powerup.draw(screen)
-        
-        # Draw birds
-        for bird in birds:
-            bird.draw(screen, invincibility_timer)
-        
+
+        # Moving things are drawn part of the way from where they were before the last step
+        # Each layer is one batch of blits from sprites drawn once
+        amount = self.interpolation
+        quality = self.quality
+        screen.blits(pipe_blits(self.pipes, amount), doreturn=False)
+        offset = POWERUP_SIZE // 2 - POWERUP_SIZE  # The sprites have room around the power-up
+
+        def powerup(kind):
+            return powerup_sprite(POWERUP_TYPES[kind], POWERUP_SIZE, quality)
+
+        screen.blits(sprite_blits(self.powerups, powerup, (offset, offset), amount), doreturn=False)
+        with self.motion.blend(self.birds, amount):
+            sprites = [bird.sprite(self.invincibility_timer, quality) for bird in self.birds]
+            screen.blits([sprite for sprite in sprites if sprite is not None], doreturn=False)
+
         # Draw UI
-        score_text = font.render(f"Score: {score}", True, WHITE)
+        score_text = font.render(f"Score: {self.score}", True, WHITE)
         screen.blit(score_text, (10, 10))
-        
-        lives_text = font.render(f"Lives: {shared_lives}", True, WHITE if shared_lives > 1 else RED)
+
+        lives_text = font.render(f"Lives: {self.shared_lives}", True, WHITE if self.shared_lives > 1 else RED)
         screen.blit(lives_text, (10, 50))
-        
+
         # Draw player controls
-        controls_y = 100
-        for i, bird in enumerate(birds):
-            control_text = pygame.font.Font(None, 24).render(
-                f"Player {i+1}: {pygame.key.name(bird.controls['up']).upper()}", 
-                True, bird.color
-            )
-            screen.blit(control_text, (10, controls_y + i * 25))
-        
+        if self.quality > Quality.LOW:
+            controls_y = 100
+            for i, bird in enumerate(self.birds):
+                control_text = small_font().render(
+                    f"Player {i+1}: {pygame.key.name(bird.controls['up']).upper()}", 
+                    True, bird.color
+                )
+                screen.blit(control_text, (10, controls_y + i * 25))
+
         # Draw collection message
-        if collection_message_timer > 0:
+        if self.collection_message_timer > 0:
             message_font = pygame.font.Font(None, 48)
-            message_color = RED if "EXTRA LIFE" in collection_message else YELLOW if "INVINCIBILITY" in collection_message else ORANGE
-            message_text = message_font.render(collection_message, True, message_color)
+            message_color = RED if "EXTRA LIFE" in self.collection_message else YELLOW if "INVINCIBILITY" in self.collection_message else ORANGE
+            message_text = message_font.render(self.collection_message, True, message_color)
             screen.blit(message_text, (SCREEN_WIDTH // 2 - message_text.get_width() // 2, SCREEN_HEIGHT // 3))
-        
-        if game_over:
+
+        if self.game_over:
             game_over_text = font.render("GAME OVER!", True, RED)
             screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 2 - 50))
-            
-            final_score_text = font.render(f"Final Score: {score}", True, WHITE)
+
+            final_score_text = font.render(f"Final Score: {self.score}", True, WHITE)
             screen.blit(final_score_text, (SCREEN_WIDTH // 2 - final_score_text.get_width() // 2, SCREEN_HEIGHT // 2))
-            
+
             restart_text = font.render("Press SPACE to restart or ESC to return to menu", True, WHITE)
             screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 50))
-        
-        pygame.display.flip()
-    
-    return
+
+
+def floppy_bird_game(screen, num_players=2):
+    with display_canvas(screen) as target:
+        run_interactive(target, lambda: JumperSession(num_players), RENDER_FPS, tick_rate=TICK_RATE)
 
 def jumper_game(screen, num_players=2):
     floppy_bird_game(screen, num_players)
@@ -0,0 +1,104 @@
+import random
+
+import numpy as np
+import pygame
+
+from common import EventLog, EventType, read_events
+from jumper.src.env import OBSERVATION_SIZE, JumperEnv, VectorJumperEnv
+from jumper.src.jumper import (JumperSession, bird_sprite, pipe_sprite, powerup_sprite, spawn_pipe,
+                               spawn_powerup)
+from utils.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+
+
+class FixedGaps:
+    """Stands in for both random.Random and numpy's Generator, always returning the same gap."""
+
+    def __init__(self, gap_y):
+        self.gap_y = gap_y
+
+    def randint(self, low, high):
+        return self.gap_y
+
+    def integers(self, low, high, size, endpoint):
+        return np.full(size, self.gap_y)
+
+
+def test_env_reset_observation():
+    observation, info = JumperEnv().reset(seed=1)
+    assert observation.shape == (OBSERVATION_SIZE,)
+    assert observation.dtype == np.float32
+    assert observation[0] == 0.5
+
+
+def test_env_crashes_without_flapping():
+    env = JumperEnv()
+    env.reset(seed=1)
+    terminated = False
+    for _ in range(1000):
+        _, reward, terminated, truncated, _ = env.step(0)
+        if terminated:
+            break
+    assert terminated
+    assert reward == -1.0
+
+
+def test_vector_env_matches_single_env():
+    actions = random.Random(3).choices([0, 1], weights=[4, 1], k=400)
+    single = JumperEnv()
+    single.reset()
+    single.rng = FixedGaps(200)
+    vector = VectorJumperEnv(2)
+    vector.reset()
+    vector.rng = FixedGaps(200)
+
+    for action in actions:
+        observation, reward, terminated, _, _ = single.step(action)
+        observations, rewards, terminations, _, _ = vector.step([action, action])
+        if terminated:
+            assert terminations.all()
+            break
+        np.testing.assert_allclose(observations[0], observation, rtol=1e-6)
+        np.testing.assert_allclose(rewards, reward)
+
+
+def test_vector_env_resets_finished_environments():
+    env = VectorJumperEnv(3, max_steps=5)
+    env.reset(seed=0)
+    for _ in range(4):
+        _, _, _, truncated, _ = env.step(np.zeros(3))
+        assert not truncated.any()
+    observations, _, _, truncated, _ = env.step(np.zeros(3))
+    assert truncated.all()
+    assert (observations[:, 0] == 0.5).all()
+
+
+def test_session_draws_from_sprites_rendered_once():
+    pygame.init()
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    session = JumperSession(2)
+    for x in range(0, SCREEN_WIDTH, 100):
+        spawn_pipe(session.pipes, x, FixedGaps(150))
+        spawn_powerup(session.powerups, x + 50, 300, "extra_life")
+    for sprites in (bird_sprite, pipe_sprite, powerup_sprite):
+        sprites.cache_clear()
+    for _ in range(3):
+        session.draw(screen)
+
+    assert bird_sprite.cache_info().currsize == 2
+    assert pipe_sprite.cache_info().currsize == 1 and powerup_sprite.cache_info().currsize == 1
+    pipe_x = int(session.pipes['x'][1])
+    assert screen.get_at((pipe_x + 10, 149)) == (0, 255, 0) and screen.get_at((pipe_x + 10, 151)) != (0, 255, 0)
+    assert screen.get_at((pipe_x + 10, 350)) == (0, 255, 0)
+
+
+def test_deaths_are_logged_with_the_player_id(tmp_path):
+    session = JumperSession(2)
+    session.event_log = EventLog(str(tmp_path / 'events.bin'))
+    # The gap lets the first bird through and the second hits the bottom pipe
+    spawn_pipe(session.pipes, session.start_x - 10, FixedGaps(100))
+    session.advance()
+    session.event_log.close()
+
+    events = read_events(session.event_log.path)
+    assert list(events['event']) == [EventType.DEATH]
+    assert list(events['entity']) == [session.birds[1].player_id] == [2]
@@ -2,7 +2,7 @@ import sys
 
 import pygame
 
-from utils.constants import SCREEN_WIDTH, YELLOW, SCREEN_HEIGHT, WHITE
+from utils.constants import SCREEN_WIDTH, YELLOW, SCREEN_HEIGHT, WHITE, MAX_PLAYERS, PLAYERS
 from racer.racer import race_game
 from platformer import platformer_game
 from jumper import jumper_game
@@ -50,14 +50,15 @@ def main_menu(screen):
                 elif event.key == pygame.K_LEFT:
                     num_players = max(1, num_players - 1)
                 elif event.key == pygame.K_RIGHT:
-                    num_players = min(3, num_players + 1)
+                    num_players = min(MAX_PLAYERS, num_players + 1)
                 elif event.key == pygame.K_RETURN:
+                    # Only catcher and the cooperative game take more players than PLAYERS has
                     if selected_option == 0:
-                        platformer_game(screen, num_players)
+                        platformer_game(screen, min(num_players, len(PLAYERS)))
                     elif selected_option == 1:
-                        race_game(screen, num_players)
+                        race_game(screen, min(num_players, len(PLAYERS)))
                     elif selected_option == 2:
-                        jumper_game(screen, num_players)
+                        jumper_game(screen, min(num_players, len(PLAYERS)))
                     elif selected_option == 3:
                         catcher_game(screen, num_players)
                     elif selected_option == 4:
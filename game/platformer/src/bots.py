@@ -0,0 +1,30 @@
+from common import Bot, RandomWalker
+from platformer.src.platformer import Game
+
+__all__ = ['CoinSeeker', 'RandomWalker']
+
+
+class CoinSeeker(Bot):
+    """Greedily heads for the nearest coin, jumping whenever the coin is above the player."""
+
+    def __init__(self, player, game: Game, rng=None):
+        super().__init__(player, rng)
+        self.game = game
+
+    def think(self, keys):
+        player = self.player
+        if not self.game.coins:
+            return
+        center_x = player.x + player.width // 2
+        center_y = player.y + player.height // 2
+        target = min(self.game.coins,
+                     key=lambda coin: (coin.rect.centerx - center_x) ** 2 + (coin.rect.centery - center_y) ** 2)
+        target_x, target_y = target.rect.center
+
+        if target_x < center_x - 5:
+            keys.press(player.controls['left'])
+        elif target_x > center_x + 5:
+            keys.press(player.controls['right'])
+        # Jumps trigger on the press, so only hold the key while falling
+        if target_y < center_y - 10 and player.vel_y >= 0:
+            keys.press(player.controls['up'])
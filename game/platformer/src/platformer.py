@@ -1,10 +1,10 @@
 import pygame
-import sys
 import random
-import time
-from utils.constants import (SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, YELLOW, GREEN, VIOLET, ORANGE, PLAYERS, POWERUP_SPAWN_INTERVAL, MAX_POWERUPS)
+from functools import lru_cache
+from utils.constants import (SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, YELLOW, GREEN, VIOLET, ORANGE, PLAYERS, POWERUP_SPAWN_INTERVAL, MAX_POWERUPS, MAX_COINS)
 from typing import Optional, List, Dict, Any
-from common import PowerUpType 
+from common import EventType, OccupancyGrid, PowerUpType, Player as BasePlayer, Session, WallClock, display_canvas, \
+    run_interactive, spawn_cap
 
 
 class SwitchPlayers(PowerUpType):
@@ -47,6 +47,13 @@ class CoinSize(PowerUpType):
         return self.name
 
 
+# The power-ups that spawn, logged by index
+POWERUP_TYPES = (DoubleScore, Invincibility, SwitchPlayers, ShapeShift, CoinSize)
+
+SPAWN_CELL = 10  # Size of the cells free space for coins and power-ups is tracked in
+SPAWN_MARGIN = 30  # Half the size of the largest coin, kept clear around platforms and power-ups
+
+
 class Coin(pygame.sprite.Sprite):
     def __init__(self, x, y, scale_factor=1.0):
         super().__init__()
@@ -57,9 +64,12 @@ class Coin(pygame.sprite.Sprite):
     
     def update_size(self):
         """Update coin surface based on current scale_factor"""
+        self.set_color(YELLOW)
+
+    def set_color(self, color):
+        """Show the coin in ``color``, swapping its image rather than refilling it, so its texture stays right."""
         new_size = int(self.base_size * self.scale_factor)
-        self.image = pygame.Surface((new_size, new_size))
-        self.image.fill(YELLOW)  # Yellow color
+        self.image = coin_image(new_size, color)
     
     def set_scale(self, scale_factor):
         """Set new scale factor and update coin size"""
@@ -71,7 +81,7 @@ class Coin(pygame.sprite.Sprite):
 
 
 class Platform(pygame.sprite.Sprite):
-    def __init__(self, x, y, width, height):
+    def __init__(self, x, y, width, height, start_time=0.0):
         super().__init__()
         self.original_image = pygame.Surface((width, height))
         self.original_image.fill(GREEN)  # Green color
@@ -80,15 +90,14 @@ class Platform(pygame.sprite.Sprite):
 
         # Blinking attributes
         self.blinking = True
-        self.blink_start_time = time.time()
+        self.blink_start_time = start_time
         self.blink_duration = 2  # seconds
         self.blink_interval = 0.5  # seconds
         self.last_blink_time = self.blink_start_time
         self.visible = True
 
-    def update(self):
+    def update(self, current_time):
         if self.blinking:
-            current_time = time.time()
 
             # Check if blinking duration is over
             if current_time - self.blink_start_time >= self.blink_duration:
@@ -121,20 +130,59 @@ class PowerUp(pygame.sprite.Sprite):
         self.powerup_type = powerup_type  # The type of power-up
 
 
-class Player(pygame.sprite.Sprite):
-    def __init__(self, x, y, controls: Dict[str, Any], color):
-        super().__init__()
-        self.original_color = color
-        self.current_color = color
+def draw_shape(surface: pygame.Surface, shape: str, color):
+    """Fill ``surface`` with a player of ``shape``: 'rectangle', 'circle' or 'triangle'."""
+    width, height = surface.get_size()
+    if shape == 'circle':
+        pygame.draw.circle(surface, color, (width // 2, height // 2), min(width, height) // 2)
+    elif shape == 'triangle':
+        points = [
+            (width // 2, 0),
+            (0, height),
+            (width, height)
+        ]
+        pygame.draw.polygon(surface, color, points)
+    else:  # Default rectangle
+        surface.fill(color)
+
+
+@lru_cache(maxsize=None)
+def coin_image(size: int, color) -> pygame.Surface:
+    """A ``size`` square coin of ``color``, made once and shared by every coin that looks the same."""
+    surface = pygame.Surface((size, size))
+    surface.fill(color)
+    return surface
+
+
+@lru_cache(maxsize=None)
+def shape_mask(shape: str, width: int, height: int) -> pygame.mask.Mask:
+    """The pixels covered by a ``width`` by ``height`` player of ``shape``, built once per shape and size."""
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    draw_shape(surface, shape, WHITE)
+    return pygame.mask.from_surface(surface)
+
+
+@lru_cache(maxsize=None)
+def solid_mask(width: int, height: int) -> pygame.mask.Mask:
+    """A mask with every pixel of a ``width`` by ``height`` rect set."""
+    return pygame.mask.Mask((width, height), fill=True)
+
+
+class Player(BasePlayer):
+    __slots__ = ('original_color', 'current_color', 'original_width', 'original_height', 'image',
+                 'original_image', 'vel_y', 'original_controls', 'shape', 'scale_factor')
+
+    def __init__(self, x, y, controls: Dict[str, Any], color, player_id=0):
         self.original_width = 50
         self.original_height = 50
+        super().__init__(x - self.original_width // 2, y - self.original_height // 2,
+                         self.original_width, self.original_height, color, controls, player_id)
+        self.original_color = color
+        self.current_color = color
         self.image = pygame.Surface((self.original_width, self.original_height), pygame.SRCALPHA)
         self.original_image = self.image.copy()
-        self.rect = self.image.get_rect(center=(x, y))
         self.vel_y = 0
-        self.controls = controls
         self.original_controls = controls
-        self.key_pressed = {key: False for key in controls.values()}
         self.shape = 'rectangle'  # Default shape
         self.scale_factor = 1.0    # Default scale
 
@@ -145,9 +193,8 @@ class Player(pygame.sprite.Sprite):
         self.update_image()
 
     def set_controls(self, new_controls):
-        """Update the player's controls and reset key_pressed."""
+        """Update the player's controls."""
         self.controls = new_controls
-        self.key_pressed = {key: False for key in self.controls.values()}
 
     def reset_color(self):
         self.current_color = self.original_color
@@ -175,78 +222,99 @@ class Player(pygame.sprite.Sprite):
         self.image = pygame.Surface((width, height), pygame.SRCALPHA)
 
         # Draw the current shape
-        if self.shape == 'circle':
-            pygame.draw.circle(self.image, self.current_color, (width // 2, height // 2), min(width, height) // 2)
-        elif self.shape == 'triangle':
-            points = [
-                (width // 2, 0),
-                (0, height),
-                (width, height)
-            ]
-            pygame.draw.polygon(self.image, self.current_color, points)
-        else:  # Default rectangle
-            self.image.fill(self.current_color)
-
-        # Update the rect to maintain the center position
-        self.rect = self.image.get_rect(center=self.rect.center)
+        draw_shape(self.image, self.shape, self.current_color)
+
+        # Resize around the current center position
+        center_x = self.x + self.width // 2
+        center_y = self.y + self.height // 2
+        self.width = width
+        self.height = height
+        self.x = center_x - width // 2
+        self.y = center_y - height // 2
+
+    def collides_with(self, sprite) -> bool:
+        """
+        Whether the player's shape touches ``sprite``'s rect. Rectangular players need
+        only the rect test; shape-shifted ones are then compared pixel by pixel.
+        """
+        rect = self.rect
+        other = sprite.rect
+        if not rect.colliderect(other):
+            return False
+        if self.shape == 'rectangle':
+            return True
+        mask = shape_mask(self.shape, rect.width, rect.height)
+        return mask.overlap(solid_mask(other.width, other.height), (other.x - rect.x, other.y - rect.y)) is not None
 
     def update(self):
         self.vel_y += 0.5  # Gravity
-        self.rect.y += int(self.vel_y)
+        self.y += int(self.vel_y)
 
         # Move left/right
-        keys = pygame.key.get_pressed()
-        if keys[self.controls['left']]:
-            self.rect.x -= 5
-        if keys[self.controls['right']]:
-            self.rect.x += 5
+        keys = self.input.get_pressed()
+        controls = self.controls
+        if keys[controls['left']]:
+            self.x -= 5
+        if keys[controls['right']]:
+            self.x += 5
 
         # Jump
-        if keys[self.controls['up']] and not self.key_pressed.get(self.controls['up']):
+        if keys.pressed(controls['up']):
             self.vel_y = - 10
 
-        for control in self.controls.values():
-            if keys[control]:
-                if not self.key_pressed.get(control, False):
-                    self.key_pressed[control] = True
-            else:
-                self.key_pressed[control] = False
+        half_width = int(self.width / 2)
+        if self.x < -half_width:
+            self.x = -half_width
+        if self.x + self.width > int(SCREEN_WIDTH + self.width / 2):
+            self.x = int(SCREEN_WIDTH + self.width / 2) - self.width
+        if self.y < 0:
+            self.y = 0
+        if self.y + self.height > SCREEN_HEIGHT:
+            self.y = SCREEN_HEIGHT - self.height
 
-        if self.rect.left < -int(self.rect.width / 2):
-            self.rect.left = -int(self.rect.width / 2)
-        if self.rect.right > int(SCREEN_WIDTH + self.rect.width / 2):
-            self.rect.right = int(SCREEN_WIDTH + self.rect.width / 2)
-        if self.rect.top < 0:
-            self.rect.top = 0
-        if self.rect.bottom > SCREEN_HEIGHT:
-            self.rect.bottom = SCREEN_HEIGHT
 
+class Game(Session):
+    game_name = 'platformer'
 
-class Game:
     def __init__(self, players: List[Player] = None, power_ups: List[PowerUp] = None, coins: List[Coin] = None,
-                 platforms: List[Platform] = None):
+                 platforms: List[Platform] = None, powerup_spawn_interval=POWERUP_SPAWN_INTERVAL,
+                 max_powerups=MAX_POWERUPS, max_coins=MAX_COINS, clock=None):
+        super().__init__()
         self.level = 1
         self.active_powerups = {}  # Dictionary to track multiple active powerups {powerup_type: start_time}
         self.total_score = 0
-        self.best_score = self.total_score
+        self.best_score = self.total_score  # Shown on screen, including earlier sessions
+        self.session_best = self.total_score  # The best run of this session, recorded when it ends
         self.players = [] if players is None else players
         self.power_ups = [] if power_ups is None else power_ups
         self.coins = [] if coins is None else coins
         self.platforms = [] if platforms is None else platforms
-        self.power_up_spawn_time = time.time()
-        self.coin_spawn_time = time.time()
+        self.clock = WallClock() if clock is None else clock
+        self.power_up_spawn_time = self.clock.now
+        self.coin_spawn_time = self.clock.now
         self._last_score = 0
+        self._font = None
+        self.powerup_spawn_interval = powerup_spawn_interval  # seconds
+        self.max_powerups = max_powerups
+        self.max_coins = max_coins
+        # Where coins and power-ups can spawn without overlapping a platform or power-up
+        self.free_space = OccupancyGrid(SCREEN_WIDTH, SCREEN_HEIGHT, SPAWN_CELL, SPAWN_MARGIN)
+        for sprite in self.platforms + self.power_ups:
+            self.free_space.occupy(sprite, sprite.rect)
 
     def spawn_coins(self):
         # Spawn coins
-        if time.time() - self.coin_spawn_time > 0.2 and len(self.coins) < 10:
-            coin_x = random.randint(0, SCREEN_WIDTH)
-            coin_y = random.randint(0, SCREEN_HEIGHT)
+        now = self.clock.now
+        if now - self.coin_spawn_time > 0.2 and len(self.coins) < spawn_cap(self.max_coins, self.quality):
+            position = self.free_space.sample()
+            if position is None:
+                return
+            coin_x, coin_y = position
             # Check if DoubleScore is active
-            double_score_active = any(isinstance(powerup_instance, DoubleScore) and time.time() - start_time <= 10 
+            double_score_active = any(isinstance(powerup_instance, DoubleScore) and now - start_time <= 10 
                                      for powerup_instance, start_time in self.active_powerups.items())
             # Check if CoinSize is active
-            coin_size_active = any(isinstance(powerup_instance, CoinSize) and time.time() - start_time <= 10 
+            coin_size_active = any(isinstance(powerup_instance, CoinSize) and now - start_time <= 10 
                                      for powerup_instance, start_time in self.active_powerups.items())
             
             # Create coin with appropriate scale
@@ -254,39 +322,33 @@ class Game:
             coin = Coin(coin_x, coin_y, scale_factor=coin_scale)
             
             if double_score_active:
-                coin.image.fill(ORANGE)
+                coin.set_color(ORANGE)
             else:
-                coin.image.fill(YELLOW)
-            # Check if coin is spawned inside a platform
-            if not any(coin.rect.colliderect(platform.rect) for platform in self.platforms):
-                self.coins.append(coin)
-                self.coin_spawn_time = time.time()
+                coin.set_color(YELLOW)
+            self.coins.append(coin)
+            self.coin_spawn_time = now
 
     def spawn_power_ups(self):
         # Spawn power-ups
-        if time.time() - self.power_up_spawn_time > POWERUP_SPAWN_INTERVAL and len(self.power_ups) < MAX_POWERUPS:
-            # Try to find a non-overlapping position
-            max_attempts = 10
-            for _ in range(max_attempts):
-                power_up_x = random.randint(0, SCREEN_WIDTH)
-                power_up_y = random.randint(0, SCREEN_HEIGHT)
-                
-                # Check if position overlaps with existing powerups
-                new_powerup_rect = pygame.Rect(power_up_x, power_up_y, 30, 30)  # Assuming powerup size is 30x30
-                overlaps = any(new_powerup_rect.colliderect(power_up.rect) for power_up in self.power_ups)
-                
-                if not overlaps:
-                    power_up = PowerUp(power_up_x, power_up_y, random.choice([DoubleScore(), Invincibility(), SwitchPlayers(), ShapeShift(), CoinSize()]))
-                    self.power_ups.append(power_up)
-                    self.power_up_spawn_time = time.time()
-                    break  # Exit loop after successful spawn
+        now = self.clock.now
+        if (now - self.power_up_spawn_time > self.powerup_spawn_interval
+                and len(self.power_ups) < spawn_cap(self.max_powerups, self.quality)):
+            position = self.free_space.sample()
+            if position is not None:
+                power_up = PowerUp(*position, random.choice(POWERUP_TYPES)())
+                self.power_ups.append(power_up)
+                self.free_space.occupy(power_up, power_up.rect)
+                self.power_up_spawn_time = now
 
     def spawn_platforms(self):
         if self.total_score // 20 > self._last_score // 20:
-            self.platforms.append(Platform(random.randint(0, SCREEN_WIDTH - 100),
-                                           random.randint(0, SCREEN_HEIGHT - 10),
-                                           100,
-                                           10))
+            platform = Platform(random.randint(0, SCREEN_WIDTH - 100),
+                                random.randint(0, SCREEN_HEIGHT - 10),
+                                100,
+                                10,
+                                self.clock.now)
+            self.platforms.append(platform)
+            self.free_space.occupy(platform, platform.rect)
             self._last_score = self.total_score
 
     def switch_player_controls(self):
@@ -302,25 +364,30 @@ class Game:
 
     def update(self):
         """Advances game state by spawning platforms, updating entities, and handling collisions and power-ups."""
+        # One timestamp for the whole frame
+        now = self.clock.tick()
         self.spawn_platforms()
 
         # Update each platform's blinking state
         for platform in self.platforms:
-            platform.update()
+            platform.update(now)
 
-        for player_nr, player in enumerate(self.players):
+        for player in self.players:
             player.update()
             for platform in self.platforms:
-                if pygame.sprite.collide_rect(player, platform):
+                if player.collides_with(platform):
                     # Check if Invincibility is active
-                    invincibility_active = any(isinstance(powerup_instance, Invincibility) and time.time() - start_time <= 10 
+                    invincibility_active = any(isinstance(powerup_instance, Invincibility) and now - start_time <= 10 
                                              for powerup_instance, start_time in self.active_powerups.items())
                     # Only reset the game if the platform is not blinking and player is not invincible
                     if not platform.blinking and not invincibility_active:
+                        self.log_event(EventType.DEATH, player.player_id, player.rect.x, player.rect.y)
                         self.reset_game()
             for power_up in self.power_ups:
-                if pygame.sprite.collide_rect(player, power_up):
-                    self.active_powerups[power_up.powerup_type] = time.time()  # Store powerup instance as key
+                if player.collides_with(power_up):
+                    self.log_event(EventType.POWERUP, POWERUP_TYPES.index(type(power_up.powerup_type)),
+                                   power_up.rect.x, power_up.rect.y)
+                    self.active_powerups[power_up.powerup_type] = now  # Store powerup instance as key
 
                     # Apply the power-up effects for newly collected powerup only
                     if isinstance(power_up.powerup_type, Invincibility):
@@ -330,7 +397,7 @@ class Game:
                         self.switch_player_controls()
                     elif isinstance(power_up.powerup_type, DoubleScore):
                         for coin in self.coins:
-                            coin.image.fill(ORANGE)
+                            coin.set_color(ORANGE)
                     elif isinstance(power_up.powerup_type, CoinSize):
                         for coin in self.coins:
                             coin.set_scale(3.0)
@@ -359,13 +426,14 @@ class Game:
                     # Apply color last to prevent overwriting
                     if double_score_active:
                         for coin in self.coins:
-                            coin.image.fill(ORANGE)
+                            coin.set_color(ORANGE)
 
                     self.power_ups.remove(power_up)
+                    self.free_space.release(power_up)
             # Handle power-up durations
             expired_powerups = []
             for powerup_type, start_time in self.active_powerups.items():
-                if time.time() - start_time > 10:
+                if now - start_time > 10:
                     expired_powerups.append(powerup_type)
                     
             # Remove expired powerups and reset their effects
@@ -374,7 +442,7 @@ class Game:
                     self.reset_player_controls()
                 elif isinstance(powerup_instance, DoubleScore):
                     for coin in self.coins:
-                        coin.image.fill(YELLOW)
+                        coin.set_color(YELLOW)
                 elif isinstance(powerup_instance, CoinSize):
                     for coin in self.coins:
                         coin.set_scale(1.0)
@@ -387,15 +455,16 @@ class Game:
                 del self.active_powerups[powerup_instance]
 
             for coin in self.coins:
-                if pygame.sprite.collide_rect(player, coin):
+                if player.collides_with(coin):
                     # Check if DoubleScore is active
-                    double_score_active = any(isinstance(powerup_instance, DoubleScore) and time.time() - start_time <= 10 
+                    double_score_active = any(isinstance(powerup_instance, DoubleScore) and now - start_time <= 10 
                                              for powerup_instance, start_time in self.active_powerups.items())
                     if double_score_active:
                         self.total_score += 2  # Double the score for each coin
                     else:
                         self.total_score += 1  # Normal score for each coin
                     self.coins.remove(coin)
+        self.session_best = max(self.session_best, self.total_score)
         self.best_score = max(self.best_score, self.total_score)
         self.update_level()
 
@@ -411,8 +480,8 @@ class Game:
         for player in self.players:
             player.reset_color()  # Reset player color
             player.reset_shape_and_size()  # Reset shape and size
-            player.rect.x = SCREEN_WIDTH // 2
-            player.rect.y = SCREEN_HEIGHT // 2
+            player.x = SCREEN_WIDTH // 2
+            player.y = SCREEN_HEIGHT // 2
             player.vel_y = 0
             if player.controls != player.original_controls:
                 player.controls = player.original_controls
@@ -420,69 +489,72 @@ class Game:
         self.coins.clear()
         self.power_ups.clear()
         self.platforms.clear()
+        self.free_space.clear()
 
         # Reset spawn timers
-        self.power_up_spawn_time = time.time()
-        self.coin_spawn_time = time.time()
+        self.power_up_spawn_time = self.clock.now
+        self.coin_spawn_time = self.clock.now
 
+    def step(self):
+        self.update()
+        self.spawn_power_ups()
+        self.spawn_coins()
 
+    def scores(self):
+        return {'score': self.total_score, 'best': self.best_score, 'level': self.level}
 
-def platformer_game(screen, num_players=2):
-    # Create sprites
-    players_list = list(PLAYERS.items())
-    players = [Player(SCREEN_WIDTH // random.randint(1, 8),
-                      SCREEN_HEIGHT // 3, p_controls, p_color)
-               for p_color, p_controls in players_list[:num_players]]
-    # Font for displaying score
-    font = pygame.font.Font(None, 36)
-
-    # Create game instance
-    game = Game(players=players)
-    # Main game loop
-    running = True
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return
+    def recall(self, leaderboard):
+        # Carry the best run over from earlier sessions
+        self.best_score = max(self.best_score, leaderboard.best(self.game_name, len(self.players)))
 
-        game.update()
+    def record(self, leaderboard):
+        # The game restarts itself, so its best run stands for the whole session
+        leaderboard.submit(self.game_name, len(self.players), self.session_best)
 
-        game.spawn_power_ups()
-        game.spawn_coins()
+    def draw(self, screen):
+        if self._font is None:
+            # Font for displaying score
+            self._font = pygame.font.Font(None, 36)
+        font = self._font
 
-        # Draw
         screen.fill((0, 0, 0))  # Black background
-        for player in game.players:
+        for player in self.players:
             screen.blit(player.image, player.rect)
-        for power_up in game.power_ups:
+        for power_up in self.power_ups:
             screen.blit(power_up.image, power_up.rect)
-        for platform in game.platforms:
+        for platform in self.platforms:
             screen.blit(platform.image, platform.rect)
-        for coin in game.coins:
+        for coin in self.coins:
             screen.blit(coin.image, coin.rect)
 
         # Draw score
-        score_text = font.render(f"Coins: {game.total_score}", True, YELLOW)
+        score_text = font.render(f"Coins: {self.total_score}", True, YELLOW)
         screen.blit(score_text, (SCREEN_WIDTH - score_text.get_width() - 10, 10))
 
         # Draw power-up timers
-        for i, (powerup_type, start_time) in enumerate(game.active_powerups.items()):
-            remaining_time = 10 - int(time.time() - start_time)
+        for i, (powerup_type, start_time) in enumerate(self.active_powerups.items()):
+            remaining_time = 10 - int(self.clock.now - start_time)
             if remaining_time > 0:
                 timer_text = font.render(f"{str(powerup_type)}: {remaining_time}s", True, YELLOW)
                 screen.blit(timer_text, (10, 10 + i * 30))
 
-        level_text = font.render(f"Level: {game.level}", True, YELLOW)
+        level_text = font.render(f"Level: {self.level}", True, YELLOW)
         screen.blit(level_text, (SCREEN_WIDTH // 2 - level_text.get_width() // 2, 10))
 
-        best_text = font.render(f"Best: {game.best_score}", True, YELLOW)
+        best_text = font.render(f"Best: {self.best_score}", True, YELLOW)
         screen.blit(best_text, (SCREEN_WIDTH - 150 - score_text.get_width() - 10, 10))
 
-        pygame.display.flip()
-        pygame.time.Clock().tick(60)
 
-    pygame.quit()
-    sys.exit()
+
+def platformer_game(screen, num_players=2):
+    with display_canvas(screen) as target:
+        run_interactive(target, lambda: new_game(num_players))
+
+
+def new_game(num_players=2, **params) -> Game:
+    """Create a game with ``num_players`` players at random starting positions. ``params`` go to ``Game``."""
+    players_list = list(PLAYERS.items())
+    players = [Player(SCREEN_WIDTH // random.randint(1, 8),
+                      SCREEN_HEIGHT // 3, p_controls, p_color, number)
+               for number, (p_color, p_controls) in enumerate(players_list[:num_players], 1)]
+    return Game(players=players, **params)
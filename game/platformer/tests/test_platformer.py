@@ -1,4 +1,8 @@
-from platformer import Player, Game, PowerUp, Coin, Platform
+import numpy as np
+import pygame
+from platformer import Player, Game, PowerUp, Coin, Platform, Invincibility, new_game, shape_mask
+from common import InputProvider, KeyState, Leaderboard, TextureCanvas, VirtualClock
+from utils.constants import ORANGE, SCREEN_HEIGHT, SCREEN_WIDTH
 from unittest.mock import patch
 
 
@@ -75,3 +79,96 @@ def test_player_color_reset_after_powerup_ends():
     with patch('time.time', return_value=11):  # Mock time.time() to return 11, simulating the passage of 11 seconds
         game.update()
         assert player.image.get_at((0, 0)) == (255, 0, 0)  # Check if player color reset to original color
+
+
+class NoInput(InputProvider):
+    def get_pressed(self):
+        return KeyState()
+
+
+def test_virtual_clock_expires_powerups_without_waiting():
+    game = Game(clock=VirtualClock(fps=60))
+    player = Player(100, 100, {'left': 'a', 'right': 'd', 'up': 'w'}, (255, 0, 0))
+    player.input = NoInput()
+    game.players.append(player)
+    game.power_ups.append(PowerUp(100, 100, Invincibility()))
+    game.update()
+    assert player.image.get_at((0, 0)) == (255, 255, 255)
+
+    for _ in range(9 * 60):
+        game.update()
+    assert player.image.get_at((0, 0)) == (255, 255, 255)
+    for _ in range(2 * 60):
+        game.update()
+    assert player.image.get_at((0, 0)) == (255, 0, 0)
+
+
+def test_platform_blinks_on_game_time():
+    platform = Platform(100, 100, 200, 20, start_time=5.0)
+    platform.update(5.4)
+    assert platform.visible
+    platform.update(5.5)
+    assert not platform.visible
+    platform.update(7.0)
+    assert not platform.blinking and platform.visible
+
+
+def test_shape_shifted_player_collides_by_shape():
+    player = Player(100, 100, {'left': 'a', 'right': 'd', 'up': 'w'}, (255, 0, 0))
+    player.change_shape_and_size('triangle', 0.7)
+    # A platform clipping the empty top-left corner of the triangle's bounding box
+    corner = Platform(player.rect.x - 95, player.rect.y - 5, 100, 10)
+    assert player.rect.colliderect(corner.rect)
+    assert not player.collides_with(corner)
+    assert player.collides_with(Platform(player.rect.x, player.rect.bottom - 5, 100, 10))
+
+    player.reset_shape_and_size()
+    assert player.collides_with(corner)
+
+
+def test_shape_masks_are_built_once_per_shape_and_size():
+    shape_mask.cache_clear()
+    players = [Player(100 + 60 * i, 100, {'left': 'a', 'right': 'd', 'up': 'w'}, (255, 0, 0)) for i in range(3)]
+    platform = Platform(0, 0, 400, 400)
+    for _ in range(5):
+        for player in players:
+            player.change_shape_and_size('circle', 1.1)
+            assert player.collides_with(platform)
+    assert shape_mask.cache_info().misses == 1
+
+
+def test_best_score_carries_over_from_the_leaderboard():
+    leaderboard = Leaderboard(':memory:')
+    leaderboard.submit('platformer', 1, 12)
+    game = Game(players=[Player(100, 100, {'left': 'a', 'right': 'd', 'jump': 'w'}, (255, 0, 0))])
+    game.recall(leaderboard)
+    assert game.best_score == 12 and game.scores()['best'] == 12
+
+    # Only this session's own best is recorded again
+    game.total_score = 4
+    game.session_best = 4
+    game.record(leaderboard)
+    assert [entry.score for entry in leaderboard.top('platformer', 1)] == [12, 4]
+    leaderboard.close()
+
+
+def test_game_draws_the_same_on_textures():
+    pygame.init()
+    game = new_game(2)
+    for _ in range(30):
+        game.advance()
+    game.coins.append(Coin(100, 100))
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    canvas = TextureCanvas.create((SCREEN_WIDTH, SCREEN_HEIGHT), accelerated=0)
+    game.draw(canvas)
+    # Recoloring a coin shows on the canvas too, which keeps a texture per surface
+    for coin in game.coins:
+        coin.set_color(ORANGE)
+    game.draw(surface)
+    game.draw(canvas)
+
+    drawn = canvas.to_surface()
+    assert drawn.get_at((100, 100))[:3] == ORANGE
+    # Text is blended a little differently
+    difference = pygame.surfarray.array3d(surface).astype(int) - pygame.surfarray.array3d(drawn)
+    assert np.abs(difference).max() <= 3
@@ -0,0 +1,37 @@
+import pygame
+
+from common import Bot
+from utils.constants import FPS
+
+__all__ = ['TypingBot']
+
+
+class TypingBot(Bot):
+    """
+    Types the player's keys at a steady speed.
+
+    Attributes:
+        wpm (float): Typing speed in words per minute, counting five keys per word.
+        accuracy (float): The chance that a keystroke is the right key.
+    """
+
+    def __init__(self, player, rng=None, wpm=60, accuracy=1.0, fps=FPS):
+        super().__init__(player, rng)
+        self.wpm = wpm
+        self.accuracy = accuracy
+        self.keys_per_frame = wpm * 5 / 60 / fps
+        self.pending = 0.0
+
+    def think(self, keys):
+        self.pending = min(self.pending + self.keys_per_frame, 2.0)
+
+    def events(self):
+        events = []
+        # At most one key per frame, the game advances the next key only after it sees the event
+        if self.pending >= 1:
+            self.pending -= 1
+            key = self.player.get_next_key()
+            if self.rng.random() >= self.accuracy:
+                key = pygame.K_SPACE
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=key))
+        return events
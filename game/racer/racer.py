@@ -1,3 +1,6 @@
+import time
+from typing import Dict, NamedTuple
+
 import pygame
 from utils.constants import (
     WHITE, RED, BLUE, BLACK, GREEN, GRAY,
@@ -5,26 +8,30 @@ from utils.constants import (
     PLAYER_WIDTH, PLAYER_HEIGHT, PLAYER_MOVE_DISTANCE,
     PLAYERS_START_Y, PLAYERS_START_X,
     RACER_PLAYERS,
-    FINISH_LINE_X, FPS, WINNER_DISPLAY_TIME,
+    FINISH_LINE_X, FPS, WINNER_DISPLAY_TIME, RACER_LOW_LATENCY,
     initialize_racer_keys
 )
+from common import Player as BasePlayer, Session, default_profiler, default_streamer, display_canvas, draw_line, \
+    draw_rect, present
+
+class Player(BasePlayer):
+    __slots__ = ('current_key',)
 
-class Player:
-    def __init__(self, x, y, color, keys):
-        self.pos = x
-        self.y = y
-        self.color = color
-        self.keys = keys
+    def __init__(self, x, y, color, keys, player_id=0):
+        super().__init__(x, y, PLAYER_WIDTH, PLAYER_HEIGHT, color, keys, player_id)
         self.current_key = 0
-        self.width = PLAYER_WIDTH
-        self.height = PLAYER_HEIGHT
+
+    @property
+    def keys(self):
+        """The sequence of keys this player has to type, in order."""
+        return self.controls
     
     def move(self, distance):
-        self.pos += distance
+        self.x += distance
         self.current_key = (self.current_key + 1) % len(self.keys)
     
     def draw(self, screen):
-        pygame.draw.rect(screen, self.color, (self.pos, self.y, self.width, self.height))
+        draw_rect(screen, self.color, (self.x, self.y, self.width, self.height))
     
     def get_next_key(self):
         return self.keys[self.current_key]
@@ -32,8 +39,56 @@ class Player:
     def is_correct_key(self, key):
         return key == self.keys[self.current_key]
 
-class RacerGame:
+class LatencySummary(NamedTuple):
+    """The input-to-present latency distribution of one player's key presses, in milliseconds."""
+    presses: int
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+class InputLatency:
+    """
+    Measures how long each player's key presses take to show on screen.
+
+    A press is stamped when its event is taken from the queue, and measured when the
+    first frame drawn after it is presented. Pygame does not expose SDL's own event
+    timestamps, so in the frame-paced mode a press may also have waited in the queue
+    for up to a frame before being stamped.
+
+    Attributes:
+        samples (dict): The latencies of each player's presses in milliseconds, by player id.
+    """
+
+    def __init__(self):
+        self.samples: Dict[int, list] = {}
+        self._pending = []
+
+    def pressed(self, player, timestamp):
+        """Note a press by ``player`` stamped with ``time.perf_counter()`` at ``timestamp``."""
+        self._pending.append((player.player_id, timestamp))
+
+    def presented(self, now=None):
+        """Measure the presses noted since the last frame, which has just been presented."""
+        now = time.perf_counter() if now is None else now
+        for player_id, timestamp in self._pending:
+            self.samples.setdefault(player_id, []).append((now - timestamp) * 1000)
+        self._pending.clear()
+
+    def summary(self) -> Dict[int, LatencySummary]:
+        """The latency distribution of each player with at least one press."""
+        summaries = {}
+        for player_id, samples in self.samples.items():
+            ordered = sorted(samples)
+            p50, p90, p99 = (ordered[min(len(ordered) - 1, int(len(ordered) * q))] for q in (0.5, 0.9, 0.99))
+            summaries[player_id] = LatencySummary(len(ordered), p50, p90, p99, ordered[-1])
+        return summaries
+
+
+class RacerGame(Session):
     def __init__(self, screen, num_players=2):
+        super().__init__()
         pygame.init()
         self.width = WINDOW_WIDTH
         self.height = WINDOW_HEIGHT
@@ -45,67 +100,150 @@ class RacerGame:
         
         # Initialize players
         player_colors = [RED, BLUE, GRAY]
-        self.players = [Player(PLAYERS_START_X, PLAYERS_START_Y[i], player_colors[i], RACER_PLAYERS[i])
+        self.players = [Player(PLAYERS_START_X, PLAYERS_START_Y[i], player_colors[i], RACER_PLAYERS[i], i + 1)
                        for i in range(num_players)]
+        # Every key belongs to a single player, so a key press is routed with one lookup
+        self.players_by_key = {key: player for player in self.players for key in player.keys}
         
         # Finish line
         self.finish_line = FINISH_LINE_X
+        self.winner = None
+        self.latency = InputLatency()
+
+    def handle_event(self, event, timestamp=None):
+        """Until the race is won, move the player whose next key was pressed, timing it if given a ``timestamp``."""
+        if event.type == pygame.KEYDOWN and not self.game_over:
+            # Handle player keys
+            player = self.players_by_key.get(event.key)
+            if player is not None and player.is_correct_key(event.key):
+                player.move(PLAYER_MOVE_DISTANCE)
+                if timestamp is not None:
+                    self.latency.pressed(player, timestamp)
 
-    def draw(self):
-        self.screen.fill(WHITE)
+    def step(self):
+        # Check for winner
+        for i, player in enumerate(self.players):
+            if player.x >= self.finish_line and not self.winner:
+                self.winner = f"Player {i+1}"
+                self.game_over = True
+
+    def scores(self):
+        return {f'p{player.player_id}': player.x for player in self.players}
+
+    def draw(self, screen=None):
+        screen = self.screen if screen is None else screen
+        screen.fill(WHITE)
         
         # Draw players
         for player in self.players:
-            player.draw(self.screen)
+            player.draw(screen)
         
         # Draw finish line
-        pygame.draw.line(self.screen, BLACK, (self.finish_line, 0), (self.finish_line, self.height), 2)
+        draw_line(screen, BLACK, (self.finish_line, 0), (self.finish_line, self.height), 2)
         
         # Display next keys to press
         font = pygame.font.Font(None, 36)
         for i, player in enumerate(self.players):
             text = font.render(f"Player {i+1}: Press {pygame.key.name(player.get_next_key())}", True, player.color)
-            text_x = player.pos - text.get_width() // 4
+            text_x = player.x - text.get_width() // 4
             text_y = player.y - 30  # Position text above rectangle
-            self.screen.blit(text, (text_x, text_y))
-        
-        pygame.display.flip()
+            screen.blit(text, (text_x, text_y))
+
+    def draw_latency(self, screen=None):
+        """Show each player's input-to-present latency under the winner."""
+        screen = self.screen if screen is None else screen
+        font = pygame.font.Font(None, 28)
+        summaries = self.latency.summary()
+        for i, player in enumerate(self.players):
+            summary = summaries.get(player.player_id)
+            if summary is None:
+                continue
+            text = font.render(f"Player {i+1} latency: p50 {summary.p50_ms:.1f} ms, p99 {summary.p99_ms:.1f} ms, "
+                               f"max {summary.max_ms:.1f} ms over {summary.presses} keys", True, player.color)
+            screen.blit(text, (self.width//2 - text.get_width()//2, self.height//2 + 60 + i * 30))
+
+    def report_latency(self):
+        """Print each player's input-to-present latency, for when the race ends before it can be read on screen."""
+        summaries = self.latency.summary()
+        for i, player in enumerate(self.players):
+            summary = summaries.get(player.player_id)
+            if summary is not None:
+                print(f"Player {i+1} latency: p50 {summary.p50_ms:.1f} ms, p90 {summary.p90_ms:.1f} ms, "
+                      f"p99 {summary.p99_ms:.1f} ms, max {summary.max_ms:.1f} ms over {summary.presses} keys")
 
-    def run(self):
+    def run(self, low_latency=RACER_LOW_LATENCY):
+        """
+        Play until someone wins or the window is closed or left with ESC.
+
+        By default events are handled once per frame. With ``low_latency`` the loop
+        sleeps in ``pygame.event.wait`` instead, and draws and presents a new frame as
+        soon as a key is pressed, so a press is on screen without waiting for the
+        next frame. Either way, ``latency`` measures every key press that moves a player.
+
+        The winner and the latencies are shown for ``WINNER_DISPLAY_TIME`` milliseconds,
+        during which the window keeps handling events, and the latencies are printed
+        however the race ends.
+        """
+        try:
+            self._play(low_latency)
+        finally:
+            self.report_latency()
+
+    def _play(self, low_latency):
         running = True
-        winner = None
+        profiler = default_profiler()
+        streamer = default_streamer()
+        clock = pygame.time.Clock()
+        next_frame = pygame.time.get_ticks()
+        winner_until = None
         
         while running:
-            for event in pygame.event.get():
+            events = _wait_for_events(next_frame) if low_latency else pygame.event.get()
+            timestamp = time.perf_counter()
+            for event in events:
+                if profiler.handle_event(event, 'racer'):
+                    continue
                 if event.type == pygame.QUIT:
                     return
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         return
-                    # Handle player keys
-                    for player in self.players:
-                        if player.is_correct_key(event.key):
-                            player.move(PLAYER_MOVE_DISTANCE)
+                self.handle_event(event, timestamp)
             
-            # Check for winner
-            for i, player in enumerate(self.players):
-                if player.pos >= self.finish_line and not winner:
-                    winner = f"Player {i+1}"
+            self.advance()
             
-            if winner:
+            self.draw()
+            if self.winner:
+                if winner_until is None:
+                    winner_until = pygame.time.get_ticks() + WINNER_DISPLAY_TIME
                 font = pygame.font.Font(None, 74)
-                text = font.render(f"{winner} wins!", True, GREEN)
+                text = font.render(f"{self.winner} wins!", True, GREEN)
                 self.screen.blit(text, (self.width//2 - 150, self.height//2))
-                pygame.display.flip()
-                pygame.time.wait(WINNER_DISPLAY_TIME)
-                running = False
-            
-            self.draw()
-            pygame.time.Clock().tick(FPS)
+                self.draw_latency()
+                running = pygame.time.get_ticks() < winner_until
+            if streamer is not None:
+                streamer.send(self.screen)
+            present(self.screen)
+            self.latency.presented()
+            next_frame = pygame.time.get_ticks() + 1000 // FPS
+            if not low_latency:
+                clock.tick(FPS)
+            if profiler.active:
+                profiler.end_frame()
         
         pygame.quit()
         return
 
+def _wait_for_events(deadline):
+    """Block until an event arrives or ``pygame.time.get_ticks()`` reaches ``deadline``, then return the events."""
+    timeout = deadline - pygame.time.get_ticks()
+    # A timeout of 0 would wait for an event however long it takes
+    event = pygame.event.wait(timeout) if timeout > 0 else pygame.event.poll()
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event, *pygame.event.get()]
+
 def race_game(screen, num_players=2):
-    game = RacerGame(screen, num_players)
-    game.run()
+    with display_canvas(screen) as target:
+        game = RacerGame(target, num_players)
+        game.run()
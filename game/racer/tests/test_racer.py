@@ -0,0 +1,100 @@
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pygame
+
+from common import TextureCanvas
+from racer.racer import InputLatency, Player, RacerGame, _wait_for_events
+from utils.constants import FINISH_LINE_X, PLAYER_MOVE_DISTANCE, RED, WINDOW_HEIGHT, WINDOW_WIDTH
+
+
+def _key(key):
+    return pygame.event.Event(pygame.KEYDOWN, key=key)
+
+
+def test_input_latency_measures_presses_at_the_next_present():
+    latency = InputLatency()
+    first, second = Player(0, 0, RED, [pygame.K_a], 1), Player(0, 0, RED, [pygame.K_b], 2)
+    latency.presented(now=0.5)
+    assert latency.summary() == {}
+
+    for i in range(100):
+        latency.pressed(first, i)
+        latency.presented(now=i + (i + 1) / 1000)
+    latency.pressed(second, 10.0)
+    latency.pressed(second, 10.004)
+    latency.presented(now=10.01)
+
+    summary = latency.summary()
+    assert summary[1].presses == 100
+    assert [round(ms) for ms in summary[1][1:]] == [51, 91, 100, 100]
+    assert summary[2].presses == 2
+    assert round(summary[2].p50_ms) == round(summary[2].max_ms) == 10
+
+
+def test_wait_for_events_returns_at_the_deadline_or_with_the_events():
+    pygame.init()
+    pygame.event.clear()
+    # A deadline already passed polls instead of waiting for an event
+    assert _wait_for_events(pygame.time.get_ticks() - 10) == []
+
+    start = time.perf_counter()
+    assert _wait_for_events(pygame.time.get_ticks() + 50) == []
+    assert time.perf_counter() - start >= 0.03
+
+    pygame.event.post(_key(pygame.K_a))
+    pygame.event.post(_key(pygame.K_b))
+    events = _wait_for_events(pygame.time.get_ticks() + 1000)
+    assert [event.key for event in events if event.type == pygame.KEYDOWN] == [pygame.K_a, pygame.K_b]
+
+
+def test_escape_while_showing_the_winner_still_reports_latency(capsys):
+    pygame.init()
+    game = RacerGame(pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)))
+    winner = game.players[0]
+    winner.x = FINISH_LINE_X - PLAYER_MOVE_DISTANCE
+    events = iter([[_key(winner.get_next_key())], [], [_key(pygame.K_ESCAPE)]])
+    start = time.perf_counter()
+    with patch('pygame.event.get', side_effect=lambda: next(events)), patch('pygame.display.flip'):
+        game.run()
+
+    # The winner is shown without blocking the loop, so ESC is handled at once
+    assert game.winner == 'Player 1'
+    assert time.perf_counter() - start < 1
+    assert capsys.readouterr().out.startswith('Player 1 latency: p50 ')
+
+
+def test_the_winner_is_shown_for_a_while_before_the_race_ends(capsys):
+    pygame.init()
+    game = RacerGame(pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)))
+    winner = game.players[1]
+    winner.x = FINISH_LINE_X - PLAYER_MOVE_DISTANCE
+    events = iter([[_key(winner.get_next_key())]])
+    # A fake clock that moves 10 ms with each frame presented
+    ticks = [0]
+
+    def flip():
+        ticks[0] += 10
+
+    with patch('pygame.event.get', side_effect=lambda: next(events, [])), patch('pygame.display.flip', flip), \
+            patch('pygame.time.get_ticks', lambda: ticks[0]), patch('racer.racer.WINNER_DISPLAY_TIME', 100):
+        game.run()
+
+    assert game.winner == 'Player 2'
+    # The winner, set at tick 0, stays on screen until the first frame drawn once 100 ms have passed
+    assert ticks[0] == 110
+    assert capsys.readouterr().out.startswith('Player 2 latency: p50 ')
+
+
+def test_race_draws_the_same_on_textures():
+    pygame.init()
+    surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+    canvas = TextureCanvas.create((WINDOW_WIDTH, WINDOW_HEIGHT), accelerated=0)
+    game = RacerGame(surface, 3)
+    game.draw(surface)
+    game.draw(canvas)
+
+    # Text is blended a little differently
+    difference = pygame.surfarray.array3d(surface).astype(int) - pygame.surfarray.array3d(canvas.to_surface())
+    assert np.abs(difference).max() <= 3
@@ -1,4 +1,5 @@
 # Constants
+import os
 import pygame
 import random
 import string
@@ -18,10 +19,30 @@ PLAYERS = {RED: {'left': pygame.K_LEFT, 'right': pygame.K_RIGHT, 'up': pygame.K_
            BLUE: {'left': pygame.K_a, 'right': pygame.K_d, 'up': pygame.K_w},
            GRAY: {'left': pygame.K_j, 'right': pygame.K_l, 'up': pygame.K_i}
            }
+# Games that take more players than PLAYERS has read these instead
+MAX_PLAYERS = 16
+# Keys of each keyboard zone as (left, right, up, down), in seat order. Seats past
+# the last zone are played by bots or remote inputs.
+KEYBOARD_ZONES = [(pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s),
+                  (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN),
+                  (pygame.K_j, pygame.K_l, pygame.K_i, pygame.K_k),
+                  (pygame.K_f, pygame.K_h, pygame.K_t, pygame.K_g),
+                  (pygame.K_KP4, pygame.K_KP6, pygame.K_KP8, pygame.K_KP5)]
+# Distinct player colors, one per seat
+PLAYER_COLORS = [RED, BLUE, GRAY, GREEN, YELLOW, ORANGE, VIOLET, (0, 255, 255), (255, 105, 180), (139, 69, 19),
+                 (0, 128, 128), (255, 215, 0), (70, 130, 180), (154, 205, 50), (220, 20, 60), (245, 222, 179)]
 PLAYER_SIZE = 50
 PLAYER_SPEED = 0.5
 FINISH_LINE = SCREEN_WIDTH - PLAYER_SIZE
 BG_COLOR = (0, 255, 0)  # Green
+# Simulate the next frame while drawing the current one, in games that support it
+PIPELINED_RENDERING = False
+# Draw the games that support it through SDL2 textures instead of software surface blits
+TEXTURE_RENDERING = False
+# Simulation steps per second in games with a fixed tick rate, which draw in between steps
+TICK_RATE = 60
+# Frames drawn per second at most in those games, or 0 for as many as the display allows
+RENDER_FPS = 120
 
 # Player settings
 PLAYER_WIDTH = 30
@@ -66,7 +87,28 @@ def initialize_racer_keys():
 FINISH_LINE_X = 670
 FPS = 60
 WINNER_DISPLAY_TIME = 2000  # milliseconds
+RACER_LOW_LATENCY = False  # Redraw as soon as a key is pressed instead of on the next frame
 
 # Platformer Game settings
 POWERUP_SPAWN_INTERVAL = 3
-MAX_POWERUPS = 3  # Maximum number of powerups that can be on screen simultaneously
\ No newline at end of file
+MAX_POWERUPS = 3  # Maximum number of powerups that can be on screen simultaneously
+MAX_COINS = 10  # Maximum number of coins that can be on screen simultaneously
+
+# Leaderboard settings
+LEADERBOARD_PATH = os.path.join(os.path.expanduser('~'), '.platform_game', 'leaderboard.db')
+LEADERBOARD_FLUSH_INTERVAL = 1.0  # Seconds the writer thread waits to batch more scores
+
+# Analytics settings
+ANALYTICS_PATH = os.path.join(os.path.expanduser('~'), '.platform_game', 'events.bin')
+
+# Profiling settings
+PROFILE_KEY = pygame.K_F9  # Starts a capture in any game
+PROFILE_FRAMES = 120  # Frames captured per press
+PROFILE_PATH = os.path.join(os.path.expanduser('~'), '.platform_game', 'profiles')
+
+# Spectator streaming settings
+STREAMING = False  # Serve the game screen to viewers connecting to STREAM_PATH
+STREAM_PATH = os.path.join(os.path.expanduser('~'), '.platform_game', 'stream.sock')
+STREAM_TILE = 40  # Width and height in pixels of the squares compared for changes
+STREAM_COMPRESSION = 1  # zlib level, from 1 (fastest) to 9 (smallest)
+STREAM_BACKLOG = 4  # Frames queued for a slow viewer before it is sent a keyframe instead
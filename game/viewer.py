@@ -0,0 +1,102 @@
+"""
+Watch a game streamed by a FrameStreamer from another process.
+
+Start the game with STREAMING = True in game/utils/constants.py, then run from the
+repository root, for example:
+
+    python game/viewer.py
+    python game/viewer.py --path /tmp/game.sock
+"""
+import argparse
+import os
+import select
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from common import FrameDecoder, read_messages
+from utils.constants import STREAM_PATH
+
+TITLE = 'Spectator'
+# Seconds between attempts to connect while no game is streaming
+RETRY_INTERVAL = 0.5
+# Seconds between updates of the bandwidth shown in the window title
+REPORT_INTERVAL = 1.0
+
+
+def _connect(path):
+    """A connection to the streamer at ``path``, retried until a game starts or the window is closed."""
+    while True:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(path)
+            return connection
+        except OSError:
+            connection.close()
+        if any(event.type == pygame.QUIT for event in pygame.event.get()):
+            return None
+        time.sleep(RETRY_INTERVAL)
+
+
+def watch(path):
+    """Show the frames streamed to ``path`` until the window is closed or the game exits."""
+    pygame.display.set_caption(f'{TITLE} - waiting for {path}')
+    connection = _connect(path)
+    if connection is None:
+        return 0
+    decoder = FrameDecoder()
+    screen = image = None
+    received = frames = 0
+    reported = time.perf_counter()
+    messages = read_messages(connection)
+    with connection:
+        while True:
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                return 0
+            # Keep handling window events while the game is paused or in its menu
+            if not select.select([connection], [], [], 0.1)[0]:
+                continue
+            message = next(messages, None)
+            if message is None:
+                return 0
+            rects = decoder.apply(message)
+            if decoder.frame is None:
+                continue
+            height, width = decoder.frame.shape
+            if screen is None or screen.get_size() != (width, height):
+                screen = pygame.display.set_mode((width, height))
+                image = pygame.image.frombuffer(decoder.frame, (width, height), 'RGBX')
+                rects = [(0, 0, width, height)]
+            for rect in rects:
+                screen.blit(image, rect[:2], rect)
+            pygame.display.update(rects)
+
+            received += len(message)
+            frames += 1
+            now = time.perf_counter()
+            if now - reported >= REPORT_INTERVAL:
+                elapsed = now - reported
+                pygame.display.set_caption(f'{TITLE} - {frames / elapsed:.0f} fps, '
+                                           f'{received / elapsed / 1024:.0f} KiB/s')
+                received = frames = 0
+                reported = now
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--path', default=STREAM_PATH, help='The socket the game streams to.')
+    args = parser.parse_args(argv)
+    pygame.init()
+    pygame.display.set_mode((400, 300))
+    try:
+        return watch(args.path)
+    finally:
+        pygame.quit()
+
+
+if __name__ == '__main__':
+    sys.exit(main())